@@ -0,0 +1,256 @@
+"""Режим админки для больших таблиц.
+
+Список объектов не делает полный COUNT: для всей таблицы число строк
+оценивается по статистике базы, для отфильтрованной выборки считается
+не дальше COUNT_LIMIT строк. Поиск по тексту идёт через полнотекстовый
+индекс (FTS5 в SQLite), если он создан миграцией. Внешние ключи в
+list_editable показываются полем id вместо списка всех объектов.
+Удаление из админки выполняется в фоне (BackgroundDeleteMixin).
+"""
+from core import deletion
+from core.models import DeletionJob, MediaBlob, OutgoingEmail
+from django.contrib import admin, messages
+from django.contrib.admin import actions
+from django.contrib.admin.templatetags.admin_urls import add_preserved_filters
+from django.contrib.admin.widgets import ForeignKeyRawIdWidget
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.db.models.expressions import RawSQL
+from django.http import HttpResponseRedirect
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+COUNT_LIMIT = 10_000
+# Столько выбранных объектов перечисляется на странице подтверждения.
+DELETE_PREVIEW_LIMIT = 100
+
+
+def estimate_count(model, using):
+    """Приблизительное число строк таблицы или None."""
+    connection = connections[using]
+    table = connection.ops.quote_name(model._meta.db_table)
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+                [model._meta.db_table]
+            )
+        elif connection.vendor == 'sqlite':
+            # rowid растёт монотонно, MAX читается из B-дерева за O(log n).
+            cursor.execute(f'SELECT MAX(rowid) FROM {table}')
+        else:
+            return None
+        row = cursor.fetchone()
+    return int(row[0]) if row and row[0] is not None else 0
+
+
+class EstimatedCountPaginator(Paginator):
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimate_count(queryset.model, queryset.db)
+            if estimate is not None and estimate > COUNT_LIMIT:
+                return estimate
+        return queryset.order_by()[:COUNT_LIMIT].count()
+
+
+def fts_query(search_term):
+    """Слова запроса как фразы FTS5, объединённые через AND."""
+    return ' '.join(
+        '"{}"'.format(word.replace('"', '""'))
+        for word in search_term.split()
+    )
+
+
+class ListRawIdWidget(ForeignKeyRawIdWidget):
+    """Поле id со ссылкой на выбор объекта, без подписи: подпись стоила бы
+    отдельного запроса на каждую строку списка."""
+
+    def label_and_url_for_value(self, value):
+        return '', ''
+
+
+class ScaleAdminMixin:
+    """Настройки ModelAdmin для таблиц на миллионы строк.
+
+    ``search_index`` — имя FTS5-таблицы с rowid, равным первичному ключу.
+    Если её нет (база не SQLite), используется обычный поиск Django.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    search_index = None
+
+    def get_changelist_formset(self, request, **kwargs):
+        formset = super().get_changelist_formset(request, **kwargs)
+        for name in self.list_editable:
+            db_field = self.model._meta.get_field(name)
+            if db_field.many_to_one:
+                formset.form.base_fields[name].widget = ListRawIdWidget(
+                    db_field.remote_field, self.admin_site
+                )
+        return formset
+
+    def get_search_results(self, request, queryset, search_term):
+        connection = connections[queryset.db]
+        if (not search_term.strip() or self.search_index is None
+                or connection.vendor != 'sqlite'):
+            return super().get_search_results(
+                request, queryset, search_term
+            )
+        table = connection.ops.quote_name(self.search_index)
+        return queryset.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {table} WHERE {table} MATCH %s',
+            [fts_query(search_term)]
+        )), False
+
+
+def delete_selected(modeladmin, request, queryset):
+    """Действие «Удалить выбранные», ставящее удаление в очередь."""
+    if request.POST.get('post'):
+        _, _, perms_needed, protected = modeladmin.get_deleted_objects(
+            queryset, request
+        )
+        if not perms_needed and not protected:
+            modeladmin.schedule_deletion(request, queryset)
+            return None
+    return actions.delete_selected(modeladmin, request, queryset)
+
+
+delete_selected.allowed_permissions = ('delete', )
+delete_selected.short_description = actions.delete_selected.short_description
+
+
+class BackgroundDeleteMixin:
+    """Удаление из админки (со страницы объекта и действием над
+    выбранными) ставится в очередь core.deletion вместо удаления в
+    запросе.
+
+    Страница подтверждения не собирает каскад: она перечисляет только
+    выбранные объекты, а права проверяет по моделям, до которых
+    дойдёт каскад.
+    """
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        if 'delete_selected' in actions:
+            actions['delete_selected'] = (
+                delete_selected, 'delete_selected',
+                delete_selected.short_description,
+            )
+        return actions
+
+    def get_deleted_objects(self, objs, request):
+        count = objs.count() if isinstance(objs, QuerySet) else len(objs)
+        to_delete = [str(obj) for obj in objs[:DELETE_PREVIEW_LIMIT]]
+        if count > len(to_delete):
+            to_delete.append(f'… и ещё {count - len(to_delete)}')
+        model_count = {self.model._meta.verbose_name_plural: count}
+        return to_delete, model_count, self.cascade_perms_needed(request), []
+
+    def cascade_perms_needed(self, request):
+        """Модели каскада, на удаление которых у пользователя нет прав."""
+        perms_needed = set()
+        seen = {self.model}
+        pending = [self.model]
+        while pending:
+            for relation in deletion.cascade_relations(pending.pop()):
+                model = relation.related_model
+                if model in seen:
+                    continue
+                seen.add(model)
+                pending.append(model)
+                model_admin = self.admin_site._registry.get(model)
+                if model_admin is not None and (
+                    not model_admin.has_delete_permission(request)
+                ):
+                    perms_needed.add(model._meta.verbose_name)
+        return perms_needed
+
+    def delete_model(self, request, obj):
+        self.schedule_deletion(
+            request, self.model._base_manager.filter(pk=obj.pk)
+        )
+
+    def delete_queryset(self, request, queryset):
+        self.schedule_deletion(request, queryset)
+
+    def schedule_deletion(self, request, queryset):
+        job = deletion.schedule(queryset)
+        self.message_user(
+            request,
+            f'Удаление поставлено в очередь (задание {job.pk}).',
+            messages.INFO,
+        )
+
+    def response_delete(self, request, obj_display, obj_id):
+        """Возвращает к списку без сообщения Django об удалении: объект
+        ещё существует."""
+        opts = self.model._meta
+        if self.has_change_permission(request, None):
+            post_url = add_preserved_filters({
+                'preserved_filters': self.get_preserved_filters(request),
+                'opts': opts,
+            }, reverse(
+                f'admin:{opts.app_label}_{opts.model_name}_changelist',
+                current_app=self.admin_site.name,
+            ))
+        else:
+            post_url = reverse('admin:index', current_app=self.admin_site.name)
+        return HttpResponseRedirect(post_url)
+
+
+@admin.register(DeletionJob)
+class DeletionJobAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'model', 'status', 'deleted', 'created',
+                    'finished')
+    list_filter = ('status', )
+    readonly_fields = ('model', 'object_ids', 'status', 'deleted', 'error',
+                       'created', 'finished')
+    actions = ('retry', )
+
+    def has_add_permission(self, request):
+        return False
+
+    def retry(self, request, queryset):
+        queryset.filter(status=DeletionJob.FAILED).update(
+            status=DeletionJob.PENDING, error='', finished=None
+        )
+    retry.short_description = 'Повторить задания с ошибкой'
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'recipients', 'status', 'attempts', 'created',
+                    'sent')
+    list_filter = ('status', )
+    readonly_fields = ('from_email', 'recipients', 'message', 'status',
+                       'attempts', 'next_attempt', 'last_error', 'created',
+                       'sent')
+    actions = ('retry', )
+
+    def has_add_permission(self, request):
+        return False
+
+    def retry(self, request, queryset):
+        queryset.filter(status=OutgoingEmail.DEAD).update(
+            status=OutgoingEmail.PENDING, attempts=0,
+            next_attempt=timezone.now()
+        )
+    retry.short_description = 'Повторить отправку недоставленных'
+
+
+@admin.register(MediaBlob)
+class MediaBlobAdmin(ScaleAdminMixin, admin.ModelAdmin):
+    list_display = ('name', 'size', 'refcount', 'touched')
+    readonly_fields = ('name', 'size', 'refcount', 'touched')
+    search_fields = ('^name', )
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        # Файлы без ссылок удаляет команда clean_media.
+        return False
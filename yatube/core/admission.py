@@ -0,0 +1,90 @@
+"""Ограничение нагрузки: число одновременных запросов и частота запросов.
+
+Маршруты делятся на классы (ADMISSION_ROUTES, по умолчанию ``read``,
+небезопасные методы — ``write``). Для каждого класса процесс держит
+семафор на ADMISSION_CLASSES[класс]['concurrency'] запросов; сверх него
+запрос сразу получает 503. Семафор делят потоки одного воркера, поэтому
+gunicorn.conf.py запускает воркеры gthread, а prod-настройки считают
+ёмкость классов от их числа потоков (GUNICORN_THREADS). Частота запросов
+клиента ограничивается счётчиком в общем кэше: burst запросов за окно в
+burst / rate секунд; сверх него — 429. Оба ответа содержат Retry-After.
+
+Анонимный клиент определяется по IP. За обратным прокси REMOTE_ADDR —
+адрес прокси, поэтому для запросов с адресов ADMISSION_TRUSTED_PROXIES
+IP берётся из заголовка ADMISSION_CLIENT_IP_HEADER (например,
+``proxy_set_header X-Real-IP $remote_addr;`` в nginx).
+"""
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+READ = 'read'
+WRITE = 'write'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_semaphores = {}
+_semaphores_lock = threading.Lock()
+
+
+def route_class(request, view_name):
+    route = settings.ADMISSION_ROUTES.get(view_name)
+    if route is not None:
+        return route
+    return READ if request.method in SAFE_METHODS else WRITE
+
+
+def semaphore(name):
+    with _semaphores_lock:
+        if name not in _semaphores:
+            _semaphores[name] = threading.BoundedSemaphore(
+                settings.ADMISSION_CLASSES[name]['concurrency']
+            )
+        return _semaphores[name]
+
+
+def client_ip(request):
+    address = request.META.get('REMOTE_ADDR', '')
+    header = settings.ADMISSION_CLIENT_IP_HEADER
+    if header and address in settings.ADMISSION_TRUSTED_PROXIES:
+        # В X-Forwarded-For последний адрес добавил наш прокси,
+        # предыдущие мог прислать сам клиент.
+        forwarded = request.META.get(header, '').rsplit(',', 1)[-1].strip()
+        if forwarded:
+            return forwarded
+    return address
+
+
+def client_id(request):
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return f'user-{user.pk}'
+    return f'ip-{client_ip(request)}'
+
+
+def take_token(name, client, now=None):
+    """Учитывает запрос клиента в текущем окне; возвращает 0 или число
+    секунд до начала следующего окна.
+
+    Счётчик окна увеличивается через cache.add и cache.incr, атомарно и
+    в memcached: параллельные воркеры не пропустят сверх burst запросов.
+    """
+    rate = settings.ADMISSION_CLASSES[name]['rate']
+    burst = settings.ADMISSION_CLASSES[name]['burst']
+    now = time.time() if now is None else now
+    period = burst / rate
+    window = int(now // period)
+    key = f'admission:{name}:{client}:{window}'
+    timeout = math.ceil(period) + 1
+    cache.add(key, 0, timeout)
+    try:
+        count = cache.incr(key)
+    except ValueError:
+        # Счётчик вытеснен между add и incr: запрос — первый в окне.
+        cache.add(key, 1, timeout)
+        count = 1
+    if count > burst:
+        return (window + 1) * period - now
+    return 0
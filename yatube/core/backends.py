@@ -0,0 +1,79 @@
+"""Аутентификация с кэшированием пользователя по id.
+
+AuthenticationMiddleware на каждом запросе загружает пользователя
+через get_user бэкенда. Здесь поля пользователя берутся из общего кэша на
+AUTH_USER_CACHE_TIMEOUT секунд; сохранение и удаление пользователя
+сбрасывают запись (core.signals), поэтому смена пароля сразу меняет
+хеш, с которым django.contrib.auth сверяет сессию. Кэш должен быть
+общим для всех процессов (memcached в продакшене), иначе остальные
+воркеры продолжат пускать пользователя со старым паролем.
+
+Хеш пароля в кэш не попадает: вместо него хранится готовый хеш сессии
+(HMAC от пароля на SECRET_KEY) и признак has_usable_password, а поле
+password у объекта из кэша отложено и при обращении читается из базы.
+"""
+from functools import partial
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.base_user import AbstractBaseUser
+from django.core.cache import cache
+from django.db import router
+
+UNCACHED_FIELDS = ('password', )
+
+
+def user_cache_key(user_id):
+    # Ключ отличается от прежнего auth:user:<id>, где лежал весь объект.
+    return f'auth:user-fields:{user_id}'
+
+
+def password_derived(method, user, cached):
+    """Значение, вычисляемое из пароля, — из кэша, пока пароль не загружен
+    и не изменён на этом объекте (например, формой смены пароля перед
+    update_session_auth_hash)."""
+    if 'password' in user.__dict__:
+        return method(user)
+    return cached
+
+
+class CachedModelBackend(ModelBackend):
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        cached = cache.get(key)
+        if cached is None:
+            user = super().get_user(user_id)
+            if user is None:
+                return None
+            cached = self.cache_entry(user)
+            cache.set(key, cached, settings.AUTH_USER_CACHE_TIMEOUT)
+        user = self.from_cache_entry(*cached)
+        return user if self.user_can_authenticate(user) else None
+
+    @staticmethod
+    def cache_entry(user):
+        fields = {
+            field.attname: getattr(user, field.attname)
+            for field in user._meta.concrete_fields
+            if field.attname not in UNCACHED_FIELDS
+        }
+        return fields, user.get_session_auth_hash(), user.has_usable_password()
+
+    @staticmethod
+    def from_cache_entry(fields, session_hash, usable_password):
+        model = get_user_model()
+        user = model.from_db(
+            router.db_for_read(model), list(fields), list(fields.values())
+        )
+        # Админка и шаблоны спрашивают has_usable_password на каждой
+        # странице; без кэша это был бы запрос за отложенным паролем.
+        user.get_session_auth_hash = partial(
+            password_derived, AbstractBaseUser.get_session_auth_hash, user,
+            session_hash
+        )
+        user.has_usable_password = partial(
+            password_derived, AbstractBaseUser.has_usable_password, user,
+            usable_password
+        )
+        return user
@@ -0,0 +1,128 @@
+"""Счётчики ссылок на файлы ContentAddressedStorage.
+
+Файл с одним содержимым хранится один раз, и на него может ссылаться
+несколько объектов. ``acquire``/``release`` ведут счётчик при изменении
+ссылающихся полей, ``collect`` удаляет файлы без ссылок вместе с их
+миниатюрами. Файл без ссылок удаляется только спустя MEDIA_BLOB_GRACE
+после последнего обращения: загруженный, но ещё не сохранённый в модели
+файл успевает получить ссылку.
+
+Файлы, загруженные до появления счётчиков, получают записи при первом
+``recount`` (команда ``clean_media --recount``) — но только те, на
+которые ещё ссылается какой-нибудь объект. Старые файлы без ссылок
+остаются на диске.
+"""
+import os
+from datetime import timedelta
+
+from core.models import MediaBlob
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import models
+from django.db.models import Count, F
+from django.utils import timezone
+from sorl.thumbnail import default as thumbnail
+from sorl.thumbnail.images import ImageFile
+
+BATCH_SIZE = 500
+
+
+def touch(name, size):
+    """Отмечает загрузку файла: продлевает срок до удаления
+    или заводит запись."""
+    if not MediaBlob.objects.filter(name=name).update(
+        touched=timezone.now()
+    ):
+        MediaBlob.objects.get_or_create(name=name, defaults={'size': size})
+
+
+def acquire(name):
+    if name:
+        MediaBlob.objects.filter(name=name).update(
+            refcount=F('refcount') + 1, touched=timezone.now()
+        )
+
+
+def release(name):
+    if name:
+        MediaBlob.objects.filter(name=name, refcount__gt=0).update(
+            refcount=F('refcount') - 1, touched=timezone.now()
+        )
+
+
+def file_fields(storage=default_storage):
+    """Поля моделей, хранящие файлы в storage."""
+    for model in apps.get_models():
+        for field in model._meta.get_fields():
+            if isinstance(field, models.FileField) and (
+                field.storage is storage
+            ):
+                yield model, field.name
+
+
+def recount(storage=default_storage):
+    """Пересчитывает счётчики по ссылкам в базе, например после
+    изменений в обход сигналов."""
+    counts = {}
+    for model, field in file_fields(storage):
+        rows = model._base_manager.exclude(**{field: ''}).order_by().values(
+            field
+        ).annotate(references=Count('pk')).values_list(field, 'references')
+        for name, references in rows.iterator():
+            counts[name] = counts.get(name, 0) + references
+    blobs = MediaBlob.objects.values_list('name', 'refcount')
+    for name, refcount in blobs.iterator():
+        references = counts.pop(name, 0)
+        if references != refcount:
+            MediaBlob.objects.filter(name=name).update(refcount=references)
+    # Ссылки на файлы без записи: загруженные до появления счётчиков.
+    MediaBlob.objects.bulk_create((
+        MediaBlob(
+            name=name, refcount=references,
+            size=storage.size(name) if storage.exists(name) else 0
+        )
+        for name, references in counts.items()
+    ), batch_size=BATCH_SIZE, ignore_conflicts=True)
+
+
+def collect(storage=default_storage, grace=None, batch_size=BATCH_SIZE):
+    """Удаляет файлы без ссылок и их миниатюры, возвращает их число."""
+    if grace is None:
+        grace = settings.MEDIA_BLOB_GRACE
+    cutoff = timezone.now() - timedelta(seconds=grace)
+    garbage = MediaBlob.objects.filter(refcount=0, touched__lt=cutoff)
+    removed = 0
+    while True:
+        names = list(garbage.values_list('name', flat=True)[:batch_size])
+        if not names:
+            return removed
+        for name in names:
+            if remove(storage, garbage.filter(name=name), name):
+                removed += 1
+
+
+def remove(storage, row, name):
+    """Удаляет файл, если удалось удалить его строку row.
+
+    Файл сначала переименовывается: повторная загрузка того же
+    содержимого, пришедшая между DELETE и удалением файла, не найдёт его
+    и запишет заново, а не останется ссылкой на удалённый файл. Если
+    строку тем временем обновил touch или acquire, условный DELETE ничего
+    не удалит и файл вернётся на место.
+    """
+    path = storage.path(name)
+    tombstone = f'{path}.{os.getpid()}.deleted'
+    try:
+        os.replace(path, tombstone)
+    except FileNotFoundError:
+        tombstone = None
+    deleted, _ = row.delete()
+    if not deleted:
+        if tombstone is not None:
+            os.replace(tombstone, path)
+        return False
+    if tombstone is not None:
+        os.remove(tombstone)
+    thumbnail.kvstore.delete(ImageFile(name, storage))
+    return True
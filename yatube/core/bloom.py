@@ -0,0 +1,51 @@
+"""Фильтр Блума: компактное множество без ложноотрицательных ответов.
+
+``key in bloom`` ложно — ключа точно нет; истинно — ключ, вероятно,
+есть (с вероятностью ошибки, заданной при создании).
+"""
+import hashlib
+import math
+
+
+class BloomFilter:
+    def __init__(self, size, hashes, bits=None):
+        self.size = size
+        self.hashes = hashes
+        self.bits = bytearray(bits) if bits is not None else bytearray(
+            (size + 7) // 8
+        )
+
+    @classmethod
+    def for_capacity(cls, capacity, error_rate):
+        capacity = max(capacity, 1)
+        size = math.ceil(
+            -capacity * math.log(error_rate) / math.log(2) ** 2
+        )
+        hashes = max(1, round(size / capacity * math.log(2)))
+        return cls(size, hashes)
+
+    def positions(self, key):
+        # Двойное хеширование: k позиций из двух 64-битных хешей.
+        digest = hashlib.blake2b(str(key).encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        for number in range(self.hashes):
+            yield (first + number * second) % self.size
+
+    def add(self, key):
+        for position in self.positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self.positions(key)
+        )
+
+    def dumps(self):
+        return self.size, self.hashes, bytes(self.bits)
+
+    @classmethod
+    def loads(cls, data):
+        size, hashes, bits = data
+        return cls(size, hashes, bits)
@@ -0,0 +1,25 @@
+"""Проверки настроек для ``manage.py check --deploy``."""
+from django.conf import settings
+from django.core.checks import Warning, register
+
+# Бэкенды, данные которых не видны другим процессам.
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register(deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """Сброс кэша пользователя, поколения лент и граф подписок
+    меняются через кэш по умолчанию; в процессе каждого воркера свой
+    LocMemCache, и изменения остальным не видны."""
+    backend = settings.CACHES['default']['BACKEND']
+    if backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [Warning(
+        f'Кэш по умолчанию {backend} не общий для процессов: '
+        'воркеры не увидят изменений, сделанных другими.',
+        hint='Настройте memcached (CACHE_LOCATION в продакшене).',
+        id='core.W001',
+    )]
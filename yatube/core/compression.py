@@ -0,0 +1,61 @@
+"""Сжатие ответов и файлов: gzip и, если установлен пакет Brotli, br."""
+import gzip
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP = 'gzip'
+BROTLI = 'br'
+EXTENSIONS = {GZIP: '.gz', BROTLI: '.br'}
+
+
+def available_encodings():
+    """Поддерживаемые кодировки в порядке предпочтения."""
+    return (BROTLI, GZIP) if brotli is not None else (GZIP,)
+
+
+def negotiate(accept_encoding):
+    """Выбирает кодировку по заголовку Accept-Encoding или None."""
+    accepted = {}
+    for item in accept_encoding.split(','):
+        coding, _, params = item.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    for encoding in available_encodings():
+        if accepted.get(encoding, accepted.get('*', 0.0)) > 0:
+            return encoding
+    return None
+
+
+def compress(data, encoding, best=False):
+    if encoding == BROTLI:
+        return brotli.compress(data, quality=11 if best else 5)
+    return gzip.compress(data, compresslevel=9 if best else 6, mtime=0)
+
+
+def compress_stream(chunks, encoding):
+    """Сжимает итератор байтов, сбрасывая буфер после каждого куска."""
+    if encoding == BROTLI:
+        compressor = brotli.Compressor(quality=5)
+        for chunk in chunks:
+            output = compressor.process(chunk) + compressor.flush()
+            if output:
+                yield output
+        yield compressor.finish()
+    else:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        for chunk in chunks:
+            output = compressor.compress(chunk)
+            output += compressor.flush(zlib.Z_SYNC_FLUSH)
+            if output:
+                yield output
+        yield compressor.flush()
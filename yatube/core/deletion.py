@@ -0,0 +1,133 @@
+"""Удаление объектов с каскадом небольшими пачками.
+
+Обычный delete() удаляет все зависимые строки (CASCADE) в одной
+транзакции; у активного автора это десятки тысяч постов и комментариев,
+и в SQLite блокировка записи держится секундами. Здесь зависимые строки
+удаляются снизу вверх пачками по batch_size, каждая пачка — отдельная
+короткая транзакция, между которыми успевают писать другие запросы.
+Последним удаляется сам объект обычным delete(): к этому моменту
+каскадировать уже нечего, а сигналы и SET_NULL отрабатывают как обычно.
+
+Обработчик отмечает каждую пачку в heartbeat задания. Задание, которое
+дольше DELETION_LEASE числится выполняемым без отметок (обработчик
+упал), снова берётся в работу: удаление по id можно продолжить с любого
+места.
+"""
+import traceback
+from datetime import timedelta
+
+from core.models import DeletionJob
+from django.apps import apps
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
+
+BATCH_SIZE = 500
+
+
+def schedule(queryset):
+    """Ставит объекты queryset в очередь на удаление."""
+    ids = ','.join(
+        str(pk) for pk in queryset.values_list('pk', flat=True).iterator()
+    )
+    return DeletionJob.objects.create(
+        model=queryset.model._meta.label, object_ids=ids
+    )
+
+
+def _batches(sequence, size):
+    for start in range(0, len(sequence), size):
+        yield sequence[start:start + size]
+
+
+def cascade_relations(model):
+    """Обратные связи, по которым удаление model каскадируется, включая
+    скрытые (related_name='+')."""
+    for relation in model._meta.get_fields(include_hidden=True):
+        if relation.auto_created and not relation.concrete and getattr(
+            relation, 'on_delete', None
+        ) is models.CASCADE:
+            yield relation
+
+
+def delete_batched(model, pks, batch_size=BATCH_SIZE, progress=None):
+    """Удаляет объекты model с id из pks и всё, что на них
+    каскадно ссылается. Возвращает число удалённых строк."""
+    deleted = 0
+    for relation in cascade_relations(model):
+        related = relation.related_model._base_manager.filter(
+            **{f'{relation.field.name}__in': pks}
+        ).values_list('pk', flat=True)
+        while True:
+            child_pks = list(related[:batch_size])
+            if not child_pks:
+                break
+            deleted += delete_batched(
+                relation.related_model, child_pks, batch_size, progress
+            )
+    for batch in _batches(list(pks), batch_size):
+        with transaction.atomic():
+            count, _ = model._base_manager.filter(pk__in=batch).delete()
+        deleted += count
+        if progress is not None:
+            progress(count)
+    return deleted
+
+
+def run(job, batch_size=BATCH_SIZE):
+    DeletionJob.objects.filter(pk=job.pk).update(
+        status=DeletionJob.RUNNING, heartbeat=timezone.now()
+    )
+
+    def progress(count):
+        DeletionJob.objects.filter(pk=job.pk).update(
+            deleted=F('deleted') + count, heartbeat=timezone.now()
+        )
+
+    try:
+        delete_batched(
+            apps.get_model(job.model), job.ids, batch_size, progress
+        )
+    except Exception:
+        DeletionJob.objects.filter(pk=job.pk).update(
+            status=DeletionJob.FAILED, error=traceback.format_exc(),
+            finished=timezone.now(),
+        )
+        return
+    DeletionJob.objects.filter(pk=job.pk).update(
+        status=DeletionJob.DONE, finished=timezone.now()
+    )
+
+
+def claim():
+    """Берёт задание из очереди или брошенное упавшим обработчиком."""
+    while True:
+        now = timezone.now()
+        expired = now - timedelta(seconds=settings.DELETION_LEASE)
+        candidates = DeletionJob.objects.filter(
+            models.Q(status=DeletionJob.PENDING)
+            | models.Q(status=DeletionJob.RUNNING) & (
+                models.Q(heartbeat__lt=expired)
+                | models.Q(heartbeat__isnull=True)
+            )
+        )
+        job = candidates.order_by('created').first()
+        if job is None:
+            return None
+        # Задание могло быть взято другим обработчиком.
+        if candidates.filter(pk=job.pk).update(
+            status=DeletionJob.RUNNING, heartbeat=now
+        ):
+            return job
+
+
+def run_pending(batch_size=BATCH_SIZE):
+    """Выполняет задания из очереди, возвращает их число."""
+    done = 0
+    while True:
+        job = claim()
+        if job is None:
+            return done
+        run(job, batch_size)
+        done += 1
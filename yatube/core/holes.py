@@ -0,0 +1,97 @@
+"""Кэширование страниц с персональными фрагментами («дырками»).
+
+Страница кэшируется одна на всех пользователей: вместо персональных
+фрагментов в ней остаются маркеры, которые заполняются при каждой выдаче
+под текущего пользователя. Фрагменты объявляются в шаблонах тегом
+``{% hole 'template.html' key=value %}``; без кэша тег просто рендерит
+фрагмент на месте.
+"""
+import hashlib
+import re
+from functools import wraps
+from urllib.parse import parse_qsl, urlencode
+
+from core import surrogate
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.utils.cache import patch_vary_headers
+from django.utils.safestring import mark_safe
+
+MARKER = '<!--hole:{}-->'
+MARKER_RE = re.compile(rb'<!--hole:([^?>]+)(?:\?([^>]*))?-->')
+
+_providers = {}
+
+
+def register(template_name):
+    """Регистрирует функцию, дополняющую контекст фрагмента.
+
+    Функция получает запрос и параметры из тега и возвращает словарь.
+    """
+    def decorator(func):
+        _providers[template_name] = func
+        return func
+    return decorator
+
+
+def render_hole(request, template_name, params):
+    context = dict(params)
+    provider = _providers.get(template_name)
+    if provider is not None:
+        context.update(provider(request, **params))
+    return render_to_string(template_name, context, request)
+
+
+def hole(request, template_name, params):
+    """Рендерит фрагмент или, при кэшировании страницы, оставляет маркер."""
+    if request is not None and getattr(request, '_defer_holes', False):
+        query = f'?{urlencode(params)}' if params else ''
+        return mark_safe(MARKER.format(template_name + query))
+    return render_hole(request, template_name, params)
+
+
+def fill_holes(content, request, charset):
+    def replace(match):
+        template_name = match.group(1).decode()
+        params = dict(parse_qsl((match.group(2) or b'').decode()))
+        return render_hole(request, template_name, params).encode(charset)
+    return MARKER_RE.sub(replace, content)
+
+
+def cache_page_with_holes(timeout, key_prefix=''):
+    """Аналог ``cache_page``, общий для анонимных и авторизованных."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+            path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+            key = f'holes:{key_prefix}:{path}'
+            cached = cache.get(key)
+            if cached is not None:
+                content, content_type, charset, keys = cached
+                response = HttpResponse(content_type=content_type)
+                surrogate.add_keys(request, *keys)
+            else:
+                request._defer_holes = True
+                try:
+                    response = view(request, *args, **kwargs)
+                finally:
+                    request._defer_holes = False
+                if response.streaming:
+                    return response
+                content = response.content
+                charset = response.charset
+                if response.status_code == 200:
+                    keys = getattr(request, 'surrogate_keys', ())
+                    cache.set(
+                        key,
+                        (content, response['Content-Type'], charset, keys),
+                        timeout
+                    )
+            response.content = fill_holes(content, request, charset)
+            patch_vary_headers(response, ('Cookie',))
+            return response
+        return wrapper
+    return decorator
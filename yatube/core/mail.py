@@ -0,0 +1,125 @@
+"""Очередь исходящих писем.
+
+OutboxEmailBackend только записывает письма в таблицу OutgoingEmail,
+поэтому запрос (например, сброс пароля) не ждёт почтовый сервер.
+Команда send_outbox отправляет их пачками через одно соединение
+с OUTBOX_EMAIL_BACKEND. Неудачная отправка повторяется с растущей
+задержкой; после OUTBOX_MAX_ATTEMPTS попыток письмо помечается
+недоставленным и остаётся в таблице для разбора.
+"""
+import email
+import email.message
+from datetime import timedelta
+
+from core.models import OutgoingEmail
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.mail.message import MIMEMixin
+from django.utils import timezone
+
+
+class OutboxEmailBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        outgoing = [
+            OutgoingEmail(
+                from_email=message.from_email,
+                recipients='\n'.join(message.recipients()),
+                message=message.message().as_string(),
+            )
+            for message in email_messages
+            if message.recipients()
+        ]
+        OutgoingEmail.objects.bulk_create(outgoing)
+        return len(outgoing)
+
+
+class ParsedMessage(MIMEMixin, email.message.Message):
+    """Разобранное письмо с as_bytes(linesep=...), как у SafeMIMEText:
+    SMTP-бэкенд Django отправляет ``message().as_bytes(linesep='\\r\\n')``.
+    """
+
+
+class QueuedMessage:
+    """Готовое MIME-письмо с интерфейсом EmailMessage, достаточным для
+    почтовых бэкендов Django."""
+    encoding = None
+
+    def __init__(self, outgoing):
+        self.from_email = outgoing.from_email
+        self.to = outgoing.recipients.split('\n')
+        self.raw = outgoing.message
+
+    def recipients(self):
+        return self.to
+
+    def message(self):
+        # Текст 8bit хранится раскодированным; разбор из байтов сохраняет
+        # его байтами, которые BytesGenerator отправит как есть.
+        return email.message_from_bytes(
+            self.raw.encode('utf-8'), _class=ParsedMessage
+        )
+
+
+def retry_delay(attempts):
+    return timedelta(
+        seconds=settings.OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+    )
+
+
+def claim(batch_size, now):
+    """Берёт письма, которым пора уйти, продлевая им срок следующей
+    попытки на OUTBOX_LEASE: если обработчик упадёт, письма вернутся
+    в очередь, а параллельный обработчик их не возьмёт."""
+    due = list(
+        OutgoingEmail.objects.filter(
+            status=OutgoingEmail.PENDING, next_attempt__lte=now
+        ).order_by('next_attempt').values_list('pk', flat=True)[:batch_size]
+    )
+    lease = now + timedelta(seconds=settings.OUTBOX_LEASE)
+    OutgoingEmail.objects.filter(pk__in=due, next_attempt__lte=now).update(
+        next_attempt=lease
+    )
+    return list(OutgoingEmail.objects.filter(pk__in=due, next_attempt=lease))
+
+
+def failed(outgoing, error, now):
+    outgoing.attempts += 1
+    outgoing.last_error = error
+    if outgoing.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+        outgoing.status = OutgoingEmail.DEAD
+    else:
+        outgoing.next_attempt = now + retry_delay(outgoing.attempts)
+    outgoing.save(
+        update_fields=['attempts', 'last_error', 'status', 'next_attempt']
+    )
+
+
+def deliver(batch_size=100):
+    """Отправляет одну пачку писем, возвращает число отправленных."""
+    now = timezone.now()
+    batch = claim(batch_size, now)
+    if not batch:
+        return 0
+    connection = get_connection(settings.OUTBOX_EMAIL_BACKEND)
+    try:
+        connection.open()
+    except Exception as error:
+        for outgoing in batch:
+            failed(outgoing, repr(error), now)
+        return 0
+    sent = []
+    try:
+        for outgoing in batch:
+            try:
+                connection.send_messages([QueuedMessage(outgoing)])
+            except Exception as error:
+                failed(outgoing, repr(error), now)
+            else:
+                sent.append(outgoing.pk)
+    finally:
+        connection.close()
+        OutgoingEmail.objects.filter(pk__in=sent).update(
+            status=OutgoingEmail.SENT, sent=timezone.now()
+        )
+    return len(sent)
@@ -0,0 +1,84 @@
+import gc
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from yatube.prefork import warm
+
+COLD_START = (
+    'import time; started = time.perf_counter(); '
+    'import yatube.wsgi; '
+    'print(time.perf_counter() - started)'
+)
+SMAPS_ROLLUP = '/proc/self/smaps_rollup'
+
+
+def private_dirty_kb():
+    with open(SMAPS_ROLLUP) as smaps:
+        for line in smaps:
+            if line.startswith('Private_Dirty:'):
+                return int(line.split()[1])
+    return 0
+
+
+class Command(BaseCommand):
+    help = (
+        'Измеряет холодный старт приложения и приватную память воркеров '
+        'после fork с gc.freeze() и без него.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5)
+        parser.add_argument('--workers', type=int, default=4)
+
+    def handle(self, *args, **options):
+        self.cold_start(options['runs'])
+        if os.path.exists(SMAPS_ROLLUP):
+            warm()
+            for freeze in (False, True):
+                self.fork_workers(options['workers'], freeze)
+
+    def cold_start(self, runs):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE)
+        timings = []
+        for _ in range(runs):
+            output = subprocess.run(
+                [sys.executable, '-c', COLD_START],
+                cwd=settings.BASE_DIR, env=env, check=True,
+                stdout=subprocess.PIPE, universal_newlines=True,
+            ).stdout
+            timings.append(float(output.split()[-1]))
+        self.stdout.write(
+            f'cold start: median {statistics.median(timings) * 1000:.1f} ms, '
+            f'min {min(timings) * 1000:.1f} ms ({runs} runs)'
+        )
+
+    def fork_workers(self, count, freeze):
+        gc.disable()
+        gc.collect()
+        if freeze:
+            gc.freeze()
+        results = []
+        for _ in range(count):
+            read_fd, write_fd = os.pipe()
+            pid = os.fork()
+            if pid == 0:
+                os.close(read_fd)
+                before = private_dirty_kb()
+                gc.enable()
+                gc.collect()
+                os.write(write_fd, str(private_dirty_kb() - before).encode())
+                os._exit(0)
+            os.close(write_fd)
+            with os.fdopen(read_fd) as pipe:
+                results.append(int(pipe.read() or 0))
+            os.waitpid(pid, 0)
+        gc.unfreeze()
+        gc.enable()
+        self.stdout.write(
+            f'gc.freeze={freeze}: private memory dirtied by a full collection '
+            f'{statistics.mean(results):.0f} kB per worker ({count} workers)'
+        )
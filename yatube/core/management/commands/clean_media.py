@@ -0,0 +1,25 @@
+from core import blobs
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = ('Удаляет медиафайлы, на которые больше не ссылается '
+            'ни один объект, вместе с их миниатюрами.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--recount', action='store_true',
+            help='Сначала пересчитать ссылки по базе.'
+        )
+        parser.add_argument(
+            '--grace', type=int, default=None,
+            help='Сколько секунд хранить файл без ссылок '
+                 '(по умолчанию MEDIA_BLOB_GRACE).'
+        )
+
+    def handle(self, *args, **options):
+        if options['recount']:
+            blobs.recount()
+        removed = blobs.collect(grace=options['grace'])
+        if options['verbosity'] > 1:
+            self.stdout.write(f'Удалено файлов: {removed}')
@@ -0,0 +1,38 @@
+from core import profiling
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test import Client
+
+
+class Command(BaseCommand):
+    help = 'Рендерит страницы и печатает время по шаблонам, include и тегам.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('urls', nargs='+')
+        parser.add_argument('--repeat', type=int, default=10)
+        parser.add_argument('--username')
+
+    def handle(self, *args, **options):
+        profiling.install()
+        profiling.reset()
+        client = Client()
+        if options['username']:
+            client.force_login(
+                get_user_model().objects.get(username=options['username'])
+            )
+        for _ in range(options['repeat']):
+            for url in options['urls']:
+                profiling.start()
+                try:
+                    client.get(url)
+                finally:
+                    profiling.stop()
+        self.stdout.write(
+            f'{"kind":<10}{"name":<45}{"calls":>8}{"total, ms":>12}'
+            f'{"avg, ms":>10}'
+        )
+        for kind, name, calls, total in profiling.aggregate_report():
+            self.stdout.write(
+                f'{kind:<10}{name:<45}{calls:>8}{total * 1000:>12.2f}'
+                f'{total * 1000 / calls:>10.3f}'
+            )
@@ -0,0 +1,28 @@
+import time
+
+from core import deletion
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Выполняет фоновые удаления из очереди.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=deletion.BATCH_SIZE,
+            help='Сколько строк удалять в одной транзакции.'
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Не завершаться, а проверять очередь каждые --interval с.'
+        )
+        parser.add_argument('--interval', type=float, default=5)
+
+    def handle(self, *args, **options):
+        while True:
+            done = deletion.run_pending(options['batch_size'])
+            if options['verbosity'] > 1 and done:
+                self.stdout.write(f'Выполнено заданий: {done}')
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
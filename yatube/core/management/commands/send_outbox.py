@@ -0,0 +1,27 @@
+import time
+
+from core import mail
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди OutgoingEmail.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help='Сколько писем отправлять через одно соединение.'
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Не завершаться, а проверять очередь каждые --interval с.'
+        )
+        parser.add_argument('--interval', type=float, default=5)
+
+    def handle(self, *args, **options):
+        while True:
+            while mail.deliver(options['batch_size']):
+                pass
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
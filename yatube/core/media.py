@@ -0,0 +1,128 @@
+"""Отдача медиафайлов после проверки доступа.
+
+Сам файл передаёт фронтенд-сервер (MEDIA_SERVE_MODE ``x-accel`` для nginx
+или ``x-sendfile`` для Apache/lighttpd). Без прокси (``python``) файл
+отдаётся через FileResponse с поддержкой Range: WSGI-сервер с
+``wsgi.file_wrapper`` (например, gunicorn) передаёт его через sendfile.
+"""
+import mimetypes
+import os
+import posixpath
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.utils.module_loading import import_string
+from django.views.static import was_modified_since
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class BoundedFile:
+    """Файл, читаемый не дальше заданной длины от текущей позиции.
+
+    ``fileno`` сохраняется, чтобы WSGI-сервер мог использовать sendfile:
+    он начинает с текущей позиции и ограничивается Content-Length.
+    """
+
+    def __init__(self, file, length):
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    """Возвращает (start, end) для одного диапазона байтов.
+
+    None означает, что заголовок нужно игнорировать и отдать файл целиком;
+    ValueError — что диапазон невыполним.
+    """
+    match = RANGE_RE.match(header.strip())
+    if match is None:
+        return None
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        start, end = max(size - int(end), 0), size - 1
+    else:
+        start = int(start)
+        end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+def serve(request, path):
+    path = posixpath.normpath(path).lstrip('/')
+    if any(part.startswith('.') for part in path.split('/')):
+        raise Http404
+    try:
+        fullpath = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404
+    check = import_string(settings.MEDIA_PERMISSION_CHECK)
+    if not check(request, path) or not os.path.isfile(fullpath):
+        raise Http404
+    content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+
+    mode = settings.MEDIA_SERVE_MODE
+    if mode == 'x-accel':
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = (
+            settings.MEDIA_ACCEL_PREFIX + quote(path)
+        )
+        return response
+    if mode == 'x-sendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = fullpath
+        return response
+    return serve_file(request, fullpath, content_type)
+
+
+def serve_file(request, fullpath, content_type):
+    stat = os.stat(fullpath)
+    if not was_modified_since(
+        request.META.get('HTTP_IF_MODIFIED_SINCE'),
+        stat.st_mtime, stat.st_size
+    ):
+        return HttpResponse(status=304)
+    try:
+        byte_range = parse_range(
+            request.META.get('HTTP_RANGE', ''), stat.st_size
+        )
+    except ValueError:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{stat.st_size}'
+        return response
+    file = open(fullpath, 'rb')
+    if byte_range is None:
+        response = FileResponse(file, content_type=content_type)
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        file.seek(start)
+        response = FileResponse(
+            BoundedFile(file, length), status=206, content_type=content_type
+        )
+        response['Content-Length'] = str(length)
+        response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+    response['Accept-Ranges'] = 'bytes'
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    return response
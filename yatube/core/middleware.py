@@ -0,0 +1,136 @@
+import logging
+import math
+import re
+
+from core import admission, compression, profiling
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+logger = logging.getLogger(__name__)
+
+
+class TemplateProfilerMiddleware:
+    """Замеряет рендеринг шаблонов на каждый запрос.
+
+    Результат отдаётся в заголовке Server-Timing и пишется в лог,
+    а также копится в общей статистике процесса.
+    """
+
+    def __init__(self, get_response):
+        if not settings.TEMPLATE_PROFILING:
+            raise MiddlewareNotUsed
+        profiling.install()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        profile = profiling.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiling.stop()
+        response['Server-Timing'] = profile.server_timing()
+        for kind, name, calls, total in profile.report():
+            logger.debug(
+                '%s %s %s: %d calls, %.2f ms',
+                request.path, kind, name, calls, total * 1000
+            )
+        return response
+
+
+class CompressionMiddleware:
+    """Сжимает ответы gzip или brotli, в том числе потоковые.
+
+    Сжимаются только ответы с типом из COMPRESS_CONTENT_TYPES; обычные
+    ответы короче COMPRESS_MIN_SIZE отдаются как есть. Файловые ответы
+    не трогаются: для них есть заранее сжатые копии.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not self.is_compressible(response):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = compression.negotiate(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        )
+        if encoding is None:
+            return response
+        if response.streaming:
+            response.streaming_content = compression.compress_stream(
+                response.streaming_content, encoding
+            )
+            del response['Content-Length']
+        else:
+            if len(response.content) < settings.COMPRESS_MIN_SIZE:
+                return response
+            compressed = compression.compress(response.content, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+        if response.has_header('ETag'):
+            response['ETag'] = re.sub(r'^"', 'W/"', response['ETag'])
+        response['Content-Encoding'] = encoding
+        return response
+
+    @staticmethod
+    def is_compressible(response):
+        if response.has_header('Content-Encoding'):
+            return False
+        if getattr(response, 'file_to_stream', None) is not None:
+            return False
+        if response.status_code in (204, 206, 304):
+            return False
+        content_type = response.get('Content-Type', '').split(';')[0]
+        return content_type.strip() in settings.COMPRESS_CONTENT_TYPES
+
+
+class AdmissionControlMiddleware:
+    """Отклоняет запросы сверх допустимой нагрузки (см. core.admission).
+
+    Решение принимается в process_view, когда известен маршрут, и до
+    вызова представления; слот класса освобождается после ответа.
+    """
+
+    def __init__(self, get_response):
+        if not settings.ADMISSION_CONTROL:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            return self.get_response(request)
+        finally:
+            slot = getattr(request, '_admission_slot', None)
+            if slot is not None:
+                slot.release()
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        name = admission.route_class(
+            request, request.resolver_match.view_name
+        )
+        retry_after = admission.take_token(
+            name, admission.client_id(request)
+        )
+        if retry_after:
+            return self.reject(429, retry_after)
+        slot = admission.semaphore(name)
+        if not slot.acquire(blocking=False):
+            return self.reject(503, settings.ADMISSION_RETRY_AFTER)
+        request._admission_slot = slot
+        return None
+
+    @staticmethod
+    def reject(status, retry_after):
+        response = HttpResponse(
+            'Сервер перегружен, повторите запрос позже.',
+            content_type='text/plain; charset=utf-8',
+            status=status,
+        )
+        response['Retry-After'] = str(math.ceil(retry_after))
+        return response
@@ -0,0 +1,33 @@
+# Generated by Django 2.2.16 on 2026-10-19 00:58
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_outgoingemail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True, verbose_name='Файл')),
+                ('size', models.PositiveIntegerField(verbose_name='Размер')),
+                ('refcount', models.PositiveIntegerField(default=0, verbose_name='Ссылок')),
+                ('touched', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Последнее обращение')),
+            ],
+            options={
+                'verbose_name': 'Медиафайл',
+                'verbose_name_plural': 'Медиафайлы',
+                'ordering': ('-touched',),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='mediablob',
+            index=models.Index(fields=['refcount', 'touched'], name='core_mediab_refcoun_185c09_idx'),
+        ),
+    ]
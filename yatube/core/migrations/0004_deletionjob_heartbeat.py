@@ -0,0 +1,18 @@
+# Generated by Django 2.2.16 on 2026-10-19 01:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_mediablob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='deletionjob',
+            name='heartbeat',
+            field=models.DateTimeField(null=True, verbose_name='Последняя активность'),
+        ),
+    ]
@@ -0,0 +1,116 @@
+from django.db import models
+from django.utils import timezone
+
+
+class DeletionJob(models.Model):
+    """Отложенное удаление объектов вместе с зависимыми строками
+    (см. core.deletion)."""
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Завершено'),
+        (FAILED, 'Ошибка'),
+    )
+
+    model = models.CharField(max_length=100, verbose_name='Модель')
+    object_ids = models.TextField(verbose_name='id объектов')
+    status = models.CharField(
+        max_length=10,
+        choices=STATUSES,
+        default=PENDING,
+        db_index=True,
+        verbose_name='Состояние'
+    )
+    deleted = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Удалено строк'
+    )
+    error = models.TextField(blank=True, verbose_name='Ошибка')
+    created = models.DateTimeField(auto_now_add=True, verbose_name='Создано')
+    finished = models.DateTimeField(null=True, verbose_name='Завершено')
+    heartbeat = models.DateTimeField(
+        null=True,
+        verbose_name='Последняя активность'
+    )
+
+    class Meta:
+        ordering = ('-created', )
+        verbose_name = 'Фоновое удаление'
+        verbose_name_plural = 'Фоновые удаления'
+
+    def __str__(self):
+        return f'{self.model}: {self.get_status_display()}'
+
+    @property
+    def ids(self):
+        return [int(pk) for pk in self.object_ids.split(',') if pk]
+
+
+class OutgoingEmail(models.Model):
+    """Письмо в очереди на отправку (см. core.mail)."""
+    PENDING = 'pending'
+    SENT = 'sent'
+    DEAD = 'dead'
+    STATUSES = (
+        (PENDING, 'В очереди'),
+        (SENT, 'Отправлено'),
+        (DEAD, 'Не доставлено'),
+    )
+
+    from_email = models.CharField(max_length=254, verbose_name='От кого')
+    recipients = models.TextField(verbose_name='Получатели')
+    message = models.TextField(verbose_name='Письмо (MIME)')
+    status = models.CharField(
+        max_length=10,
+        choices=STATUSES,
+        default=PENDING,
+        verbose_name='Состояние'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попыток'
+    )
+    next_attempt = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Следующая попытка'
+    )
+    last_error = models.TextField(blank=True, verbose_name='Ошибка')
+    created = models.DateTimeField(auto_now_add=True, verbose_name='Создано')
+    sent = models.DateTimeField(null=True, verbose_name='Отправлено')
+
+    class Meta:
+        ordering = ('-created', )
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        indexes = [models.Index(fields=['status', 'next_attempt'])]
+
+    def __str__(self):
+        return f'{self.recipients}: {self.get_status_display()}'
+
+
+class MediaBlob(models.Model):
+    """Файл ContentAddressedStorage и число ссылок на него
+    (см. core.blobs)."""
+    name = models.CharField(max_length=255, unique=True, verbose_name='Файл')
+    size = models.PositiveIntegerField(verbose_name='Размер')
+    refcount = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Ссылок'
+    )
+    touched = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Последнее обращение'
+    )
+
+    class Meta:
+        ordering = ('-touched', )
+        verbose_name = 'Медиафайл'
+        verbose_name_plural = 'Медиафайлы'
+        indexes = [models.Index(fields=['refcount', 'touched'])]
+
+    def __str__(self):
+        return self.name
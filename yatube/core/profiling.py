@@ -0,0 +1,175 @@
+"""Профилирование рендеринга шаблонов.
+
+Замеры включаются только внутри активного профиля (см. ``start``/``stop``),
+поэтому установленные обёртки почти ничего не стоят вне профилирования.
+Время каждой записи инклюзивное: в шаблон входит время его include и тегов.
+"""
+import functools
+import threading
+import time
+from collections import defaultdict
+
+from django.template import Template, engines
+from django.template.base import Node
+from django.template.loader_tags import ExtendsNode, IncludeNode
+
+TEMPLATE = 'template'
+EXTENDS = 'extends'
+INCLUDE = 'include'
+TAG = 'tag'
+FILTER = 'filter'
+
+_local = threading.local()
+_lock = threading.Lock()
+_aggregate = defaultdict(lambda: [0, 0.0])
+_installed = False
+_custom_node_classes = {}
+
+
+class RenderProfile:
+    """Замеры рендеринга в рамках одного запроса."""
+
+    def __init__(self):
+        self.timings = defaultdict(lambda: [0, 0.0])
+
+    def add(self, kind, name, elapsed):
+        entry = self.timings[(kind, name)]
+        entry[0] += 1
+        entry[1] += elapsed
+
+    def report(self):
+        return _report(self.timings)
+
+    def server_timing(self, limit=10):
+        """Значение заголовка Server-Timing с самыми дорогими записями."""
+        metrics = []
+        for number, row in enumerate(self.report()[:limit]):
+            kind, name, _, total = row
+            metrics.append(
+                f'{kind}-{number};desc="{name}";dur={total * 1000:.2f}'
+            )
+        return ', '.join(metrics)
+
+
+def _report(timings):
+    rows = [
+        (kind, name, calls, total)
+        for (kind, name), (calls, total) in timings.items()
+    ]
+    return sorted(rows, key=lambda row: row[3], reverse=True)
+
+
+def start():
+    profile = RenderProfile()
+    _local.profile = profile
+    return profile
+
+
+def stop():
+    profile = getattr(_local, 'profile', None)
+    _local.profile = None
+    if profile is not None:
+        with _lock:
+            for key, (calls, total) in profile.timings.items():
+                entry = _aggregate[key]
+                entry[0] += calls
+                entry[1] += total
+    return profile
+
+
+def aggregate_report():
+    with _lock:
+        return _report(_aggregate)
+
+
+def reset():
+    with _lock:
+        _aggregate.clear()
+
+
+def _measure(kind, name, func, *args, **kwargs):
+    profile = getattr(_local, 'profile', None)
+    if profile is None:
+        return func(*args, **kwargs)
+    started = time.perf_counter()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        profile.add(kind, name, time.perf_counter() - started)
+
+
+def _literal(filter_expression):
+    return filter_expression.token.strip('\'"')
+
+
+def _is_custom_node(node_class):
+    custom = _custom_node_classes.get(node_class)
+    if custom is None:
+        custom = not node_class.__module__.startswith('django.')
+        _custom_node_classes[node_class] = custom
+    return custom
+
+
+def _wrap_filter(name, func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return _measure(FILTER, name, func, *args, **kwargs)
+    return wrapper
+
+
+def install():
+    """Оборачивает рендеринг шаблонов, include, пользовательских тегов
+    и фильтров. Повторный вызов ничего не делает."""
+    global _installed
+    if _installed:
+        return
+    _installed = True
+
+    template_render = Template.render
+    extends_render = ExtendsNode.render
+    include_render = IncludeNode.render
+    node_render_annotated = Node.render_annotated
+
+    def render(self, context):
+        return _measure(TEMPLATE, self.name, template_render, self, context)
+
+    def render_extends(self, context):
+        return _measure(
+            EXTENDS, _literal(self.parent_name),
+            extends_render, self, context
+        )
+
+    def render_include(self, context):
+        return _measure(
+            INCLUDE, _literal(self.template),
+            include_render, self, context
+        )
+
+    def render_annotated(self, context):
+        if getattr(_local, 'profile', None) is None or not _is_custom_node(
+            type(self)
+        ):
+            return node_render_annotated(self, context)
+        return _measure(
+            TAG, self.token.split_contents()[0],
+            node_render_annotated, self, context
+        )
+
+    Template.render = render
+    ExtendsNode.render = render_extends
+    IncludeNode.render = render_include
+    Node.render_annotated = render_annotated
+    _wrap_custom_filters()
+
+
+def _wrap_custom_filters():
+    for backend in engines.all():
+        engine = getattr(backend, 'engine', None)
+        if engine is None:
+            continue
+        for label, path in engine.libraries.items():
+            if path.startswith('django.'):
+                continue
+            library = engine.template_libraries[label]
+            for name, func in list(library.filters.items()):
+                library.filters[name] = _wrap_filter(name, func)
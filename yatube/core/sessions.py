@@ -0,0 +1,186 @@
+"""Сессии с чтением из кэша и отложенной записью в базу.
+
+Чтение: сначала кэш процесса (SESSION_LOCAL_CACHE_TIMEOUT секунд), затем
+общий кэш, и только потом django_session. Кэш процесса не узнаёт об
+изменениях в других процессах, поэтому его время жизни — секунды:
+столько после выхода пользователя сессия ещё может читаться соседними
+воркерами.
+
+Запись: сохранение без изменений данных пропускается. Изменённые
+данные сразу попадают в кэши, а в базу при SESSION_WRITE_BEHIND
+записываются фоновым потоком пачками раз в SESSION_WRITE_BEHIND_INTERVAL
+секунд. Создание и удаление сессий пишутся в базу сразу: создание
+проверяет уникальность ключа, удаление не должно откладываться.
+Отложенная запись только обновляет существующие строки: сессию, удалённую
+другим процессом (выход пользователя), она не восстанавливает. Очередь
+живёт в памяти процесса и теряется, если воркер убит (SIGKILL по
+таймауту), поэтому в продакшене запись в базу синхронная.
+
+Просроченные сессии удаляет clearsessions пачками по CLEAR_BATCH_SIZE.
+"""
+import atexit
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.sessions.backends.cached_db import \
+    SessionStore as CachedDBStore
+from django.core.cache import caches
+from django.db import transaction
+from django.utils import timezone
+
+KEY_PREFIX = 'core.sessions'
+CLEAR_BATCH_SIZE = 1000
+
+_local = {}
+_local_lock = threading.Lock()
+
+
+def _local_get(key):
+    with _local_lock:
+        entry = _local.get(key)
+    if entry is None or entry[1] < time.monotonic():
+        return None
+    return entry[0]
+
+
+def _local_set(key, serialized):
+    expires = time.monotonic() + settings.SESSION_LOCAL_CACHE_TIMEOUT
+    with _local_lock:
+        if len(_local) >= settings.SESSION_LOCAL_CACHE_SIZE:
+            _local.clear()
+        _local[key] = (serialized, expires)
+
+
+def _local_delete(key):
+    with _local_lock:
+        _local.pop(key, None)
+
+
+class WriteBehindQueue:
+    """Отложенные записи сессий; для каждого ключа хранится последняя."""
+
+    def __init__(self):
+        self.pending = {}
+        self.lock = threading.Lock()
+        # Держится на время записи пачки, чтобы удаление сессии не
+        # обогнала запись её старых данных.
+        self.flush_lock = threading.Lock()
+        self.thread = None
+        self.pid = None
+
+    def put(self, obj):
+        with self.lock:
+            self.pending[obj.session_key] = obj
+            self.ensure_thread()
+
+    def discard(self, session_key):
+        with self.lock:
+            self.pending.pop(session_key, None)
+
+    def ensure_thread(self):
+        # После fork потоки родителя в дочернем процессе не работают.
+        if self.thread is not None and self.pid == os.getpid():
+            return
+        self.pid = os.getpid()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        while True:
+            time.sleep(settings.SESSION_WRITE_BEHIND_INTERVAL)
+            self.flush()
+
+    def flush(self):
+        with self.flush_lock:
+            with self.lock:
+                batch, self.pending = self.pending, {}
+            if not batch:
+                return
+            model = next(iter(batch.values())).__class__
+            gone = []
+            with transaction.atomic():
+                for obj in batch.values():
+                    if not model.objects.filter(
+                        session_key=obj.session_key
+                    ).update(
+                        session_data=obj.session_data,
+                        expire_date=obj.expire_date,
+                    ):
+                        gone.append(obj.session_key)
+            # Сессию удалили в другом процессе: убираем и данные,
+            # которые это сохранение успело положить в кэш.
+            cache = caches[settings.SESSION_CACHE_ALIAS]
+            for session_key in gone:
+                cache.delete(KEY_PREFIX + session_key)
+                _local_delete(KEY_PREFIX + session_key)
+
+
+write_behind = WriteBehindQueue()
+atexit.register(write_behind.flush)
+
+
+class SessionStore(CachedDBStore):
+    cache_key_prefix = KEY_PREFIX
+
+    # В кэше процесса и для сравнения при сохранении данные хранятся
+    # сериализованными: изменения словаря сессии в запросе их не портят.
+    _loaded = None
+
+    def load(self):
+        serialized = None
+        if self._session_key is not None:
+            serialized = _local_get(self.cache_key)
+        if serialized is not None:
+            data = self.serializer().loads(serialized)
+        else:
+            data = super().load()
+            serialized = self.serializer().dumps(data)
+            if self._session_key is not None and data:
+                _local_set(self.cache_key, serialized)
+        self._loaded = serialized
+        return data
+
+    def save(self, must_create=False):
+        if self.session_key is None or must_create:
+            super().save(must_create)
+            self._remember(self._session)
+            return
+        data = self._get_session()
+        serialized = self.serializer().dumps(data)
+        if serialized == self._loaded:
+            return
+        if settings.SESSION_WRITE_BEHIND:
+            self._cache.set(self.cache_key, data, self.get_expiry_age())
+            write_behind.put(self.create_model_instance(data))
+        else:
+            super().save(must_create)
+        self._remember(data, serialized)
+
+    def _remember(self, data, serialized=None):
+        if serialized is None:
+            serialized = self.serializer().dumps(data)
+        _local_set(self.cache_key, serialized)
+        self._loaded = serialized
+
+    def delete(self, session_key=None):
+        if session_key is None:
+            if self.session_key is None:
+                return
+            session_key = self.session_key
+        with write_behind.flush_lock:
+            write_behind.discard(session_key)
+            _local_delete(self.cache_key_prefix + session_key)
+            super().delete(session_key)
+
+    @classmethod
+    def clear_expired(cls):
+        expired = cls.get_model_class().objects.filter(
+            expire_date__lt=timezone.now()
+        ).values_list('pk', flat=True)
+        while True:
+            batch = list(expired[:CLEAR_BATCH_SIZE])
+            if not batch:
+                return
+            cls.get_model_class().objects.filter(pk__in=batch).delete()
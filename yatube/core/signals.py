@@ -0,0 +1,17 @@
+from core.backends import user_cache_key
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_cached_user(sender, instance, **kwargs):
+    key = user_cache_key(instance.pk)
+    cache.delete(key)
+    # Параллельный запрос мог успеть закэшировать строку до фиксации.
+    transaction.on_commit(lambda: cache.delete(key))
@@ -0,0 +1,86 @@
+import hashlib
+import os
+import posixpath
+import threading
+
+from core import blobs, compression
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Хэширует имена статики и кладёт рядом сжатые копии .gz и .br.
+
+    Файлы с хэшем в имени неизменны, поэтому веб-сервер может отдавать
+    их с долгим кэшированием и готовыми сжатыми вариантами, например
+    в nginx: ``gzip_static on; brotli_static on; expires max;``.
+    """
+
+    compressible_extensions = (
+        '.css', '.js', '.json', '.svg', '.txt', '.xml', '.html', '.map',
+        '.ico', '.eot', '.ttf', '.otf',
+    )
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        for name in self.hashed_files.values():
+            if name.endswith(self.compressible_extensions):
+                for compressed_name in self.write_compressed(name):
+                    yield name, compressed_name, True
+
+    def write_compressed(self, name):
+        with self.open(name) as source:
+            data = source.read()
+        for encoding in compression.available_encodings():
+            compressed = compression.compress(data, encoding, best=True)
+            if len(compressed) >= len(data):
+                continue
+            target = name + compression.EXTENSIONS[encoding]
+            if self.exists(target):
+                self.delete(target)
+            self._save(target, ContentFile(compressed))
+            yield target
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """Называет файлы по SHA-256 содержимого: ``posts/ab/ab…cd.jpg``.
+
+    Повторная загрузка того же содержимого не пишет файл заново и
+    получает то же имя, поэтому миниатюры sorl-thumbnail, ключ которых
+    строится по имени исходника, тоже создаются один раз. Удалением
+    файлов без ссылок занимается core.blobs.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # Имя определяется содержимым в _save: одно имя — один файл.
+        return name
+
+    def hashed_name(self, name, content):
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        hexdigest = digest.hexdigest()
+        directory, filename = posixpath.split(name)
+        extension = posixpath.splitext(filename)[1].lower()
+        return posixpath.join(
+            directory, hexdigest[:2], hexdigest + extension
+        )
+
+    def _save(self, name, content):
+        name = self.hashed_name(name, content)
+        blobs.touch(name, content.size)
+        if self.exists(name):
+            return name
+        full_path = self.path(name)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        temporary = f'{full_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(temporary, 'wb') as output:
+            for chunk in content.chunks():
+                output.write(chunk)
+        if self.file_permissions_mode is not None:
+            os.chmod(temporary, self.file_permissions_mode)
+        os.replace(temporary, full_path)
+        return name
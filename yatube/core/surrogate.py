@@ -0,0 +1,107 @@
+"""Surrogate-ключи для HTTP-кэша перед приложением.
+
+Представления помечают запрос ключами объектов, от которых зависит ответ,
+а ``SurrogateKeyMiddleware`` выводит их в заголовок ответа. При изменении
+объектов ключи передаются в ``purge``: они копятся до конца транзакции
+и отправляются подключённым бэкендам пачками.
+"""
+import logging
+import threading
+import urllib.request
+from collections import deque
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+def add_keys(request, *keys):
+    if not hasattr(request, 'surrogate_keys'):
+        request.surrogate_keys = set()
+    request.surrogate_keys.update(keys)
+
+
+class SurrogateKeyMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        keys = getattr(request, 'surrogate_keys', None)
+        header = settings.SURROGATE_KEY_HEADER
+        if keys and not response.has_header(header):
+            response[header] = ' '.join(sorted(keys))
+        return response
+
+
+class LocalPurgeBackend:
+    """Бэкенд без сети для тестов и разработки: запоминает пачки ключей."""
+
+    def __init__(self, maxlen=1000):
+        self.batches = deque(maxlen=maxlen)
+
+    def purge(self, keys):
+        self.batches.append(keys)
+
+
+class HTTPPurgeBackend:
+    """Отправляет запрос очистки кэширующему прокси."""
+
+    def __init__(self):
+        self.url = settings.SURROGATE_PURGE_URL
+        self.method = getattr(settings, 'SURROGATE_PURGE_METHOD', 'PURGE')
+        self.timeout = getattr(settings, 'SURROGATE_PURGE_TIMEOUT', 2)
+
+    def purge(self, keys):
+        request = urllib.request.Request(
+            self.url,
+            method=self.method,
+            headers={settings.SURROGATE_KEY_HEADER: ' '.join(keys)},
+        )
+        try:
+            urllib.request.urlopen(request, timeout=self.timeout).close()
+        except OSError:
+            logger.exception('Surrogate key purge failed: %s', keys)
+
+
+@lru_cache(maxsize=None)
+def get_backends():
+    return tuple(
+        import_string(path)() for path in settings.SURROGATE_PURGE_BACKENDS
+    )
+
+
+@receiver(setting_changed)
+def reset_backends(*, setting, **kwargs):
+    if setting == 'SURROGATE_PURGE_BACKENDS':
+        get_backends.cache_clear()
+
+
+def purge(keys, using=None):
+    """Ставит ключи в очередь на очистку после фиксации транзакции.
+
+    Если транзакция откатилась, ключи уйдут со следующей: лишняя очистка
+    безопасна, пропущенная — нет.
+    """
+    if not hasattr(_local, 'pending'):
+        _local.pending = set()
+    _local.pending.update(keys)
+    transaction.on_commit(flush, using=using)
+
+
+def flush():
+    keys = sorted(getattr(_local, 'pending', ()))
+    _local.pending = set()
+    if not keys:
+        return
+    size = settings.SURROGATE_PURGE_BATCH_SIZE
+    for backend in get_backends():
+        for start in range(0, len(keys), size):
+            backend.purge(keys[start:start + size])
@@ -0,0 +1,72 @@
+"""Загрузка шаблонов из кэша, заполняемого при старте процесса."""
+import os
+
+from django.template import Template, engines
+from django.template.loaders import cached
+
+
+class Loader(cached.Loader):
+    """Кэширующий загрузчик с дешёвой проверкой актуальности.
+
+    С ``validate=True`` (режим разработки) на каждое обращение к кэшу
+    выполняется только ``stat`` исходного файла: изменённый шаблон
+    компилируется заново, закэшированные промахи не используются.
+    """
+
+    def __init__(self, engine, loaders, validate=False):
+        super().__init__(engine, loaders)
+        self.validate = validate
+        self.mtimes = {}
+
+    def get_template(self, template_name, skip=None):
+        if not self.validate:
+            return super().get_template(template_name, skip)
+        key = self.cache_key(template_name, skip)
+        cached_template = self.get_template_cache.get(key)
+        if cached_template is not None and self._is_stale(cached_template):
+            del self.get_template_cache[key]
+        template = super().get_template(template_name, skip)
+        self.mtimes.setdefault(template.origin.name, _mtime(template.origin))
+        return template
+
+    def _is_stale(self, cached_template):
+        if not isinstance(cached_template, Template):
+            return True
+        name = cached_template.origin.name
+        if self.mtimes.get(name) == _mtime(cached_template.origin):
+            return False
+        self.mtimes.pop(name, None)
+        return True
+
+    def reset(self):
+        super().reset()
+        self.mtimes.clear()
+
+
+def _mtime(origin):
+    try:
+        return os.stat(origin.name).st_mtime_ns
+    except OSError:
+        return None
+
+
+def warm_templates():
+    """Компилирует все шаблоны из каталогов TEMPLATES['DIRS'].
+
+    Вызывается при старте процесса, чтобы запросы не разбирали исходники.
+    Возвращает число скомпилированных шаблонов.
+    """
+    count = 0
+    for backend in engines.all():
+        engine = getattr(backend, 'engine', None)
+        if engine is None:
+            continue
+        for directory in engine.dirs:
+            for root, _, filenames in os.walk(directory):
+                for filename in filenames:
+                    name = os.path.relpath(
+                        os.path.join(root, filename), directory
+                    )
+                    engine.get_template(name.replace(os.sep, '/'))
+                    count += 1
+    return count
@@ -0,0 +1,9 @@
+from core import holes
+from django import template
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def hole(context, template_name, **params):
+    return holes.hole(context.get('request'), template_name, params)
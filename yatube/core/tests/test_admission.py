@@ -0,0 +1,84 @@
+from core import admission
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+User = get_user_model()
+
+CLASSES = {
+    'read': {'concurrency': 4, 'rate': 100, 'burst': 100},
+    'feed': {'concurrency': 4, 'rate': 1, 'burst': 2},
+    'write': {'concurrency': 1, 'rate': 100, 'burst': 100},
+}
+
+
+@override_settings(ADMISSION_CONTROL=True, ADMISSION_CLASSES=CLASSES)
+class AdmissionControlTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        admission._semaphores.clear()
+
+    def test_rate_limit(self):
+        """Сверх корзины токенов — 429 с Retry-After, другие классы
+        маршрутов не затрагиваются."""
+        url = reverse('posts:index')
+        for _ in range(2):
+            self.assertEqual(self.client.get(url).status_code, 200)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 429)
+        self.assertIn(response['Retry-After'], ('1', '2'))
+        self.assertEqual(
+            self.client.get(reverse('about:author')).status_code, 200
+        )
+
+    def test_window_resets(self):
+        """burst запросов за окно в burst / rate секунд."""
+        for _ in range(2):
+            self.assertEqual(admission.take_token('feed', 'c', now=100), 0)
+        self.assertAlmostEqual(
+            admission.take_token('feed', 'c', now=100.25), 1.75
+        )
+        self.assertEqual(admission.take_token('feed', 'c', now=102), 0)
+
+    def test_concurrency_limit(self):
+        """Когда все слоты класса заняты, запрос сразу получает 503."""
+        user = User.objects.create_user(username='author')
+        self.client.force_login(user)
+        url = reverse('posts:post_create')
+        slot = admission.semaphore('write')
+        slot.acquire()
+        try:
+            response = self.client.get(url)
+        finally:
+            slot.release()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '1')
+        self.assertEqual(self.client.get(url).status_code, 200)
+        # Слот освобождён после ответа.
+        self.assertTrue(slot.acquire(blocking=False))
+        slot.release()
+
+    @override_settings(ADMISSION_CLIENT_IP_HEADER='HTTP_X_FORWARDED_FOR')
+    def test_client_ip_behind_proxy(self):
+        """Анонимные клиенты за прокси не делят одну корзину."""
+        url = reverse('posts:index')
+        for address in ('10.0.0.1', '10.0.0.2'):
+            for _ in range(2):
+                response = self.client.get(
+                    url, HTTP_X_FORWARDED_FOR=f'1.1.1.1, {address}'
+                )
+                self.assertEqual(response.status_code, 200)
+        # Заголовок от недоверенного адреса не учитывается.
+        response = self.client.get(
+            url, REMOTE_ADDR='10.9.9.9', HTTP_X_FORWARDED_FOR='10.0.0.3'
+        )
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(
+            url, REMOTE_ADDR='10.9.9.9', HTTP_X_FORWARDED_FOR='10.0.0.4'
+        )
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(
+            url, REMOTE_ADDR='10.9.9.9', HTTP_X_FORWARDED_FOR='10.0.0.5'
+        )
+        self.assertEqual(response.status_code, 429)
@@ -0,0 +1,58 @@
+from core.backends import user_cache_key
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+User = get_user_model()
+
+
+class CachedModelBackendTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='reader', password='password'
+        )
+        self.client.login(username='reader', password='password')
+        self.url = reverse('about:author')
+        self.client.get(self.url)
+
+    def get_user(self):
+        return self.client.get(self.url).context['user']
+
+    def test_user_is_cached(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_user(), self.user)
+
+    def test_profile_change_is_visible(self):
+        self.user.first_name = 'Читатель'
+        self.user.save()
+        self.assertEqual(self.get_user().first_name, 'Читатель')
+
+    def test_password_change_ends_session(self):
+        """Хеш сессии сверяется с новым паролем, а не с кэшем."""
+        self.user.set_password('new-password')
+        self.user.save()
+        self.assertFalse(self.get_user().is_authenticated)
+
+    def test_deactivated_user_is_logged_out(self):
+        self.user.is_active = False
+        self.user.save()
+        self.assertFalse(self.get_user().is_authenticated)
+
+    def test_password_hash_not_cached(self):
+        fields, *_ = cache.get(user_cache_key(self.user.pk))
+        self.assertNotIn('password', fields)
+        self.assertNotIn(self.user.password, repr(fields))
+
+    def test_password_change_keeps_current_session(self):
+        """Смена пароля своим запросом не разлогинивает пользователя."""
+        response = self.client.post(reverse('users:password_change_form'), {
+            'old_password': 'password',
+            'new_password1': 'Nj7-new-password',
+            'new_password2': 'Nj7-new-password',
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(self.get_user().is_authenticated)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('Nj7-new-password'))
@@ -0,0 +1,22 @@
+from core.bloom import BloomFilter
+from django.test import SimpleTestCase
+
+
+class BloomFilterTests(SimpleTestCase):
+    def test_no_false_negatives(self):
+        bloom = BloomFilter.for_capacity(1000, 0.01)
+        for number in range(1000):
+            bloom.add(f'user_{number}')
+        for number in range(1000):
+            self.assertIn(f'user_{number}', bloom)
+        false_positives = sum(
+            f'missing_{number}' in bloom for number in range(10_000)
+        )
+        self.assertLess(false_positives, 300)
+
+    def test_dumps(self):
+        bloom = BloomFilter.for_capacity(10, 0.01)
+        bloom.add(42)
+        restored = BloomFilter.loads(bloom.dumps())
+        self.assertIn(42, restored)
+        self.assertNotIn(43, restored)
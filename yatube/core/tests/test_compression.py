@@ -0,0 +1,55 @@
+import gzip
+from unittest import skipIf
+
+from core.compression import brotli
+from core.middleware import CompressionMiddleware
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+HTML = ('<p>Тестовый пост</p>' * 100).encode()
+
+
+@override_settings(COMPRESS_MIN_SIZE=512)
+class CompressionMiddlewareTests(SimpleTestCase):
+    def process(self, response, accept_encoding='gzip'):
+        request = RequestFactory().get(
+            '/', HTTP_ACCEPT_ENCODING=accept_encoding
+        )
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_gzip_html(self):
+        """HTML сжимается gzip, если клиент его принимает."""
+        response = self.process(HttpResponse(HTML))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), HTML)
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    @skipIf(brotli is None, 'Brotli не установлен')
+    def test_brotli_preferred(self):
+        """Brotli выбирается, когда клиент принимает br."""
+        response = self.process(HttpResponse(HTML), 'gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(response.content), HTML)
+
+    def test_streaming_response(self):
+        """Потоковый ответ сжимается по частям."""
+        response = self.process(
+            StreamingHttpResponse(HTML[i:i + 100] for i in range(0, 2000, 100))
+        )
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(
+            gzip.decompress(b''.join(response.streaming_content)), HTML[:2000]
+        )
+
+    def test_thresholds(self):
+        """Короткие ответы и неподходящие типы не сжимаются."""
+        responses = (
+            HttpResponse(b'<p>short</p>'),
+            HttpResponse(HTML, content_type='image/png'),
+            HttpResponse(HTML),
+        )
+        encodings = ('gzip', 'gzip', 'identity')
+        for response, accept_encoding in zip(responses, encodings):
+            with self.subTest(accept_encoding=accept_encoding):
+                response = self.process(response, accept_encoding)
+                self.assertFalse(response.has_header('Content-Encoding'))
@@ -0,0 +1,124 @@
+from datetime import timedelta
+
+from core import deletion
+from core.models import DeletionJob
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from posts.models import Comment, Follow, FollowSuggestion, Group, Post
+
+User = get_user_model()
+
+
+class DeletionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='author')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        for number in range(5):
+            cls.post = Post.objects.create(
+                author=cls.author, text=f'Пост {number}', group=cls.group
+            )
+            Comment.objects.create(post=cls.post, author=cls.reader, text='!')
+        Follow.objects.create(user=cls.reader, author=cls.author)
+
+    def test_batches(self):
+        """Зависимые строки удаляются пачками не больше batch_size."""
+        with CaptureQueriesContext(connection) as queries:
+            deleted = deletion.delete_batched(
+                User, [self.author.pk], batch_size=2
+            )
+        # Посты, комментарии, оценки популярности, подписка и автор.
+        self.assertEqual(deleted, 5 + 5 + 5 + 1 + 1)
+        self.assertFalse(User.objects.filter(pk=self.author.pk).exists())
+        self.assertFalse(Comment.objects.exists())
+        self.assertFalse(Follow.objects.exists())
+        post_deletes = [
+            query for query in queries.captured_queries
+            if query['sql'].startswith('DELETE FROM "posts_post"')
+        ]
+        self.assertEqual(len(post_deletes), 3)
+        self.group.refresh_from_db()
+        self.assertEqual(
+            (self.group.post_count, self.group.latest_post), (0, None)
+        )
+
+    def test_job(self):
+        job = deletion.schedule(User.objects.filter(pk=self.author.pk))
+        call_command('run_deletion_jobs', batch_size=2)
+        job.refresh_from_db()
+        self.assertEqual(job.status, DeletionJob.DONE)
+        self.assertEqual(job.deleted, 17)
+        self.assertIsNotNone(job.finished)
+
+    def test_admin_schedules(self):
+        admin = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        self.client.force_login(admin)
+        self.client.post(reverse('admin:posts_post_changelist'), {
+            'action': 'delete_selected',
+            '_selected_action': list(
+                Post.objects.values_list('pk', flat=True)[:2]
+            ),
+            'post': 'yes',
+        })
+        self.assertEqual(Post.objects.count(), 5)
+        job = DeletionJob.objects.get()
+        self.assertEqual(len(job.ids), 2)
+        deletion.run_pending()
+        self.assertEqual(Post.objects.count(), 3)
+
+    def test_admin_confirmation_and_messages(self):
+        """Подтверждение не собирает каскад, а после подтверждения админка
+        не сообщает об удалении, которого ещё не было."""
+        admin = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        self.client.force_login(admin)
+        url = reverse('admin:posts_post_delete', args=[self.post.pk])
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        self.assertFalse(any(
+            'posts_comment' in query['sql']
+            for query in queries.captured_queries
+        ))
+        response = self.client.post(
+            reverse('admin:posts_post_changelist'),
+            {'action': 'delete_selected', '_selected_action': [self.post.pk]}
+        )
+        self.assertContains(response, str(self.post))
+        response = self.client.post(url, {'post': 'yes'}, follow=True)
+        self.assertEqual(
+            [str(message) for message in response.context['messages']],
+            [f'Удаление поставлено в очередь '
+             f'(задание {DeletionJob.objects.get().pk}).']
+        )
+
+    def test_hidden_relations_batched(self):
+        """Связи с related_name='+' тоже удаляются пачками."""
+        relations = {
+            (relation.related_model, relation.field.name)
+            for relation in deletion.cascade_relations(User)
+        }
+        self.assertIn((FollowSuggestion, 'author'), relations)
+
+    def test_abandoned_job_retried(self):
+        job = deletion.schedule(User.objects.filter(pk=self.author.pk))
+        DeletionJob.objects.filter(pk=job.pk).update(
+            status=DeletionJob.RUNNING,
+            heartbeat=timezone.now() - timedelta(
+                seconds=settings.DELETION_LEASE + 1
+            ),
+        )
+        self.assertEqual(deletion.run_pending(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, DeletionJob.DONE)
@@ -0,0 +1,47 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+from posts.models import Post
+
+User = get_user_model()
+
+
+class CachePageWithHolesTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth_user')
+
+    def setUp(self):
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+        self.post = Post.objects.create(
+            author=self.user,
+            text='Закэшированный пост',
+        )
+        cache.clear()
+
+    def test_shared_page_with_personal_header(self):
+        """Кэш страницы общий, а шапка своя у каждого пользователя."""
+        guest_content = self.guest_client.get(
+            reverse('posts:index')
+        ).content.decode()
+        self.post.delete()
+        user_content = self.authorized_client.get(
+            reverse('posts:index')
+        ).content.decode()
+        self.assertIn('Закэшированный пост', user_content)
+        self.assertIn(reverse('users:logout'), user_content)
+        self.assertNotIn(reverse('users:logout'), guest_content)
+        self.assertNotIn('<!--hole:', user_content)
+
+    def test_fragments_rendered_in_place_without_cache(self):
+        """Без кэширования фрагменты рендерятся на месте."""
+        response = self.authorized_client.get(
+            reverse('posts:profile', kwargs={'username': 'auth_user'})
+        )
+        content = response.content.decode()
+        self.assertIn(reverse('users:logout'), content)
+        self.assertNotIn('<!--hole:', content)
@@ -0,0 +1,83 @@
+from datetime import timedelta
+from unittest import mock
+
+from core import mail as outbox
+from core.models import OutgoingEmail
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+User = get_user_model()
+
+
+@override_settings(
+    EMAIL_BACKEND='core.mail.OutboxEmailBackend',
+    OUTBOX_EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    OUTBOX_MAX_ATTEMPTS=2,
+)
+class OutboxTests(TestCase):
+    def test_password_reset_is_queued(self):
+        """Сброс пароля не отправляет письмо в запросе."""
+        User.objects.create_user(
+            username='reader', email='reader@example.com',
+            password='password'
+        )
+        self.client.post(
+            reverse('users:password_reset_form'),
+            {'email': 'reader@example.com'}
+        )
+        self.assertEqual(mail.outbox, [])
+        queued = OutgoingEmail.objects.get()
+        self.assertEqual(queued.recipients, 'reader@example.com')
+
+        call_command('send_outbox')
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn('reader@example.com', mail.outbox[0].recipients())
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, OutgoingEmail.SENT)
+
+    def test_retry_and_dead_letter(self):
+        mail.send_mail('Тема', 'Текст', 'from@example.com',
+                       ['to@example.com'])
+        with mock.patch(
+            'django.core.mail.backends.locmem.EmailBackend.send_messages',
+            side_effect=OSError('connection reset'),
+        ):
+            self.assertEqual(outbox.deliver(), 0)
+            queued = OutgoingEmail.objects.get()
+            self.assertEqual(
+                (queued.status, queued.attempts),
+                (OutgoingEmail.PENDING, 1)
+            )
+            self.assertGreater(queued.next_attempt, timezone.now())
+            # До следующей попытки письмо не берётся.
+            self.assertEqual(outbox.deliver(), 0)
+            OutgoingEmail.objects.update(
+                next_attempt=timezone.now() - timedelta(seconds=1)
+            )
+            outbox.deliver()
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, OutgoingEmail.DEAD)
+        self.assertIn('connection reset', queued.last_error)
+        self.assertEqual(mail.outbox, [])
+
+    @override_settings(
+        OUTBOX_EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend'
+    )
+    def test_smtp_backend_sends_raw_message(self):
+        mail.send_mail('Тема', 'Привет', 'from@example.com',
+                       ['to@example.com'])
+        with mock.patch('smtplib.SMTP') as smtp:
+            self.assertEqual(outbox.deliver(), 1)
+        from_email, recipients, data = smtp.return_value.sendmail.call_args[0]
+        self.assertEqual(
+            (from_email, recipients), ('from@example.com', ['to@example.com'])
+        )
+        self.assertIn(b'\r\n\r\n', data)
+        self.assertTrue(data.endswith('Привет'.encode()))
+        self.assertEqual(
+            OutgoingEmail.objects.get().status, OutgoingEmail.SENT
+        )
@@ -0,0 +1,74 @@
+import os
+import shutil
+import tempfile
+
+from django.test import Client, SimpleTestCase, override_settings
+
+MEDIA_ROOT = tempfile.mkdtemp()
+CONTENT = bytes(range(256)) * 4
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, MEDIA_SERVE_MODE='python')
+class MediaServeTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        os.makedirs(os.path.join(MEDIA_ROOT, 'posts'))
+        with open(os.path.join(MEDIA_ROOT, 'posts', 'image.gif'), 'wb') as f:
+            f.write(CONTENT)
+        with open(os.path.join(MEDIA_ROOT, 'private.txt'), 'wb') as f:
+            f.write(b'secret')
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.client = Client()
+
+    def test_full_file(self):
+        """Файл отдаётся целиком с поддержкой диапазонов."""
+        response = self.client.get('/media/posts/image.gif')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(b''.join(response.streaming_content), CONTENT)
+
+    def test_range_request(self):
+        """Запрос с Range получает только запрошенные байты."""
+        ranges = {
+            'bytes=10-19': (CONTENT[10:20], 'bytes 10-19/1024'),
+            'bytes=1000-': (CONTENT[1000:], 'bytes 1000-1023/1024'),
+            'bytes=-4': (CONTENT[-4:], 'bytes 1020-1023/1024'),
+        }
+        for header, (content, content_range) in ranges.items():
+            with self.subTest(header=header):
+                response = self.client.get(
+                    '/media/posts/image.gif', HTTP_RANGE=header
+                )
+                self.assertEqual(response.status_code, 206)
+                self.assertEqual(response['Content-Range'], content_range)
+                self.assertEqual(
+                    b''.join(response.streaming_content), content
+                )
+
+    def test_unsatisfiable_range(self):
+        response = self.client.get(
+            '/media/posts/image.gif', HTTP_RANGE='bytes=5000-'
+        )
+        self.assertEqual(response.status_code, 416)
+
+    @override_settings(MEDIA_SERVE_MODE='x-accel')
+    def test_x_accel_redirect(self):
+        """С nginx файл передаётся через X-Accel-Redirect."""
+        response = self.client.get('/media/posts/image.gif')
+        self.assertEqual(
+            response['X-Accel-Redirect'], '/protected-media/posts/image.gif'
+        )
+        self.assertEqual(response.content, b'')
+
+    def test_forbidden_paths(self):
+        """Файлы вне разрешённых каталогов не отдаются."""
+        for url in ('/media/private.txt', '/media/posts/../private.txt'):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 404)
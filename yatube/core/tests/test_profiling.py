@@ -0,0 +1,58 @@
+from core import profiling
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+@override_settings(TEMPLATE_PROFILING=True)
+class TemplateProfilerTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth_user')
+        cls.group = Group.objects.create(
+            title='test_group',
+            slug='test_slug',
+            description='test description'
+        )
+        cls.post = Post.objects.create(
+            author=cls.user,
+            text='Тестовый пост',
+            group=cls.group,
+        )
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+        profiling.reset()
+        cache.clear()
+
+    def test_server_timing_header(self):
+        """Ответ содержит заголовок Server-Timing с замерами шаблонов."""
+        response = self.authorized_client.get(reverse('posts:index'))
+        self.assertIn('posts/index.html', response['Server-Timing'])
+
+    def test_breakdown_by_template_include_tag_and_filter(self):
+        """Замеры разбиты по шаблонам, include, тегам и фильтрам."""
+        self.authorized_client.get(reverse('posts:index'))
+        self.authorized_client.get(
+            reverse('posts:post_detail', kwargs={'post_id': self.post.id})
+        )
+        recorded = {
+            (kind, name) for kind, name, _, _ in profiling.aggregate_report()
+        }
+        expected = (
+            (profiling.TEMPLATE, 'posts/post_detail.html'),
+            (profiling.EXTENDS, 'base.html'),
+            (profiling.INCLUDE, 'posts/includes/paginator.html'),
+            (profiling.TEMPLATE, 'includes/header.html'),
+            (profiling.TAG, 'thumbnail'),
+            (profiling.FILTER, 'addclass'),
+        )
+        for key in expected:
+            with self.subTest(key=key):
+                self.assertIn(key, recorded)
@@ -0,0 +1,100 @@
+from core import sessions
+from core.sessions import SessionStore
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+User = get_user_model()
+
+
+class SessionStoreTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        sessions._local.clear()
+
+    def create(self, **data):
+        session = SessionStore()
+        session.update(data)
+        session.create()
+        return session.session_key
+
+    def test_reads_skip_database(self):
+        session_key = self.create(user='1')
+        with self.assertNumQueries(0):
+            self.assertEqual(SessionStore(session_key)['user'], '1')
+        # Другой процесс: локальной копии нет, сессия читается из кэша.
+        sessions._local.clear()
+        with self.assertNumQueries(0):
+            self.assertEqual(SessionStore(session_key)['user'], '1')
+
+    def test_unchanged_data_is_not_written(self):
+        session_key = self.create(user='1')
+        session = SessionStore(session_key)
+        session['user'] = '1'
+        with self.assertNumQueries(0):
+            session.save()
+
+    @override_settings(SESSION_WRITE_BEHIND=True)
+    def test_write_behind(self):
+        session_key = self.create(user='1')
+        session = SessionStore(session_key)
+        session['user'] = '2'
+        with self.assertNumQueries(0):
+            session.save()
+        self.assertEqual(SessionStore(session_key)['user'], '2')
+        stored = Session.objects.get(session_key=session_key)
+        self.assertEqual(stored.get_decoded()['user'], '1')
+        sessions.write_behind.flush()
+        stored = Session.objects.get(session_key=session_key)
+        self.assertEqual(stored.get_decoded()['user'], '2')
+
+    @override_settings(SESSION_WRITE_BEHIND=True)
+    def test_delete_drops_pending_write(self):
+        session_key = self.create(user='1')
+        session = SessionStore(session_key)
+        session['user'] = '2'
+        session.save()
+        session.delete()
+        sessions.write_behind.flush()
+        self.assertFalse(
+            Session.objects.filter(session_key=session_key).exists()
+        )
+        self.assertNotIn('user', SessionStore(session_key))
+
+    def test_clear_expired_in_batches(self):
+        session_key = self.create(user='1')
+        Session.objects.filter(session_key=session_key).update(
+            expire_date='2000-01-01 00:00:00+00:00'
+        )
+        kept = self.create(user='2')
+        SessionStore.clear_expired()
+        self.assertEqual(
+            list(Session.objects.values_list('session_key', flat=True)),
+            [kept]
+        )
+
+    def test_authenticated_requests(self):
+        """Запросы после входа не обращаются ни к django_session, ни
+        к auth_user."""
+        User.objects.create_user(username='reader', password='password')
+        self.client.login(username='reader', password='password')
+        self.client.get(reverse('about:author'))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('about:author'))
+        self.assertEqual(response.context['user'].username, 'reader')
+
+    @override_settings(SESSION_WRITE_BEHIND=True)
+    def test_write_behind_does_not_restore_deleted_session(self):
+        """Выход в другом процессе не отменяется отложенной записью."""
+        session_key = self.create(user='1')
+        session = SessionStore(session_key)
+        session['user'] = '2'
+        session.save()
+        Session.objects.filter(session_key=session_key).delete()
+        sessions.write_behind.flush()
+        self.assertFalse(
+            Session.objects.filter(session_key=session_key).exists()
+        )
+        self.assertNotIn('user', SessionStore(session_key))
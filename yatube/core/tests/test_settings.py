@@ -0,0 +1,59 @@
+import os
+import subprocess
+import sys
+
+from core.checks import check_shared_cache
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+
+# Модули, которые не должны загружаться при старте в продакшене.
+PRODUCTION_IMPORT_DENY_LIST = (
+    'debug_toolbar',
+    'django.test',
+    'faker',
+    'mixer',
+    'pytest',
+)
+
+LIST_MODULES = (
+    'import sys; import yatube.wsgi; '
+    'print("\\n".join(sorted(sys.modules)))'
+)
+
+
+class ProductionStartupTests(SimpleTestCase):
+    def test_production_startup_skips_dev_modules(self):
+        """Старт в продакшене не импортирует модули из запретного списка."""
+        env = dict(
+            os.environ,
+            DJANGO_ENV='prod',
+            DJANGO_SETTINGS_MODULE='yatube.settings',
+            SECRET_KEY='import-budget-test',
+        )
+        modules = subprocess.run(
+            [sys.executable, '-c', LIST_MODULES],
+            cwd=settings.BASE_DIR, env=env, check=True,
+            stdout=subprocess.PIPE, universal_newlines=True,
+        ).stdout.split()
+        for denied in PRODUCTION_IMPORT_DENY_LIST:
+            with self.subTest(module=denied):
+                loaded = [
+                    name for name in modules
+                    if name == denied or name.startswith(denied + '.')
+                ]
+                self.assertEqual(loaded, [])
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+    def test_process_local_cache_warns(self):
+        self.assertEqual(
+            [warning.id for warning in check_shared_cache(None)],
+            ['core.W001']
+        )
+
+    @override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+        'LOCATION': '127.0.0.1:11211',
+    }})
+    def test_shared_cache_passes(self):
+        self.assertEqual(check_shared_cache(None), [])
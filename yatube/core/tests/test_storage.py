@@ -0,0 +1,122 @@
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from core import blobs
+from core.models import MediaBlob
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from posts.models import Post
+from sorl.thumbnail import get_thumbnail
+
+User = get_user_model()
+
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3B'
+)
+OTHER_GIF = SMALL_GIF.replace(b'\xFF\xFF\xFF', b'\x00\xFF\x00')
+
+
+class ContentAddressedStorageTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='author')
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        overrides = override_settings(MEDIA_ROOT=self.root)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+
+    def create_post(self, content=SMALL_GIF, name='small.gif'):
+        return Post.objects.create(
+            author=self.user, text='Пост',
+            image=SimpleUploadedFile(name, content, 'image/gif')
+        )
+
+    def files(self):
+        return sorted(
+            os.path.relpath(os.path.join(path, name), self.root)
+            for path, _, names in os.walk(os.path.join(self.root, 'posts'))
+            for name in names
+        )
+
+    def refcount(self, name):
+        return MediaBlob.objects.get(name=name).refcount
+
+    def test_duplicate_upload_stored_once(self):
+        first = self.create_post()
+        second = self.create_post(name='copy.GIF')
+        self.assertEqual(first.image.name, second.image.name)
+        self.assertEqual(self.files(), [first.image.name])
+        self.assertEqual(self.refcount(first.image.name), 2)
+        self.assertEqual(
+            get_thumbnail(first.image, '10x10', upscale=False).name,
+            get_thumbnail(second.image, '10x10', upscale=False).name
+        )
+
+    def test_references_released(self):
+        first = self.create_post()
+        second = self.create_post()
+        name = first.image.name
+        second.image = SimpleUploadedFile('other.gif', OTHER_GIF)
+        second.save()
+        self.assertEqual(self.refcount(name), 1)
+        self.assertEqual(self.refcount(second.image.name), 1)
+        first.delete()
+        self.assertEqual(self.refcount(name), 0)
+
+    def test_collect_removes_unreferenced_after_grace(self):
+        kept = self.create_post()
+        removed = self.create_post(OTHER_GIF)
+        thumbnail = get_thumbnail(removed.image, '10x10', upscale=False)
+        self.assertTrue(default_storage.exists(thumbnail.name))
+        name = removed.image.name
+        removed.delete()
+        self.assertEqual(blobs.collect(), 0)
+        self.assertEqual(blobs.collect(grace=0), 1)
+        self.assertEqual(self.files(), [kept.image.name])
+        self.assertFalse(default_storage.exists(thumbnail.name))
+        self.assertFalse(MediaBlob.objects.filter(name=name).exists())
+
+    def test_recount(self):
+        post = self.create_post()
+        MediaBlob.objects.update(refcount=5)
+        blobs.recount()
+        self.assertEqual(self.refcount(post.image.name), 1)
+
+    def test_recount_adds_rows_for_old_files(self):
+        """Файлы, загруженные до появления счётчиков, получают записи."""
+        post = self.create_post()
+        MediaBlob.objects.all().delete()
+        blobs.recount()
+        blob = MediaBlob.objects.get(name=post.image.name)
+        self.assertEqual((blob.refcount, blob.size), (1, len(SMALL_GIF)))
+
+    def test_upload_during_collect_keeps_file(self):
+        """Повторная загрузка между удалением строки и файла пишет файл
+        заново."""
+        name = self.create_post().image.name
+        Post.objects.all().delete()
+        uploads = []
+
+        def delete_then_upload():
+            result = MediaBlob.objects.filter(name=name, refcount=0).delete()
+            uploads.append(self.create_post())
+            return result
+
+        row = mock.Mock()
+        row.delete.side_effect = delete_then_upload
+        self.assertTrue(blobs.remove(default_storage, row, name))
+        self.assertEqual(uploads[0].image.name, name)
+        self.assertEqual(self.files(), [name])
+        self.assertEqual(self.refcount(name), 1)
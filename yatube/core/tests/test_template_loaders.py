@@ -0,0 +1,67 @@
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from core.template_loaders import warm_templates
+from django.template import engines
+from django.template.loaders.filesystem import Loader as FilesystemLoader
+from django.test import SimpleTestCase, override_settings
+
+
+def templates_settings(directory, validate):
+    return [{
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [directory],
+        'OPTIONS': {
+            'loaders': [
+                ('core.template_loaders.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                ], validate),
+            ],
+        },
+    }]
+
+
+class TemplateLoaderTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.directory, 'posts'))
+        self.write('base.html', 'base {% block content %}{% endblock %}')
+        self.write(
+            'posts/page.html',
+            '{% extends "base.html" %}{% block content %}page{% endblock %}'
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def write(self, name, source, mtime=None):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w') as template_file:
+            template_file.write(source)
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+
+    def test_warmup_compiles_all_templates(self):
+        """После прогрева запросы не читают исходники шаблонов."""
+        with override_settings(
+            TEMPLATES=templates_settings(self.directory, False)
+        ):
+            self.assertEqual(warm_templates(), 2)
+            with mock.patch.object(
+                FilesystemLoader, 'get_contents', side_effect=AssertionError
+            ):
+                template = engines['django'].get_template('posts/page.html')
+                self.assertEqual(template.render(), 'base page')
+
+    def test_validate_reloads_changed_template(self):
+        """В режиме проверки изменённый шаблон компилируется заново."""
+        with override_settings(
+            TEMPLATES=templates_settings(self.directory, True)
+        ):
+            warm_templates()
+            self.write('base.html', 'new {% block content %}{% endblock %}',
+                       mtime=1)
+            template = engines['django'].get_template('posts/page.html')
+            self.assertEqual(template.render(), 'new page')
@@ -1,11 +1,48 @@
+import datetime
 from http import HTTPStatus
 
+from core import holes
+from django.http import Http404, HttpResponseNotFound
 from django.shortcuts import render
+from django.template.loader import render_to_string
+from django.utils.html import escape
+
+# Для заведомо отсутствующих объектов (KnownMissing) страница 404
+# рендерится один раз на процесс (и год — из-за подвала): адрес
+# подставляется вместо маркера, персональные фрагменты — через
+# core.holes, как у кэшированных страниц.
+PATH_MARKER = '\x00path\x00'
+_not_found_page = {}
+
+
+class KnownMissing(Http404):
+    """Объект отсутствует, что известно без запроса к базе."""
+
+
+def _not_found_template(request):
+    year = datetime.date.today().year
+    page = _not_found_page.get(year)
+    if page is None:
+        request._defer_holes = True
+        try:
+            page = render_to_string(
+                'core/404.html', {'path': PATH_MARKER}, request
+            )
+        finally:
+            request._defer_holes = False
+        _not_found_page.clear()
+        _not_found_page[year] = page
+    return page
 
 
 def page_not_found(request, exception):
-    return render(request, 'core/404.html', {'path': request.path},
-                  status=HTTPStatus.NOT_FOUND)
+    if not isinstance(exception, KnownMissing):
+        return render(request, 'core/404.html', {'path': request.path},
+                      status=HTTPStatus.NOT_FOUND)
+    content = _not_found_template(request).replace(
+        PATH_MARKER, escape(request.path)
+    ).encode()
+    return HttpResponseNotFound(holes.fill_holes(content, request, 'utf-8'))
 
 
 def csrf_failure(request, reason=''):
@@ -0,0 +1,25 @@
+"""Запуск в продакшене: gunicorn -c gunicorn.conf.py"""
+import gc
+import multiprocessing
+import os
+
+gc.disable()
+
+wsgi_app = 'yatube.wsgi:application'
+bind = os.environ.get('GUNICORN_BIND', '127.0.0.1:8000')
+workers = int(
+    os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1)
+)
+# Потоки делят семафоры admission control внутри воркера; prod-настройки
+# читают ту же переменную, чтобы рассчитать ёмкость классов маршрутов.
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+preload_app = True
+max_requests = 5000
+max_requests_jitter = 500
+
+
+def when_ready(server):
+    from yatube.prefork import before_fork
+
+    before_fork()
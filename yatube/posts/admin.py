@@ -1,11 +1,16 @@
+from core.admin import BackgroundDeleteMixin, ScaleAdminMixin
 from django.contrib import admin
 from posts.models import Comment, Follow, Group, Post
 
 
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(BackgroundDeleteMixin, ScaleAdminMixin, admin.ModelAdmin):
     list_display = ('pk', 'text', 'pub_date', 'author', 'group')
     list_editable = ('group', )
+    list_select_related = ('author', 'group')
+    raw_id_fields = ('author', )
+    autocomplete_fields = ('group', )
     search_fields = ('text', )
+    search_index = 'posts_post_fts'
     list_filter = ('pub_date', )
     empty_value_display = '-пусто-'
 
@@ -17,9 +22,13 @@ class GroupAdmin(admin.ModelAdmin):
     empty_value_display = '-пусто-'
 
 
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(BackgroundDeleteMixin, ScaleAdminMixin,
+                   admin.ModelAdmin):
     list_display = ('text', 'created', 'author', 'post')
+    list_select_related = ('author', 'post')
+    raw_id_fields = ('author', 'post')
     search_fields = ('text', )
+    search_index = 'posts_comment_fts'
     list_filter = ('created', )
 
 
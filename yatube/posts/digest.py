@@ -0,0 +1,129 @@
+"""Ежедневная рассылка новых постов авторов, на которых подписан читатель.
+
+Все данные читаются несколькими запросами на всю рассылку, а не
+запросами на каждого читателя:
+
+* новые посты за период — одним запросом, каждый рендерится один раз
+  (текстовая и HTML-версия), шаблон письма — тоже один раз;
+* подписки на авторов с новыми постами — потоком, упорядоченным по
+  читателю, так что в памяти держится только текущий читатель.
+
+Оба запроса ограничены одним окном [since, until), зафиксированным при
+создании рассылки: посты, опубликованные во время отправки, не попадают
+ни в письма, ни в список авторов.
+
+Письма собираются пачками по chunk_size и передаются почтовому
+бэкенду одним вызовом send_messages (очередь core.mail пишет пачку
+одним INSERT).
+"""
+import heapq
+from datetime import timedelta
+from itertools import groupby, islice
+from operator import itemgetter
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.template.loader import render_to_string
+from django.utils import timezone
+from posts.models import Follow, Post
+
+SUBJECT = 'Новые посты ваших авторов'
+MAX_POSTS = 20
+CHUNK_SIZE = 1000
+# Подставляется вместо списка постов при однократном рендеринге письма.
+POSTS_MARKER = '\x00posts\x00'
+
+
+def render_layout(template_name):
+    content = render_to_string(template_name, {
+        'posts': POSTS_MARKER, 'site_url': settings.SITE_URL,
+    })
+    return content.split(POSTS_MARKER)
+
+
+class Digest:
+    def __init__(self, since, until=None, max_posts=MAX_POSTS):
+        self.since = since
+        self.until = timezone.now() if until is None else until
+        self.max_posts = max_posts
+        self.text_layout = render_layout('posts/digest/email.txt')
+        self.html_layout = render_layout('posts/digest/email.html')
+        self.by_author = {}
+        self.rendered = {}
+        posts = self.new_posts().select_related(
+            'author', 'group'
+        ).order_by('author_id', '-pub_date', '-pk')
+        for author_id, author_posts in groupby(
+            posts.iterator(), key=lambda post: post.author_id
+        ):
+            author_posts = list(islice(author_posts, max_posts))
+            self.by_author[author_id] = [
+                (post.pub_date, post.pk) for post in author_posts
+            ]
+            for post in author_posts:
+                context = {'post': post, 'site_url': settings.SITE_URL}
+                self.rendered[post.pk] = (
+                    render_to_string('posts/digest/post.txt', context),
+                    render_to_string('posts/digest/post.html', context),
+                )
+
+    def new_posts(self):
+        return Post.objects.filter(
+            pub_date__gte=self.since, pub_date__lt=self.until
+        )
+
+    def recipients(self):
+        """(email, [id авторов]) для читателей с новыми постами в ленте."""
+        follows = Follow.objects.filter(
+            author_id__in=self.new_posts().values('author_id'),
+            user__is_active=True,
+        ).exclude(user__email='').order_by('user_id').values_list(
+            'user_id', 'user__email', 'author_id'
+        )
+        for (_, email), rows in groupby(
+            follows.iterator(chunk_size=CHUNK_SIZE), key=itemgetter(0, 1)
+        ):
+            yield email, [row[2] for row in rows]
+
+    def message(self, email, author_ids):
+        # Пост, сохранённый до until, но зафиксированный после чтения
+        # постов, виден только подзапросу читателей.
+        newest = heapq.merge(
+            *(self.by_author.get(author_id, ()) for author_id in author_ids),
+            reverse=True
+        )
+        post_ids = [pk for _, pk in islice(newest, self.max_posts)]
+        if not post_ids:
+            return None
+        text = self.text_layout[0] + ''.join(
+            self.rendered[pk][0] for pk in post_ids
+        ) + self.text_layout[1]
+        html = self.html_layout[0] + ''.join(
+            self.rendered[pk][1] for pk in post_ids
+        ) + self.html_layout[1]
+        message = EmailMultiAlternatives(SUBJECT, text, to=[email])
+        message.attach_alternative(html, 'text/html')
+        return message
+
+    def messages(self):
+        for email, author_ids in self.recipients():
+            message = self.message(email, author_ids)
+            if message is not None:
+                yield message
+
+
+def send_digest(since=None, chunk_size=CHUNK_SIZE, connection=None):
+    """Формирует и отправляет рассылку, возвращает число писем."""
+    if since is None:
+        since = timezone.now() - timedelta(days=1)
+    digest = Digest(since)
+    if not digest.by_author:
+        return 0
+    connection = connection or get_connection()
+    messages = digest.messages()
+    sent = 0
+    while True:
+        chunk = list(islice(messages, chunk_size))
+        if not chunk:
+            return sent
+        sent += connection.send_messages(chunk) or 0
@@ -0,0 +1,156 @@
+"""RSS и Atom ленты: все посты, посты группы и посты автора.
+
+Готовая лента хранится в кэше вместе с ETag (хеш содержимого) и
+поколением своего surrogate-ключа. FeedPurgeBackend при изменении
+постов меняет поколение затронутых ключей, и лента пересобирается
+при следующем запросе; до этого запросы отдают сохранённые байты,
+а клиентам с совпадающим If-None-Match — 304. Поколения должны жить в
+общем для воркеров кэше (см. проверку core.W001), иначе остальные
+процессы отдают старую ленту до FEED_CACHE_TIMEOUT.
+"""
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.http import Http404, HttpResponse
+from django.template.defaultfilters import truncatechars
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed
+from posts import negative
+from posts.models import Group, Post, User
+from posts.surrogate_keys import INDEX, author_key, group_key
+
+FORMATS = {
+    'rss': Rss201rev2Feed,
+    'atom': Atom1Feed,
+}
+
+
+class LatestPostsFeed(Feed):
+    title = 'Yatube: последние записи'
+    description = subtitle = 'Новые посты всех авторов'
+
+    def __init__(self, feed_type):
+        self.feed_type = feed_type
+
+    def link(self):
+        return reverse('posts:index')
+
+    def items(self):
+        return Post.objects.select_related(
+            'author', 'group'
+        )[:settings.FEED_SIZE]
+
+    def item_title(self, item):
+        return truncatechars(item.text, 60)
+
+    def item_description(self, item):
+        return item.text
+
+    def item_link(self, item):
+        return reverse('posts:post_detail', args=[item.pk])
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_author_name(self, item):
+        return item.author.get_full_name() or item.author.username
+
+
+class GroupFeed(LatestPostsFeed):
+    def get_object(self, request, group):
+        return group
+
+    def title(self, group):
+        return f'Yatube: {group.title}'
+
+    def description(self, group):
+        return group.description
+
+    subtitle = description
+
+    def link(self, group):
+        return reverse('posts:group_list', args=[group.slug])
+
+    def items(self, group):
+        return group.posts.select_related(
+            'author', 'group'
+        )[:settings.FEED_SIZE]
+
+
+class AuthorFeed(LatestPostsFeed):
+    def get_object(self, request, author):
+        return author
+
+    def title(self, author):
+        return f'Yatube: {author.get_full_name() or author.username}'
+
+    def description(self, author):
+        return f'Посты пользователя {author.username}'
+
+    subtitle = description
+
+    def link(self, author):
+        return reverse('posts:profile', args=[author.username])
+
+    def items(self, author):
+        return author.posts.select_related(
+            'author', 'group'
+        )[:settings.FEED_SIZE]
+
+
+def _generation_key(key):
+    return f'feed:generation:{key}'
+
+
+def serve(request, feed_class, key, fmt, obj=None):
+    feed_type = FORMATS.get(fmt)
+    if feed_type is None:
+        raise Http404
+    content_key = f'feed:{key}:{fmt}'
+    generation_key = _generation_key(key)
+    values = cache.get_many([content_key, generation_key])
+    generation = values.get(generation_key)
+    if generation is None:
+        cache.add(generation_key, uuid.uuid4().hex, None)
+        generation = cache.get(generation_key)
+    cached = values.get(content_key)
+    if cached is None or cached[0] != generation:
+        args = () if obj is None else (obj,)
+        response = feed_class(feed_type)(request, *args)
+        content = response.content
+        etag = quote_etag(hashlib.sha1(content).hexdigest())
+        cached = (generation, content, response['Content-Type'], etag)
+        cache.set(content_key, cached, settings.FEED_CACHE_TIMEOUT)
+    _, content, content_type, etag = cached
+    response = HttpResponse(content, content_type=content_type)
+    response['ETag'] = etag
+    return get_conditional_response(request, etag=etag, response=response)
+
+
+def latest(request, fmt):
+    return serve(request, LatestPostsFeed, INDEX, fmt)
+
+
+def group(request, slug, fmt):
+    obj = negative.get_object_or_404(negative.GROUP, Group.objects, slug)
+    return serve(request, GroupFeed, group_key(slug), fmt, obj)
+
+
+def author(request, username, fmt):
+    obj = negative.get_object_or_404(negative.USER, User.objects, username)
+    return serve(request, AuthorFeed, author_key(obj.pk), fmt, obj)
+
+
+class FeedPurgeBackend:
+    """Бэкенд очистки (см. core.surrogate): устаревшие ленты
+    пересобираются при следующем запросе."""
+    PREFIXES = ('author-', 'group-')
+
+    def purge(self, keys):
+        for key in keys:
+            if key == INDEX or key.startswith(self.PREFIXES):
+                cache.set(_generation_key(key), uuid.uuid4().hex, None)
@@ -0,0 +1,115 @@
+"""Кэш графа подписок.
+
+Для каждого пользователя в общем кэше хранятся отсортированные массивы
+id авторов, на которых он подписан, и id его подписчиков. Проверка
+подписки — бинарный поиск, без обращения к базе.
+
+Подписка и отписка заменяют оба затронутых массива отметкой о сбросе
+сразу и ещё раз после фиксации транзакции. Пока отметка жива
+(FOLLOW_GRAPH_INVALIDATION секунд), массив читается из базы и в кэш
+не кладётся: запрос, прочитавший базу до фиксации, не запишет поверх
+сброса устаревший массив. Массивы кладутся через add, поэтому и после
+отметки устаревшие данные не перетирают свежие.
+"""
+from array import array
+from bisect import bisect_left
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from posts.models import Follow
+
+TYPECODE = 'q'
+INVALIDATED = 'invalidated'
+
+
+def _following_key(user_id):
+    return f'follow_graph:following:{user_id}'
+
+
+def _followers_key(author_id):
+    return f'follow_graph:followers:{author_id}'
+
+
+def _to_array(data):
+    ids = array(TYPECODE)
+    ids.frombytes(data)
+    return ids
+
+
+def _load(key, queryset, field):
+    data = cache.get(key)
+    if isinstance(data, bytes):
+        return _to_array(data)
+    ids = array(TYPECODE, sorted(
+        queryset.values_list(field, flat=True).iterator()
+    ))
+    if data is None:
+        cache.add(key, ids.tobytes(), settings.FOLLOW_GRAPH_TIMEOUT)
+    return ids
+
+
+def following(user_id):
+    """Отсортированный массив id авторов, на которых подписан user_id."""
+    return _load(
+        _following_key(user_id),
+        Follow.objects.filter(user_id=user_id), 'author_id'
+    )
+
+
+def followers(author_id):
+    """Отсортированный массив id подписчиков автора."""
+    return _load(
+        _followers_key(author_id),
+        Follow.objects.filter(author_id=author_id), 'user_id'
+    )
+
+
+def _contains(ids, value):
+    position = bisect_left(ids, value)
+    return position < len(ids) and ids[position] == value
+
+
+def is_following(user_id, author_id):
+    return _contains(following(user_id), author_id)
+
+
+def following_among(user_id, author_ids):
+    """Подмножество author_ids, на которых подписан user_id."""
+    ids = following(user_id)
+    return {author_id for author_id in author_ids
+            if _contains(ids, author_id)}
+
+
+def followers_many(author_ids):
+    """Подписчики сразу нескольких авторов одним запросом к кэшу."""
+    keys = {_followers_key(author_id): author_id for author_id in author_ids}
+    cached = cache.get_many(keys)
+    result = {
+        keys[key]: _to_array(data) for key, data in cached.items()
+        if isinstance(data, bytes)
+    }
+    for author_id in set(author_ids) - set(result):
+        result[author_id] = followers(author_id)
+    return result
+
+
+def _invalidate(user_id, author_id):
+    keys = [_following_key(user_id), _followers_key(author_id)]
+
+    def invalidate():
+        cache.set_many(
+            dict.fromkeys(keys, INVALIDATED),
+            settings.FOLLOW_GRAPH_INVALIDATION
+        )
+
+    invalidate()
+    transaction.on_commit(invalidate)
+
+
+def follow_added(user_id, author_id):
+    _invalidate(user_id, author_id)
+
+
+def follow_removed(user_id, author_id):
+    _invalidate(user_id, author_id)
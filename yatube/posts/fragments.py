@@ -0,0 +1,36 @@
+"""Контекст персональных фрагментов страниц (см. core.holes)."""
+from core import holes
+from posts import follow_graph
+from posts.models import FollowSuggestion
+
+MAX_SUGGESTIONS = 20
+
+
+@holes.register('posts/includes/follow_button.html')
+def follow_button(request, username, author_id):
+    following = (
+        request.user.is_authenticated
+        and follow_graph.is_following(request.user.id, int(author_id))
+    )
+    return {'following': following}
+
+
+@holes.register('posts/includes/suggestions.html')
+def suggestions(request, limit=5):
+    if not request.user.is_authenticated:
+        return {'suggestions': []}
+    # Параметры фрагмента приходят из разметки строками.
+    limit = max(1, min(int(limit), MAX_SUGGESTIONS))
+    # Рекомендации считаются пакетно и могут устареть: подписки,
+    # оформленные после расчёта, отсеиваются по графу в кэше.
+    candidates = list(
+        FollowSuggestion.objects.filter(user=request.user)
+        .select_related('author').order_by('-score')[:limit * 2]
+    )
+    followed = follow_graph.following_among(
+        request.user.id, [item.author_id for item in candidates]
+    )
+    return {'suggestions': [
+        item.author for item in candidates
+        if item.author_id not in followed
+    ][:limit]}
@@ -0,0 +1,65 @@
+"""Загрузка графа подписок и комментариев в разреженные матрицы.
+
+numpy и scipy нужны только пакетным командам и импортируются лишь здесь,
+чтобы не загружаться в веб-процессах.
+"""
+from itertools import chain
+
+import numpy as np
+from posts.models import Comment, Follow
+from scipy import sparse
+
+CHUNK_SIZE = 100_000
+
+
+def load_pairs(queryset, *fields):
+    """Пары id из queryset в массив формы (n, 2), потоково."""
+    rows = queryset.values_list(*fields).iterator(chunk_size=CHUNK_SIZE)
+    flat = np.fromiter(chain.from_iterable(rows), dtype=np.int64)
+    return flat.reshape(-1, 2)
+
+
+class Graph:
+    """Граф подписок и комментариев в общей нумерации пользователей.
+
+    ``ids[i]`` — id пользователя строки и столбца ``i``. ``follows[u, a]``
+    равно 1, если u подписан на a; ``comments[u, a]`` — число
+    комментариев u к постам a.
+    """
+
+    def __init__(self, follow_pairs, comment_pairs):
+        own = comment_pairs[:, 0] == comment_pairs[:, 1]
+        comment_pairs = comment_pairs[~own]
+        self.ids = np.unique(np.concatenate(
+            (follow_pairs.ravel(), comment_pairs.ravel())
+        ))
+        self.follows = self.matrix(follow_pairs)
+        self.follows.data[:] = 1
+        self.comments = self.matrix(comment_pairs)
+
+    @classmethod
+    def load(cls, with_comments=True):
+        comment_pairs = (
+            load_pairs(Comment.objects.all(), 'author_id', 'post__author_id')
+            if with_comments else np.empty((0, 2), dtype=np.int64)
+        )
+        return cls(
+            load_pairs(Follow.objects.all(), 'user_id', 'author_id'),
+            comment_pairs,
+        )
+
+    @property
+    def size(self):
+        return len(self.ids)
+
+    def positions(self, user_ids):
+        return np.searchsorted(self.ids, user_ids)
+
+    def matrix(self, pairs):
+        """CSR-матрица size×size; повторяющиеся пары суммируются."""
+        values = np.ones(len(pairs), dtype=np.float32)
+        return sparse.csr_matrix(
+            (values, (self.positions(pairs[:, 0]),
+                      self.positions(pairs[:, 1]))),
+            shape=(self.size, self.size),
+        )
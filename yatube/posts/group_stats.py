@@ -0,0 +1,49 @@
+"""Счётчики каталога групп: число постов, последняя активность и
+последний пост. Обновляются инкрементально при изменении постов.
+
+Изменения в обход сигналов (bulk_create, update() и delete() у
+queryset с group) счётчики не видят; после них нужен пересчёт
+командой recount_groups.
+"""
+from django.db.models import Count, F, Q
+from posts.models import Group, Post
+
+
+def post_added(post):
+    Group.objects.filter(pk=post.group_id).update(
+        post_count=F('post_count') + 1
+    )
+    Group.objects.filter(pk=post.group_id).filter(
+        Q(last_activity__isnull=True) | Q(last_activity__lte=post.pub_date)
+    ).update(last_activity=post.pub_date, latest_post=post)
+
+
+def post_removed(group_id, post_id):
+    Group.objects.filter(pk=group_id, post_count__gt=0).update(
+        post_count=F('post_count') - 1
+    )
+    # Пост уже мог быть обнулён SET_NULL при удалении.
+    if Group.objects.filter(pk=group_id).filter(
+        Q(latest_post_id=post_id) | Q(latest_post__isnull=True)
+    ).exists():
+        refresh_latest(group_id)
+
+
+def refresh_latest(group_id):
+    latest = Post.objects.filter(group_id=group_id).order_by(
+        '-pub_date', '-pk'
+    ).values('pk', 'pub_date').first() or {'pk': None, 'pub_date': None}
+    Group.objects.filter(pk=group_id).update(
+        latest_post_id=latest['pk'], last_activity=latest['pub_date']
+    )
+
+
+def recount():
+    """Пересчитывает счётчики всех групп по базе."""
+    groups = Group.objects.annotate(actual=Count('posts')).values_list(
+        'pk', 'post_count', 'actual'
+    )
+    for group_id, post_count, actual in groups.iterator():
+        if post_count != actual:
+            Group.objects.filter(pk=group_id).update(post_count=actual)
+        refresh_latest(group_id)
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from posts.recommendations import build_suggestions
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает рекомендации «на кого подписаться» '
+            'по графу подписок и комментариев.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top', type=int, default=10,
+            help='Сколько рекомендаций хранить на пользователя.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=10_000,
+            help='Сколько пользователей обрабатывать за один блок.'
+        )
+
+    def handle(self, *args, **options):
+        def progress(done, total):
+            if options['verbosity'] > 1:
+                self.stdout.write(f'{done}/{total}')
+
+        build_suggestions(
+            top=options['top'], batch_size=options['batch_size'],
+            progress=progress,
+        )
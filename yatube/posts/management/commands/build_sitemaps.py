@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from posts import sitemaps
+
+
+class Command(BaseCommand):
+    help = ('Переписывает изменившиеся шарды карты сайта и её индекс. '
+            'Запускается периодически, например из cron.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full', action='store_true',
+            help='Переписать все шарды, не глядя на флаги изменений.'
+        )
+
+    def handle(self, *args, **options):
+        rewritten = sitemaps.build(full=options['full'])
+        if options['verbosity'] > 1:
+            for section, count in rewritten.items():
+                self.stdout.write(f'{section}: {count}')
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from posts.prerender import Prerenderer
+
+
+class Command(BaseCommand):
+    help = 'Пересобирает статические копии страниц для анонимных читателей.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'keys', nargs='*',
+            help='Surrogate-ключи страниц, например index или post-1. '
+                 'Без ключей пересобираются все страницы.'
+        )
+        parser.add_argument(
+            '--if-requested', action='store_true',
+            help='Пересобрать все страницы, только если очередь '
+                 'перерисовки в веб-процессах переполнялась.'
+        )
+
+    def handle(self, *args, **options):
+        prerenderer = Prerenderer()
+        if options['if_requested']:
+            prerenderer.rebuild_if_requested()
+        elif options['keys']:
+            prerenderer.regenerate(options['keys'])
+        else:
+            prerenderer.build_all()
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from posts.ranking import rank_authors
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает рейтинг авторов (PageRank по подпискам).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full', action='store_true',
+            help='Считать с нуля, не используя сохранённые оценки.'
+        )
+
+    def handle(self, *args, **options):
+        iterations = rank_authors(incremental=not options['full'])
+        if options['verbosity'] > 1:
+            self.stdout.write(f'Итераций: {iterations}')
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from posts import negative
+
+
+class Command(BaseCommand):
+    help = ('Пересобирает фильтры Блума существующих пользователей, групп '
+            'и постов для быстрого отказа по несуществующим адресам.')
+
+    def handle(self, *args, **options):
+        for entity in negative.ENTITIES:
+            negative.build(entity)
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from posts import group_stats
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает число постов и последнюю активность групп, '
+            'например после bulk_create или update() в обход сигналов.')
+
+    def handle(self, *args, **options):
+        group_stats.recount()
@@ -0,0 +1,24 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from posts.digest import CHUNK_SIZE, send_digest
+
+
+class Command(BaseCommand):
+    help = 'Рассылает читателям новые посты авторов, на которых они подписаны.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hours', type=float, default=24,
+            help='За сколько последних часов брать посты.'
+        )
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        sent = send_digest(
+            since=timezone.now() - timedelta(hours=options['hours']),
+            chunk_size=options['chunk_size'],
+        )
+        if options['verbosity'] > 1:
+            self.stdout.write(f'Писем: {sent}')
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from posts import trending
+
+
+class Command(BaseCommand):
+    help = ('Переводит оценки популярных постов в текущую эпоху, '
+            'удаляет остывшие и обновляет список популярного.')
+
+    def handle(self, *args, **options):
+        trending.refresh_top()
@@ -0,0 +1,7 @@
+# Каталоги MEDIA_ROOT с картинками постов и их миниатюрами sorl-thumbnail.
+PUBLIC_PREFIXES = ('posts/', 'cache/')
+
+
+def can_access(request, path):
+    """Картинки постов публичны; остальное в MEDIA_ROOT не отдаётся."""
+    return path.startswith(PUBLIC_PREFIXES)
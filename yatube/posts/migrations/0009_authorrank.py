@@ -0,0 +1,30 @@
+# Generated by Django 2.2.16 on 2026-10-19 00:35
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0011_update_proxy_permissions'),
+        ('posts', '0008_followsuggestion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthorRank',
+            fields=[
+                ('author', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='author_rank', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='Автор')),
+                ('score', models.FloatField(verbose_name='PageRank')),
+                ('rank', models.PositiveIntegerField(db_index=True, verbose_name='Место')),
+                ('computed', models.DateTimeField(verbose_name='Рассчитано')),
+            ],
+            options={
+                'verbose_name': 'Рейтинг автора',
+                'verbose_name_plural': 'Рейтинг авторов',
+                'ordering': ('rank',),
+            },
+        ),
+    ]
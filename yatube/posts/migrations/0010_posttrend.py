@@ -0,0 +1,30 @@
+# Generated by Django 2.2.16 on 2026-10-19 00:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0009_authorrank'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostTrend',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trend', serialize=False, to='posts.Post', verbose_name='Пост')),
+                ('score', models.FloatField(default=0, verbose_name='Оценка')),
+                ('epoch', models.PositiveIntegerField(verbose_name='Эпоха')),
+            ],
+            options={
+                'verbose_name': 'Популярность поста',
+                'verbose_name_plural': 'Популярность постов',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='posttrend',
+            index=models.Index(fields=['epoch', '-score'], name='posts_postt_epoch_879695_idx'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 2.2.16 on 2026-10-19 00:38
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+import django.db.models.deletion
+
+
+def backfill(apps, schema_editor):
+    Group = apps.get_model('posts', 'Group')
+    Post = apps.get_model('posts', 'Post')
+    group_posts = Post.objects.filter(group=OuterRef('pk')).order_by()
+    latest = group_posts.order_by('-pub_date', '-pk')
+    Group.objects.update(
+        post_count=Coalesce(Subquery(
+            group_posts.values('group').annotate(
+                count=Count('pk')
+            ).values('count')
+        ), 0),
+        last_activity=Subquery(latest.values('pub_date')[:1]),
+        latest_post=Subquery(latest.values('pk')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0010_posttrend'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='group',
+            name='last_activity',
+            field=models.DateTimeField(editable=False, null=True, verbose_name='Последняя активность'),
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='latest_post',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='posts.Post', verbose_name='Последний пост'),
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='post_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Число постов'),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 2.2.16 on 2026-10-19 00:40
+
+from django.db import migrations, models
+
+# Полнотекстовые индексы для поиска в админке (core.admin.ScaleAdminMixin).
+# Только для SQLite: FTS5 с внешним содержимым, синхронизируется триггерами.
+# SQLite пересоздаёт таблицу при AlterField и теряет её триггеры: такие
+# миграции Post и Comment должны снова вызывать drop_fts и create_fts.
+FTS_TABLES = (
+    ('posts_post_fts', 'posts_post'),
+    ('posts_comment_fts', 'posts_comment'),
+)
+
+
+def create_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for index, table in FTS_TABLES:
+        for statement in (
+            f"CREATE VIRTUAL TABLE {index} USING fts5("
+            f"text, content='{table}', content_rowid='id')",
+            f"CREATE TRIGGER {index}_ai AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO {index}(rowid, text) VALUES (new.id, new.text); "
+            f"END",
+            f"CREATE TRIGGER {index}_ad AFTER DELETE ON {table} BEGIN "
+            f"INSERT INTO {index}({index}, rowid, text) "
+            f"VALUES ('delete', old.id, old.text); END",
+            f"CREATE TRIGGER {index}_au AFTER UPDATE OF text ON {table} "
+            f"BEGIN "
+            f"INSERT INTO {index}({index}, rowid, text) "
+            f"VALUES ('delete', old.id, old.text); "
+            f"INSERT INTO {index}(rowid, text) VALUES (new.id, new.text); "
+            f"END",
+            f"INSERT INTO {index}({index}) VALUES ('rebuild')",
+        ):
+            schema_editor.execute(statement)
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for index, table in FTS_TABLES:
+        for suffix in ('ai', 'ad', 'au'):
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS {index}_{suffix}')
+        schema_editor.execute(f'DROP TABLE IF EXISTS {index}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0011_group_aggregates'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='comment',
+            name='created',
+            field=models.DateTimeField(auto_now_add=True, db_index=True, help_text='Создание комментария', verbose_name='Создан комментарий'),
+        ),
+        migrations.AlterField(
+            model_name='post',
+            name='pub_date',
+            field=models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Дата'),
+        ),
+        migrations.RunPython(create_fts, drop_fts),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 2.2.16 on 2026-10-19 01:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0012_admin_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SitemapShard',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('section', models.CharField(max_length=20, verbose_name='Раздел')),
+                ('number', models.PositiveIntegerField(verbose_name='Номер')),
+            ],
+            options={
+                'verbose_name': 'Изменённый шард карты сайта',
+                'verbose_name_plural': 'Изменённые шарды карты сайта',
+                'unique_together': {('section', 'number')},
+            },
+        ),
+    ]
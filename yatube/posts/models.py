@@ -9,7 +9,11 @@ class Post(models.Model):
         verbose_name='Содержание поста',
         help_text='Текст поста'
     )
-    pub_date = models.DateTimeField(auto_now_add=True, verbose_name='Дата')
+    pub_date = models.DateTimeField(
+        auto_now_add=True,
+        db_index=True,
+        verbose_name='Дата'
+    )
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -44,6 +48,25 @@ class Group(models.Model):
     title = models.CharField(max_length=200, verbose_name='Название')
     slug = models.SlugField(unique=True, verbose_name='Адрес')
     description = models.TextField(verbose_name='Описание')
+    # Поддерживаются сигналами posts.signals для каталога групп.
+    post_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Число постов'
+    )
+    last_activity = models.DateTimeField(
+        null=True,
+        editable=False,
+        verbose_name='Последняя активность'
+    )
+    latest_post = models.ForeignKey(
+        Post,
+        null=True,
+        editable=False,
+        on_delete=models.SET_NULL,
+        related_name='+',
+        verbose_name='Последний пост'
+    )
 
     def __str__(self) -> str:
         return self.title
@@ -71,6 +94,7 @@ class Comment(models.Model):
         help_text='Текст комментария')
     created = models.DateTimeField(
         auto_now_add=True,
+        db_index=True,
         verbose_name='Создан комментарий',
         help_text='Создание комментария'
     )
@@ -106,3 +130,96 @@ class Follow(models.Model):
 
     def __str__(self):
         return f'{self.user} оформил подписку на {self.author}'
+
+
+class FollowSuggestion(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='follow_suggestions',
+        verbose_name='Пользователь'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Рекомендуемый автор'
+    )
+    score = models.FloatField(verbose_name='Оценка')
+    generated = models.DateTimeField(verbose_name='Рассчитано')
+
+    class Meta:
+        verbose_name = 'Рекомендация подписки'
+        verbose_name_plural = 'Рекомендации подписок'
+        indexes = [
+            models.Index(fields=['user', '-score']),
+            models.Index(fields=['generated']),
+        ]
+
+    def __str__(self):
+        return f'{self.user} → {self.author}'
+
+
+class AuthorRank(models.Model):
+    author = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='author_rank',
+        verbose_name='Автор'
+    )
+    score = models.FloatField(verbose_name='PageRank')
+    rank = models.PositiveIntegerField(
+        db_index=True,
+        verbose_name='Место'
+    )
+    computed = models.DateTimeField(verbose_name='Рассчитано')
+
+    class Meta:
+        ordering = ('rank',)
+        verbose_name = 'Рейтинг автора'
+        verbose_name_plural = 'Рейтинг авторов'
+
+    def __str__(self):
+        return f'{self.rank}. {self.author}'
+
+
+class PostTrend(models.Model):
+    """Оценка популярности поста (см. posts.trending).
+
+    ``score`` хранится в единицах эпохи ``epoch``: вклад события в момент
+    t равен весу, умноженному на 2 ** ((t - начало эпохи) / период
+    полураспада), поэтому более поздние события весят больше и старые
+    оценки не нужно пересчитывать при каждом событии.
+    """
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='trend',
+        verbose_name='Пост'
+    )
+    score = models.FloatField(default=0, verbose_name='Оценка')
+    epoch = models.PositiveIntegerField(verbose_name='Эпоха')
+
+    class Meta:
+        verbose_name = 'Популярность поста'
+        verbose_name_plural = 'Популярность постов'
+        indexes = [models.Index(fields=['epoch', '-score'])]
+
+    def __str__(self):
+        return f'{self.post_id}: {self.score:.2f}'
+
+
+class SitemapShard(models.Model):
+    """Шард карты сайта, который нужно переписать (см. posts.sitemaps)."""
+    section = models.CharField(max_length=20, verbose_name='Раздел')
+    number = models.PositiveIntegerField(verbose_name='Номер')
+
+    class Meta:
+        verbose_name = 'Изменённый шард карты сайта'
+        verbose_name_plural = 'Изменённые шарды карты сайта'
+        unique_together = ('section', 'number')
+
+    def __str__(self):
+        return f'{self.section}-{self.number}'
@@ -0,0 +1,158 @@
+"""Быстрый отказ для несуществующих профилей, групп и постов.
+
+Сканеры перебирают адреса /profile/<username>/, /group/<slug>/ и
+/posts/<id>/. Перед запросом к базе ключ проверяется:
+
+* по кэшу промахов (NEGATIVE_CACHE_TIMEOUT секунд). Он живёт в
+  отдельном кэше ``negative`` в памяти процесса: поток случайных ключей
+  от сканера вытесняет только такие же записи, а не страницы и сессии
+  из общего кэша;
+* по фильтру Блума всех существующих ключей сущности. Фильтры строит
+  команда rebuild_bloom_filters в файлы под BLOOM_ROOT (в memcached
+  фильтр на миллионы ключей не помещается). Процесс держит копию и раз
+  в BLOOM_REFRESH_INTERVAL секунд проверяет, не сменился ли файл.
+
+Фильтр и кэш промахов не знают о ключах, созданных позже, поэтому
+создание объекта оставляет в общем кэше отметку «ключ существует» на
+BLOOM_KNOWN_TIMEOUT (дольше периода пересборки); она проверяется перед
+каждым отказом. Вместе с фильтром в общий кэш кладётся время его сборки:
+если оно пропало или не совпадает с копией процесса (кэш сброшен вместе
+с отметками, фильтр пересобран), фильтру не верим. Пока фильтр не
+собран, проверка по нему пропускается.
+"""
+import hashlib
+import os
+import struct
+import threading
+import time
+
+from core.bloom import BloomFilter
+from core.views import KnownMissing
+from django.conf import settings
+from django.core.cache import cache, caches
+from posts.models import Group, Post, User
+
+USER = 'user'
+GROUP = 'group'
+POST = 'post'
+NEGATIVE_CACHE = 'negative'
+ENTITIES = {
+    USER: (User, 'username'),
+    GROUP: (Group, 'slug'),
+    POST: (Post, 'pk'),
+}
+
+# Время сборки, размер и число хешей перед битами фильтра в файле.
+FILE_HEADER = struct.Struct('<dQI')
+
+_filters = {}
+
+
+def _digest(key):
+    return hashlib.md5(str(key).encode()).hexdigest()
+
+
+def _filter_path(entity):
+    return os.path.join(settings.BLOOM_ROOT, f'{entity}.bloom')
+
+
+def _negative_key(entity, key):
+    return f'negative:{entity}:{_digest(key)}'
+
+
+def _known_key(entity, key):
+    return f'bloom:known:{entity}:{_digest(key)}'
+
+
+def _built_key(entity):
+    return f'bloom:{entity}:built'
+
+
+def build(entity):
+    model, field = ENTITIES[entity]
+    keys = model._base_manager.values_list(field, flat=True)
+    bloom = BloomFilter.for_capacity(
+        int(keys.count() * 1.2) + 1000, settings.BLOOM_ERROR_RATE
+    )
+    for key in keys.iterator():
+        bloom.add(key)
+    built = time.time()
+    size, hashes, bits = bloom.dumps()
+    path = _filter_path(entity)
+    os.makedirs(settings.BLOOM_ROOT, exist_ok=True)
+    temporary = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(temporary, 'wb') as output:
+        output.write(FILE_HEADER.pack(built, size, hashes))
+        output.write(bits)
+    os.replace(temporary, path)
+    cache.set(_built_key(entity), built, None)
+    _filters.pop(entity, None)
+    return bloom
+
+
+def _read_filter(path):
+    with open(path, 'rb') as source:
+        built, size, hashes = FILE_HEADER.unpack(
+            source.read(FILE_HEADER.size)
+        )
+        return built, BloomFilter.loads((size, hashes, source.read()))
+
+
+def get_filter(entity):
+    """(время сборки, фильтр) из копии процесса или файла."""
+    loaded, version, built, bloom = _filters.get(
+        entity, (None, None, None, None)
+    )
+    now = time.monotonic()
+    if loaded is None or now - loaded > settings.BLOOM_REFRESH_INTERVAL:
+        path = _filter_path(entity)
+        try:
+            current = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            current, built, bloom = None, None, None
+        if current is not None and current != version:
+            built, bloom = _read_filter(path)
+        _filters[entity] = (now, current, built, bloom)
+    return built, bloom
+
+
+def mark_known(entity, key):
+    cache.set(_known_key(entity, key), True, settings.BLOOM_KNOWN_TIMEOUT)
+    caches[NEGATIVE_CACHE].delete(_negative_key(entity, key))
+
+
+def remember_missing(entity, key):
+    caches[NEGATIVE_CACHE].set(
+        _negative_key(entity, key), True, settings.NEGATIVE_CACHE_TIMEOUT
+    )
+
+
+def is_missing(entity, key):
+    """True, если объекта с таким ключом точно нет."""
+    if caches[NEGATIVE_CACHE].get(_negative_key(entity, key)):
+        # Промах мог запомнить другой процесс до создания объекта.
+        return not cache.get(_known_key(entity, key))
+    built, bloom = get_filter(entity)
+    if bloom is None or key in bloom:
+        return False
+    known_key, built_key = _known_key(entity, key), _built_key(entity)
+    values = cache.get_many([known_key, built_key])
+    if values.get(built_key) != built:
+        # Фильтр пересобран или кэш сброшен вместе с отметками новых
+        # ключей: копии процесса верить нельзя.
+        _filters.pop(entity, None)
+        return False
+    return not values.get(known_key)
+
+
+def get_object_or_404(entity, queryset, key):
+    """Как django.shortcuts.get_object_or_404, но заведомо отсутствующие
+    ключи отклоняются без запроса, а страница 404 для них готовая."""
+    if is_missing(entity, key):
+        raise KnownMissing
+    field = ENTITIES[entity][1]
+    try:
+        return queryset.get(**{field: key})
+    except queryset.model.DoesNotExist:
+        remember_missing(entity, key)
+        raise KnownMissing
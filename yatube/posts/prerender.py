@@ -0,0 +1,242 @@
+"""Статические копии страниц для анонимных пользователей.
+
+Страницы ``index``, ``group_list``, ``profile`` и ``post_detail``
+рендерятся в файлы под ``PRERENDER_ROOT`` по их URL: первая страница
+ленты в ``index.html``, остальные в ``page-<n>.html``. Веб-сервер отдаёт
+их без обращения к Django, например для nginx::
+
+    try_files $uri/page-$arg_page.html $uri/index.html @django;
+
+Для каждого surrogate-ключа в ``.keys/`` хранится список записанных
+файлов, чтобы удалять страницы исчезнувших объектов.
+
+Полная сборка пишет все страницы лент. При изменении ключа ленты
+перерисовывается только её первая страница, а остальные удаляются:
+новый пост сдвигает их все, и до следующей полной сборки их отдаёт
+Django. В статических копиях страниц постов нет числа постов автора
+(``request.prerendering``): иначе каждый новый пост автора требовал бы
+перерисовать все его посты.
+"""
+import inspect
+import logging
+import math
+import os
+import queue
+import threading
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.db import close_old_connections
+from django.http import HttpRequest, QueryDict
+from django.urls import resolve, reverse
+from posts.models import Group, Post, User
+from posts.surrogate_keys import INDEX, author_key, group_key, post_key
+from posts.utilites import POSTS_PER_PAGE
+
+logger = logging.getLogger(__name__)
+
+KEYS_DIR = '.keys'
+# Отметка о том, что очередь переполнилась и нужна полная пересборка.
+REBUILD_FLAG = '.rebuild'
+
+
+class Prerenderer:
+    def __init__(self, root=None):
+        self.root = root or settings.PRERENDER_ROOT
+
+    def request_rebuild(self):
+        """Отмечает, что нужна полная пересборка (см. rebuild_if_requested)."""
+        self.write_atomic(os.path.join(self.root, KEYS_DIR, REBUILD_FLAG), b'')
+
+    def rebuild_if_requested(self):
+        """Выполняет отмеченную полную пересборку; возвращает True, если
+        она была нужна. Отметка снимается до сборки: переполнение во
+        время неё отметит пересборку заново."""
+        try:
+            os.remove(os.path.join(self.root, KEYS_DIR, REBUILD_FLAG))
+        except FileNotFoundError:
+            return False
+        self.build_all()
+        return True
+
+    def build_all(self):
+        """Полная пересборка всех страниц."""
+        self.regenerate([INDEX], full=True)
+        self.regenerate((
+            group_key(slug)
+            for slug in Group.objects.values_list('slug', flat=True).iterator()
+        ), full=True)
+        self.regenerate((
+            author_key(pk)
+            for pk in User.objects.values_list('pk', flat=True).iterator()
+        ), full=True)
+        self.regenerate(
+            post_key(pk)
+            for pk in Post.objects.values_list('pk', flat=True).iterator()
+        )
+
+    def regenerate(self, keys, full=False):
+        """Перерисовывает страницы ключей; ``full`` — все страницы лент."""
+        for key in keys:
+            scope, _, value = key.partition('-')
+            if key == INDEX:
+                self.write_listing(
+                    key, reverse('posts:index'),
+                    Post.objects.count() if full else 0
+                )
+            elif scope == 'group':
+                self.regenerate_group(key, value, full)
+            elif scope == 'author':
+                self.regenerate_author(key, int(value), full)
+            elif scope == 'post':
+                self.regenerate_post(key, int(value))
+
+    def regenerate_group(self, key, slug, full=False):
+        group = Group.objects.filter(slug=slug).first()
+        if group is None:
+            return self.remove(key)
+        self.write_listing(
+            key,
+            reverse('posts:group_list', kwargs={'slug': slug}),
+            group.posts.count() if full else 0
+        )
+
+    def regenerate_author(self, key, pk, full=False):
+        author = User.objects.filter(pk=pk).first()
+        if author is None:
+            return self.remove(key)
+        self.write_listing(
+            key,
+            reverse('posts:profile', kwargs={'username': author.username}),
+            author.posts.count() if full else 0
+        )
+
+    def regenerate_post(self, key, pk):
+        if not Post.objects.filter(pk=pk).exists():
+            return self.remove(key)
+        path = reverse('posts:post_detail', kwargs={'post_id': pk})
+        self.write_files(key, [self.write_page(path)])
+
+    def write_listing(self, key, path, count):
+        """Пишет страницы ленты из count постов; остальные файлы ключа
+        удаляются."""
+        pages = max(1, math.ceil(count / POSTS_PER_PAGE))
+        self.write_files(key, [
+            self.write_page(path, page) for page in range(1, pages + 1)
+        ])
+
+    def write_page(self, path, page=1):
+        parts = [part for part in path.split('/') if part]
+        if any(part in ('.', '..') for part in parts):
+            raise ValueError(f'Unsafe path: {path}')
+        filename = 'index.html' if page == 1 else f'page-{page}.html'
+        target = os.path.join(self.root, *parts, filename)
+        self.write_atomic(target, render_anonymous(path, page))
+        return os.path.relpath(target, self.root)
+
+    def write_files(self, key, files):
+        """Запоминает файлы ключа и удаляет оставшиеся от прошлой сборки."""
+        stale = set(self.read_manifest(key)) - set(files)
+        self.delete_files(stale)
+        self.write_atomic(
+            self.manifest_path(key), '\n'.join(files).encode()
+        )
+
+    def remove(self, key):
+        self.delete_files(self.read_manifest(key))
+        try:
+            os.remove(self.manifest_path(key))
+        except FileNotFoundError:
+            pass
+
+    def delete_files(self, files):
+        for name in files:
+            try:
+                os.remove(os.path.join(self.root, name))
+            except FileNotFoundError:
+                pass
+
+    def manifest_path(self, key):
+        return os.path.join(self.root, KEYS_DIR, key)
+
+    def read_manifest(self, key):
+        try:
+            with open(self.manifest_path(key)) as manifest:
+                return manifest.read().split()
+        except FileNotFoundError:
+            return []
+
+    @staticmethod
+    def write_atomic(target, content):
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        temporary = f'{target}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(temporary, 'wb') as output:
+            output.write(content)
+        os.replace(temporary, target)
+
+
+def render_anonymous(path, page=1):
+    """Рендерит страницу так, как её видит анонимный пользователь."""
+    request = HttpRequest()
+    request.method = 'GET'
+    request.path = request.path_info = path
+    request.META = {'SERVER_NAME': 'localhost', 'SERVER_PORT': '80'}
+    if page != 1:
+        request.GET = QueryDict(f'page={page}')
+    request.user = AnonymousUser()
+    request.prerendering = True
+    request.resolver_match = match = resolve(path)
+    # Обходим кэш страниц: файл должен отражать текущее состояние базы.
+    view = inspect.unwrap(match.func)
+    response = view(request, *match.args, **match.kwargs)
+    return response.content
+
+
+class PrerenderPurgeBackend:
+    """Бэкенд очистки (см. core.surrogate), перерисовывающий файлы.
+
+    Ключи обрабатываются фоновым потоком через ограниченную очередь.
+    Поток живёт в веб-воркере, поэтому при переполнении очереди он не
+    пересобирает сайт сам, а оставляет отметку для
+    ``manage.py prerender --if-requested`` (cron).
+    """
+
+    def __init__(self):
+        self.queue = queue.Queue(maxsize=settings.PRERENDER_QUEUE_SIZE)
+        self.overflowed = threading.Event()
+        self.lock = threading.Lock()
+        self.worker = None
+
+    def purge(self, keys):
+        try:
+            self.queue.put_nowait(keys)
+        except queue.Full:
+            self.overflowed.set()
+        self.ensure_worker()
+
+    def ensure_worker(self):
+        with self.lock:
+            if self.worker is None or not self.worker.is_alive():
+                self.worker = threading.Thread(
+                    target=self.run, name='prerender', daemon=True
+                )
+                self.worker.start()
+
+    def run(self):
+        prerenderer = Prerenderer()
+        while True:
+            keys = set(self.queue.get())
+            while True:
+                try:
+                    keys.update(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                if self.overflowed.is_set():
+                    self.overflowed.clear()
+                    prerenderer.request_rebuild()
+                prerenderer.regenerate(sorted(keys))
+            except Exception:
+                logger.exception('Prerendering failed for %s', keys)
+            finally:
+                close_old_connections()
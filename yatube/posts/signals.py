@@ -0,0 +1,179 @@
+from core import blobs, surrogate
+from django.db.models.signals import (post_delete, post_init, post_save,
+                                      pre_delete)
+from django.dispatch import receiver
+from posts import follow_graph, group_stats, negative, sitemaps, trending
+from posts.models import Comment, Follow, Group, Post, User
+from posts.surrogate_keys import INDEX, author_key, group_key, post_key
+
+
+@receiver(post_init, sender=Post)
+def remember_initial_group(sender, instance, **kwargs):
+    instance._initial_group_id = instance.group_id
+    instance._initial_image = instance.image.name
+
+
+def post_surrogate_keys(post):
+    keys = {INDEX, post_key(post.pk), author_key(post.author_id)}
+    if post.group_id is not None:
+        keys.add(group_key(post.group.slug))
+    initial_group_id = getattr(post, '_initial_group_id', None)
+    if initial_group_id not in (None, post.group_id):
+        keys.update(
+            group_key(slug) for slug in Group.objects.filter(
+                pk=initial_group_id
+            ).values_list('slug', flat=True)
+        )
+    return keys
+
+
+@receiver(post_save, sender=Post)
+def count_saved_post(sender, instance, created, **kwargs):
+    initial_group_id = None if created else instance._initial_group_id
+    if initial_group_id == instance.group_id:
+        return
+    if initial_group_id is not None:
+        group_stats.post_removed(initial_group_id, instance.pk)
+    if instance.group_id is not None:
+        group_stats.post_added(instance)
+
+
+@receiver(post_delete, sender=Post)
+def count_deleted_post(sender, instance, **kwargs):
+    if instance._initial_group_id is not None:
+        group_stats.post_removed(instance._initial_group_id, instance.pk)
+
+
+@receiver(post_save, sender=Post)
+def count_image_references(sender, instance, **kwargs):
+    if instance.image.name != instance._initial_image:
+        blobs.acquire(instance.image.name)
+        blobs.release(instance._initial_image)
+        instance._initial_image = instance.image.name
+
+
+@receiver(post_delete, sender=Post)
+def release_image(sender, instance, **kwargs):
+    blobs.release(instance._initial_image)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def sitemap_post(sender, instance, **kwargs):
+    sitemaps.mark_dirty(sitemaps.POSTS, instance.pk)
+    # lastmod группы — её последняя активность, см. group_stats.
+    for group_id in {instance.group_id, instance._initial_group_id}:
+        if group_id is not None:
+            sitemaps.mark_dirty(sitemaps.GROUPS, group_id)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def purge_post(sender, instance, **kwargs):
+    surrogate.purge(post_surrogate_keys(instance))
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def purge_comment(sender, instance, **kwargs):
+    surrogate.purge({post_key(instance.post_id)})
+
+
+@receiver(post_save, sender=Comment)
+def comment_trending(sender, instance, created, **kwargs):
+    if created:
+        trending.record_comment(instance.post_id)
+
+
+@receiver(post_init, sender=Group)
+def remember_initial_slug(sender, instance, **kwargs):
+    instance._initial_slug = instance.slug
+    instance._initial_title = instance.title
+
+
+def group_pages(group):
+    """Ключи страниц, где показаны название или адрес группы."""
+    keys = {INDEX}
+    posts = Post.objects.filter(group=group).values_list('pk', 'author_id')
+    for pk, author_id in posts.iterator():
+        keys.update((post_key(pk), author_key(author_id)))
+    return keys
+
+
+@receiver(post_save, sender=Group)
+def purge_group(sender, instance, created, **kwargs):
+    keys = {group_key(instance.slug)}
+    if not created and (instance._initial_slug, instance._initial_title) != (
+        instance.slug, instance.title
+    ):
+        # Страницы со старым адресом удаляются по старому ключу.
+        keys.add(group_key(instance._initial_slug))
+        keys.update(group_pages(instance))
+    surrogate.purge(keys)
+    instance._initial_slug = instance.slug
+    instance._initial_title = instance.title
+
+
+@receiver(pre_delete, sender=Group)
+def purge_deleted_group(sender, instance, **kwargs):
+    # После удаления посты уже отвязаны от группы.
+    surrogate.purge({group_key(instance.slug), *group_pages(instance)})
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def purge_author(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    surrogate.purge({author_key(instance.pk)})
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def sitemap_group(sender, instance, **kwargs):
+    sitemaps.mark_dirty(sitemaps.GROUPS, instance.pk)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def sitemap_profile(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    sitemaps.mark_dirty(sitemaps.PROFILES, instance.pk)
+
+
+@receiver(post_save, sender=Follow)
+def follow_saved(sender, instance, created, **kwargs):
+    if created:
+        follow_graph.follow_added(instance.user_id, instance.author_id)
+
+
+@receiver(post_delete, sender=Follow)
+def follow_deleted(sender, instance, **kwargs):
+    follow_graph.follow_removed(instance.user_id, instance.author_id)
+
+
+@receiver(post_save, sender=Post)
+def post_known(sender, instance, created, **kwargs):
+    if created:
+        negative.mark_known(negative.POST, instance.pk)
+
+
+@receiver(post_save, sender=Group)
+def group_known(sender, instance, **kwargs):
+    negative.mark_known(negative.GROUP, instance.slug)
+
+
+@receiver(post_save, sender=User)
+def user_known(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    negative.mark_known(negative.USER, instance.username)
+
+
+# Регистрируется последним: все обработчики выше видят группу поста до
+# сохранения.
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def forget_initial_group(sender, instance, **kwargs):
+    instance._initial_group_id = instance.group_id
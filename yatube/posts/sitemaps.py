@@ -0,0 +1,245 @@
+"""Карта сайта: индекс ``sitemap.xml`` и шарды по диапазонам ключей.
+
+Разделы (посты, профили, группы) делятся на шарды по
+``SITEMAP_SHARD_SIZE`` первичных ключей: шард N содержит объекты с pk
+в ``[N * size, (N + 1) * size)``. Шард пишется потоково из
+``values_list().iterator()`` в файл под ``SITEMAP_ROOT`` вместе со
+сжатыми копиями. Изменение объекта записывает его шард в SitemapShard
+в той же транзакции; ``build`` (обычно из cron, в отдельном процессе)
+переписывает только записанные шарды и индекс. Веб-сервер может
+отдавать файлы напрямую, например для nginx::
+
+    location ~ ^/sitemap[-a-z0-9]*\\.xml$ { root ...; gzip_static on; }
+
+Без него файлы отдаёт представление ``serve``.
+"""
+import os
+import re
+import threading
+from collections import namedtuple
+from datetime import datetime, timezone
+
+from core import compression
+from core.media import serve_file
+from django.conf import settings
+from django.db.models import Max
+from django.http import Http404
+from django.urls import reverse
+from django.utils.cache import patch_vary_headers
+from django.utils.encoding import iri_to_uri
+from django.utils.html import escape
+from posts.models import Group, Post, SitemapShard, User
+
+POSTS = 'posts'
+PROFILES = 'profiles'
+GROUPS = 'groups'
+
+INDEX_NAME = 'sitemap.xml'
+SHARD_RE = re.compile(r'^sitemap-(?P<section>[a-z]+)-(?P<number>\d+)\.xml$')
+CHUNK_SIZE = 2000
+CONTENT_TYPE = 'application/xml'
+
+HEADER = (
+    b'<?xml version="1.0" encoding="UTF-8"?>\n'
+    b'<%s xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+)
+
+Section = namedtuple(
+    'Section', 'model viewname sample key_field lastmod_field filters'
+)
+
+SECTIONS = {
+    POSTS: Section(Post, 'posts:post_detail', 0, 'pk', 'pub_date', {}),
+    PROFILES: Section(
+        User, 'posts:profile', 'x', 'username', None, {'is_active': True}
+    ),
+    GROUPS: Section(
+        Group, 'posts:group_list', 'x', 'slug', 'last_activity', {}
+    ),
+}
+
+
+def shard_number(pk):
+    return pk // settings.SITEMAP_SHARD_SIZE
+
+
+def shard_name(section, number):
+    return f'sitemap-{section}-{number}.xml'
+
+
+def mark_dirty(section, pk):
+    """Помечает шард объекта для перезаписи. Отметка пишется в той же
+    транзакции, что и изменение: откат отменяет и её, а build не увидит
+    отметку раньше самого изменения."""
+    SitemapShard.objects.bulk_create(
+        [SitemapShard(section=section, number=shard_number(pk))],
+        ignore_conflicts=True
+    )
+
+
+def location_template(section):
+    """Шаблон адреса объекта: reverse выполняется один раз на шард."""
+    path = reverse(section.viewname, args=[section.sample])
+    prefix, _, suffix = path.rpartition(str(section.sample))
+    return escape(settings.SITE_URL + prefix) + '{}' + escape(suffix)
+
+
+def _lastmod(value):
+    return f'<lastmod>{value.date().isoformat()}</lastmod>' if value else ''
+
+
+def write_atomic(target, chunks):
+    temporary = f'{target}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(temporary, 'wb') as output:
+        for chunk in chunks:
+            output.write(chunk)
+    os.replace(temporary, target)
+
+
+def write_compressed(target):
+    """Кладёт рядом с файлом сжатые копии для gzip_static/brotli_static."""
+    with open(target, 'rb') as source:
+        data = source.read()
+    for encoding in compression.available_encodings():
+        write_atomic(
+            target + compression.EXTENSIONS[encoding],
+            [compression.compress(data, encoding, best=True)]
+        )
+
+
+def remove(target):
+    for name in (target, *(
+        target + extension for extension in compression.EXTENSIONS.values()
+    )):
+        try:
+            os.remove(name)
+        except FileNotFoundError:
+            pass
+
+
+def write_shard(root, name, number):
+    """Переписывает шард раздела; пустой шард удаляется.
+
+    Возвращает число адресов в шарде.
+    """
+    section = SECTIONS[name]
+    size = settings.SITEMAP_SHARD_SIZE
+    fields = [section.key_field]
+    if section.lastmod_field:
+        fields.append(section.lastmod_field)
+    rows = section.model.objects.filter(
+        pk__gte=number * size, pk__lt=(number + 1) * size, **section.filters
+    ).order_by('pk').values_list(*fields).iterator(chunk_size=CHUNK_SIZE)
+    template = location_template(section)
+    count = 0
+
+    def chunks():
+        nonlocal count
+        yield HEADER % b'urlset'
+        lines = []
+        for row in rows:
+            key = escape(iri_to_uri(str(row[0])))
+            lastmod = _lastmod(row[1]) if len(row) > 1 else ''
+            lines.append(
+                f'<url><loc>{template.format(key)}</loc>{lastmod}</url>\n'
+            )
+            if len(lines) == CHUNK_SIZE:
+                count += len(lines)
+                yield ''.join(lines).encode()
+                lines = []
+        count += len(lines)
+        yield ''.join(lines).encode()
+        yield b'</urlset>\n'
+
+    target = os.path.join(root, shard_name(name, number))
+    write_atomic(target, chunks())
+    if count:
+        write_compressed(target)
+    else:
+        remove(target)
+    return count
+
+
+def existing_shards(root):
+    shards = {name: set() for name in SECTIONS}
+    for entry in os.scandir(root):
+        match = SHARD_RE.match(entry.name)
+        if match and match['section'] in shards:
+            shards[match['section']].add(int(match['number']))
+    return shards
+
+
+def write_index(root):
+    lines = []
+    for name, numbers in existing_shards(root).items():
+        for number in sorted(numbers):
+            filename = shard_name(name, number)
+            modified = datetime.fromtimestamp(
+                os.stat(os.path.join(root, filename)).st_mtime, timezone.utc
+            )
+            location = escape(settings.SITE_URL + reverse(
+                'posts:sitemap', kwargs={'name': filename}
+            ))
+            lines.append(
+                f'<sitemap><loc>{location}</loc>{_lastmod(modified)}'
+                f'</sitemap>\n'
+            )
+    target = os.path.join(root, INDEX_NAME)
+    write_atomic(target, [
+        HEADER % b'sitemapindex',
+        ''.join(lines).encode(),
+        b'</sitemapindex>\n',
+    ])
+    write_compressed(target)
+
+
+def build(full=False, root=None):
+    """Переписывает грязные шарды (или все при ``full``) и индекс.
+
+    Возвращает словарь раздел -> число переписанных шардов.
+    """
+    root = root or settings.SITEMAP_ROOT
+    os.makedirs(root, exist_ok=True)
+    full = full or not os.path.exists(os.path.join(root, INDEX_NAME))
+    existing = existing_shards(root)
+    rewritten = {}
+    for name, section in SECTIONS.items():
+        marks = SitemapShard.objects.filter(section=name)
+        # Отметки снимаются до чтения базы: изменение, пришедшее во
+        # время записи, снова пометит шард.
+        if full:
+            marks.delete()
+            last = section.model.objects.aggregate(last=Max('pk'))['last']
+            numbers = existing[name] | set(
+                range(0 if last is None else shard_number(last) + 1)
+            )
+        else:
+            flagged = dict(marks.values_list('pk', 'number'))
+            marks.filter(pk__in=list(flagged)).delete()
+            numbers = set(flagged.values())
+        for number in sorted(numbers):
+            write_shard(root, name, number)
+        rewritten[name] = len(numbers)
+    if full or any(rewritten.values()):
+        write_index(root)
+    return rewritten
+
+
+def serve(request, name):
+    """Отдаёт готовый файл карты, сжатый, если клиент это принимает."""
+    if name != INDEX_NAME and not SHARD_RE.match(name):
+        raise Http404
+    path = os.path.join(settings.SITEMAP_ROOT, name)
+    encoding = compression.negotiate(
+        request.META.get('HTTP_ACCEPT_ENCODING', '')
+    )
+    compressed = path + compression.EXTENSIONS.get(encoding, '')
+    if encoding is not None and os.path.isfile(compressed):
+        response = serve_file(request, compressed, CONTENT_TYPE)
+        response['Content-Encoding'] = encoding
+    elif os.path.isfile(path):
+        response = serve_file(request, path, CONTENT_TYPE)
+    else:
+        raise Http404
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
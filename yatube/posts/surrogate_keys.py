@@ -0,0 +1,19 @@
+"""Surrogate-ключи страниц приложения posts."""
+
+INDEX = 'index'
+
+
+def post_key(post_id):
+    return f'post-{post_id}'
+
+
+def author_key(author_id):
+    return f'author-{author_id}'
+
+
+def group_key(slug):
+    return f'group-{slug}'
+
+
+def page_keys(page_obj):
+    return [post_key(post.pk) for post in page_obj]
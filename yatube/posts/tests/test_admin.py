@@ -0,0 +1,68 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from posts.models import Comment, Group, Post
+
+User = get_user_model()
+
+
+class ScaleAdminTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        cls.posts = [
+            Post.objects.create(
+                author=cls.admin, group=cls.group,
+                text=f'Пост номер {number}'
+            )
+            for number in range(5)
+        ]
+        cls.posts[3].text += ' Редкое слово'
+        cls.posts[3].save()
+        Comment.objects.create(
+            post=cls.posts[0], author=cls.admin, text='Редкое слово'
+        )
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def changelist(self, model, **params):
+        return self.client.get(
+            reverse(f'admin:posts_{model}_changelist'), params
+        )
+
+    def test_search_uses_index(self):
+        """Поиск идёт через FTS5 и учитывает правки текста."""
+        response = self.changelist('post', q='редкое')
+        self.assertEqual(
+            list(response.context['cl'].result_list), [self.posts[3]]
+        )
+        self.posts[3].text = 'Обычный текст'
+        self.posts[3].save()
+        response = self.changelist('post', q='редкое')
+        self.assertEqual(list(response.context['cl'].result_list), [])
+        response = self.changelist('comment', q='слово')
+        self.assertEqual(response.context['cl'].result_count, 1)
+
+    @mock.patch('core.admin.COUNT_LIMIT', 2)
+    def test_counts_are_estimated_or_bounded(self):
+        response = self.changelist('post')
+        cl = response.context['cl']
+        self.assertEqual(cl.result_count, self.posts[-1].pk)
+        self.assertIsNone(cl.full_result_count)
+        response = self.changelist('post', group__id__exact=self.group.pk)
+        self.assertEqual(response.context['cl'].result_count, 2)
+
+    def test_related_objects_in_one_query(self):
+        """Авторы и группы не загружаются построчно, группы не
+        перечисляются в выпадающем списке."""
+        with self.assertNumQueries(4):
+            response = self.changelist('post')
+        self.assertNotContains(response, '>Группа</option>')
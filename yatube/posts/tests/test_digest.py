@@ -0,0 +1,77 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.management import call_command
+from django.template.loader import render_to_string
+from django.test import TestCase
+from django.utils import timezone
+from posts.digest import Digest, send_digest
+from posts.models import Follow, Post
+
+User = get_user_model()
+
+
+class DigestTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.authors = [
+            User.objects.create_user(username=f'author_{number}')
+            for number in range(2)
+        ]
+        cls.readers = [
+            User.objects.create_user(
+                username=f'reader_{number}',
+                email=f'reader_{number}@example.com'
+            )
+            for number in range(3)
+        ]
+        for reader in cls.readers[:2]:
+            Follow.objects.create(user=reader, author=cls.authors[0])
+        Follow.objects.create(user=cls.readers[0], author=cls.authors[1])
+        Follow.objects.create(user=cls.readers[2], author=cls.authors[1])
+        cls.old = Post.objects.create(author=cls.authors[1], text='Старый')
+        Post.objects.filter(pk=cls.old.pk).update(
+            pub_date=timezone.now() - timedelta(days=2)
+        )
+        cls.first = Post.objects.create(author=cls.authors[0], text='Первый')
+        cls.second = Post.objects.create(author=cls.authors[1], text='Второй')
+
+    def test_digest(self):
+        call_command('send_digest')
+        by_recipient = {
+            message.to[0]: message for message in mail.outbox
+        }
+        self.assertEqual(sorted(by_recipient), [
+            'reader_0@example.com', 'reader_1@example.com',
+            'reader_2@example.com',
+        ])
+        body = by_recipient['reader_0@example.com'].body
+        self.assertLess(body.index('Второй'), body.index('Первый'))
+        self.assertNotIn('Старый', body)
+        self.assertNotIn('Второй', by_recipient['reader_1@example.com'].body)
+        html, _ = by_recipient['reader_2@example.com'].alternatives[0]
+        self.assertIn('Второй', html)
+
+    def test_each_post_rendered_once(self):
+        """Запросов и рендерингов не больше, чем постов и шаблонов,
+        независимо от числа читателей."""
+        with mock.patch(
+            'posts.digest.render_to_string', wraps=render_to_string
+        ) as render, self.assertNumQueries(2):
+            self.assertEqual(send_digest(chunk_size=2), 3)
+        self.assertEqual(render.call_count, 2 + 2 * 2)
+
+    def test_posts_after_start_are_skipped(self):
+        """Посты автора, у которого при сборке рассылки постов не было,
+        не ломают отправку на полпути."""
+        digest = Digest(timezone.now() - timedelta(days=1))
+        author = User.objects.create_user(username='newcomer')
+        Follow.objects.create(user=self.readers[1], author=author)
+        Post.objects.create(author=author, text='Поздний')
+        digest.until = timezone.now()
+        messages = list(digest.messages())
+        self.assertEqual(len(messages), 3)
+        for message in messages:
+            self.assertNotIn('Поздний', message.body)
@@ -0,0 +1,75 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from core import surrogate
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class FeedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        cls.post = Post.objects.create(
+            author=cls.author, group=cls.group, text='Первый пост'
+        )
+
+    def setUp(self):
+        cache.clear()
+        surrogate.flush()
+
+    def test_formats(self):
+        urls = {
+            reverse('posts:feed', args=['rss']): '<rss',
+            reverse('posts:feed', args=['atom']): '<feed',
+            reverse('posts:group_feed', args=['group', 'rss']): 'Группа',
+            reverse('posts:author_feed', args=['author', 'atom']): 'author',
+        }
+        for url, marker in urls.items():
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertContains(response, marker)
+                self.assertContains(response, 'Первый пост')
+                self.assertTrue(response.has_header('ETag'))
+
+    def test_unknown_format_and_object(self):
+        for url in (
+            reverse('posts:feed', args=['json']),
+            reverse('posts:group_feed', args=['nothing', 'rss']),
+            reverse('posts:author_feed', args=['nobody', 'rss']),
+        ):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_cached_feed_and_not_modified(self):
+        url = reverse('posts:feed', args=['rss'])
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response['ETag'], etag)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_new_post_regenerates_affected_feeds(self):
+        other = User.objects.create_user(username='other')
+        urls = {
+            reverse('posts:feed', args=['rss']): True,
+            reverse('posts:group_feed', args=['group', 'rss']): True,
+            reverse('posts:author_feed', args=['author', 'rss']): False,
+        }
+        etags = {url: self.client.get(url)['ETag'] for url in urls}
+        Post.objects.create(author=other, group=self.group, text='Новый пост')
+        surrogate.flush()
+        for url, changed in urls.items():
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response['ETag'] != etags[url], changed)
+                self.assertEqual(
+                    'Новый пост' in response.content.decode(), changed
+                )
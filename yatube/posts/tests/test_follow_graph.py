@@ -0,0 +1,77 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from posts import follow_graph
+from posts.models import Follow
+
+User = get_user_model()
+
+
+class FollowGraphTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='follower')
+        cls.authors = [
+            User.objects.create_user(username=f'author_{number}')
+            for number in range(3)
+        ]
+        Follow.objects.create(user=cls.user, author=cls.authors[0])
+
+    def setUp(self):
+        cache.clear()
+
+    def test_membership_without_queries(self):
+        """После загрузки проверки подписки не обращаются к базе."""
+        follow_graph.following(self.user.id)
+        with self.assertNumQueries(0):
+            self.assertTrue(
+                follow_graph.is_following(self.user.id, self.authors[0].id)
+            )
+            self.assertFalse(
+                follow_graph.is_following(self.user.id, self.authors[1].id)
+            )
+            self.assertEqual(
+                follow_graph.following_among(
+                    self.user.id, [author.id for author in self.authors]
+                ),
+                {self.authors[0].id}
+            )
+
+    def test_changes_visible_immediately(self):
+        follow_graph.following(self.user.id)
+        follow = Follow.objects.create(user=self.user, author=self.authors[2])
+        self.assertEqual(
+            list(follow_graph.following(self.user.id)),
+            sorted([self.authors[0].id, self.authors[2].id])
+        )
+        follow.delete()
+        self.assertFalse(
+            follow_graph.is_following(self.user.id, self.authors[2].id)
+        )
+
+    def test_invalidated_array_not_cached(self):
+        """Пока жива отметка сброса, прочитанный массив не кэшируется:
+        чтение, начатое до фиксации, не вернёт старые данные в кэш."""
+        Follow.objects.create(user=self.user, author=self.authors[1])
+        follow_graph.following(self.user.id)
+        key = follow_graph._following_key(self.user.id)
+        self.assertEqual(cache.get(key), follow_graph.INVALIDATED)
+        cache.delete(key)
+        follow_graph.following(self.user.id)
+        with self.assertNumQueries(0):
+            self.assertTrue(
+                follow_graph.is_following(self.user.id, self.authors[1].id)
+            )
+
+    def test_followers(self):
+        """Список подписчиков сбрасывается при изменениях."""
+        followers = follow_graph.followers_many(
+            [author.id for author in self.authors[:2]]
+        )
+        self.assertEqual(list(followers[self.authors[0].id]), [self.user.id])
+        self.assertEqual(list(followers[self.authors[1].id]), [])
+        Follow.objects.create(user=self.user, author=self.authors[1])
+        self.assertEqual(
+            list(follow_graph.followers(self.authors[1].id)), [self.user.id]
+        )
@@ -1,3 +1,4 @@
+import hashlib
 import shutil
 import tempfile
 from http import HTTPStatus
@@ -145,10 +146,11 @@ class PostFormTests(TestCase):
             )
         )
         self.assertEqual(Post.objects.count(), posts_count + 1)
+        digest = hashlib.sha256(small_gif).hexdigest()
         self.assertTrue(
             Post.objects.filter(
                 text=form_data['text'],
-                image='posts/small.gif').exists()
+                image=f'posts/{digest[:2]}/{digest}.gif').exists()
         )
 
     def test_authorized_user_create_comment(self):
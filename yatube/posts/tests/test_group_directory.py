@@ -0,0 +1,98 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class GroupAggregatesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='author')
+        cls.first, cls.second = (
+            Group.objects.create(
+                title=f'Группа {slug}', slug=slug, description='Описание'
+            )
+            for slug in ('first', 'second')
+        )
+
+    def assertAggregates(self, group, count, latest):
+        group.refresh_from_db()
+        self.assertEqual(group.post_count, count)
+        self.assertEqual(group.latest_post, latest)
+        self.assertEqual(
+            group.last_activity, latest and latest.pub_date
+        )
+
+    def test_create_move_delete(self):
+        older = Post.objects.create(
+            author=self.author, text='Старый', group=self.first
+        )
+        newer = Post.objects.create(
+            author=self.author, text='Новый', group=self.first
+        )
+        self.assertAggregates(self.first, 2, newer)
+
+        newer.group = self.second
+        newer.save()
+        self.assertAggregates(self.first, 1, older)
+        self.assertAggregates(self.second, 1, newer)
+
+        newer.text = 'Правка'
+        newer.save()
+        self.assertAggregates(self.second, 1, newer)
+
+        older.delete()
+        self.assertAggregates(self.first, 0, None)
+
+    def test_recount_after_bulk_changes(self):
+        """bulk_create и update() обходят сигналы; команда пересчитывает
+        счётчики по базе."""
+        Post.objects.bulk_create(
+            Post(author=self.author, text=f'Пост {number}', group=self.first)
+            for number in range(2)
+        )
+        Post.objects.filter(
+            pk=Post.objects.earliest('pk').pk
+        ).update(group=self.second)
+        self.assertAggregates(self.first, 0, None)
+        call_command('recount_groups')
+        latest = Post.objects.filter(group=self.first).get()
+        self.assertAggregates(self.first, 1, latest)
+        self.assertAggregates(
+            self.second, 1, Post.objects.filter(group=self.second).get()
+        )
+
+
+class GroupDirectoryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create_user(username='author')
+        for number in range(3):
+            group = Group.objects.create(
+                title=f'Группа {number}', slug=f'group-{number}',
+                description='Описание'
+            )
+            Post.objects.create(author=author, text='Текст', group=group)
+
+    @mock.patch('posts.views.GROUPS_PER_PAGE', 2)
+    def test_keyset_pages(self):
+        url = reverse('posts:group_directory')
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(
+            [group.slug for group in response.context['groups']],
+            ['group-0', 'group-1']
+        )
+        self.assertEqual(response.context['next_slug'], 'group-1')
+        response = self.client.get(url, {'after': 'group-1'})
+        self.assertEqual(
+            [group.slug for group in response.context['groups']],
+            ['group-2']
+        )
+        self.assertIsNone(response.context['next_slug'])
+        self.assertContains(response, 'Текст')
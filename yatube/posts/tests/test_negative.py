@@ -0,0 +1,94 @@
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from posts import negative
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class NegativeLookupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        cls.post = Post.objects.create(author=cls.author, text='Пост')
+
+    def setUp(self):
+        cache.clear()
+        caches[negative.NEGATIVE_CACHE].clear()
+        negative._filters.clear()
+        self.root = tempfile.mkdtemp()
+        overrides = override_settings(BLOOM_ROOT=self.root)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        call_command('rebuild_bloom_filters')
+
+    def tearDown(self):
+        negative._filters.clear()
+
+    def test_missing_rejected_without_queries(self):
+        urls = (
+            reverse('posts:profile', args=['nobody']),
+            reverse('posts:group_list', args=['nothing']),
+            reverse('posts:post_detail', args=[self.post.pk + 1000]),
+        )
+        for url in urls:
+            with self.subTest(url=url), self.assertNumQueries(0):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 404)
+                self.assertContains(response, url, status_code=404)
+
+    def test_existing_objects_found(self):
+        for url in (
+            reverse('posts:profile', args=['author']),
+            reverse('posts:group_list', args=['group']),
+            reverse('posts:post_detail', args=[self.post.pk]),
+        ):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_created_after_build(self):
+        """Объекты, созданные после сборки фильтра, находятся сразу,
+        в том числе после закэшированного промаха."""
+        url = reverse('posts:profile', args=['newcomer'])
+        self.assertEqual(self.client.get(url).status_code, 404)
+        User.objects.create_user(username='newcomer')
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_cache_flush_fails_open(self):
+        negative.get_filter(negative.GROUP)
+        cache.clear()
+        Group.objects.create(title='Новая', slug='new', description='')
+        cache.clear()
+        response = self.client.get(reverse('posts:group_list', args=['new']))
+        self.assertEqual(response.status_code, 200)
+
+    def test_negative_cache(self):
+        """Промах по базе запоминается и без фильтра."""
+        cache.clear()
+        url = reverse('posts:post_detail', args=[self.post.pk + 1000])
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_misses_stay_out_of_default_cache(self):
+        """Промахи сканера без фильтра не вытесняют общий кэш."""
+        shutil.rmtree(self.root)
+        negative._filters.clear()
+        cache.set('page', 'content')
+        for number in range(1, 50):
+            self.client.get(
+                reverse('posts:post_detail', args=[self.post.pk + number])
+            )
+        self.assertEqual(cache.get('page'), 'content')
+        self.assertEqual(len(caches[negative.NEGATIVE_CACHE]._cache), 49)
+        self.assertFalse(any('negative' in key for key in cache._cache))
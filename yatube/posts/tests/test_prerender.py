@@ -0,0 +1,115 @@
+import os
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from posts.models import Group, Post
+from posts.prerender import Prerenderer
+
+User = get_user_model()
+
+
+class PrerenderTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth_user')
+        cls.group = Group.objects.create(
+            title='test_group',
+            slug='test_slug',
+            description='test description'
+        )
+        Post.objects.bulk_create(
+            Post(author=cls.user, text=f'Пост {number}', group=cls.group)
+            for number in range(11)
+        )
+        cls.post = Post.objects.first()
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.prerenderer = Prerenderer(self.root)
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def read(self, *parts):
+        with open(os.path.join(self.root, *parts)) as page:
+            return page.read()
+
+    def test_build_all_writes_anonymous_pages(self):
+        """Полная сборка пишет все страницы лент и постов."""
+        self.prerenderer.build_all()
+        files = (
+            ('index.html',),
+            ('page-2.html',),
+            ('group', 'test_slug', 'index.html'),
+            ('group', 'test_slug', 'page-2.html'),
+            ('profile', 'auth_user', 'index.html'),
+            ('posts', str(self.post.pk), 'index.html'),
+        )
+        for parts in files:
+            with self.subTest(parts=parts):
+                self.assertIn('Войти', self.read(*parts))
+
+    def test_regenerate_only_affected_files(self):
+        """Перерисовываются и удаляются только файлы затронутых ключей."""
+        post_key = f'post-{self.post.pk}'
+        self.prerenderer.regenerate(['index', post_key])
+        self.assertFalse(
+            os.path.exists(os.path.join(self.root, 'group'))
+        )
+        Post.objects.filter(pk=self.post.pk).delete()
+        self.prerenderer.regenerate(['index', post_key])
+        self.assertFalse(os.path.exists(
+            os.path.join(self.root, 'posts', str(self.post.pk), 'index.html')
+        ))
+        self.assertFalse(
+            os.path.exists(os.path.join(self.root, 'page-2.html'))
+        )
+
+    def test_listing_change_rewrites_first_page(self):
+        """Изменение ленты перерисовывает первую страницу, остальные
+        удаляются до полной сборки."""
+        self.prerenderer.build_all()
+        self.prerenderer.regenerate(['index'])
+        self.assertIn('Войти', self.read('index.html'))
+        self.assertFalse(
+            os.path.exists(os.path.join(self.root, 'page-2.html'))
+        )
+
+    def test_post_page_without_author_count(self):
+        """Число постов автора меняется с каждым его постом, поэтому в
+        статическую копию страницы поста оно не попадает."""
+        self.prerenderer.regenerate([f'post-{self.post.pk}'])
+        self.assertNotIn(
+            'Всего постов автора',
+            self.read('posts', str(self.post.pk), 'index.html')
+        )
+
+    def test_renamed_group_files_removed(self):
+        self.prerenderer.regenerate(['group-test_slug'])
+        group = Group.objects.get(pk=self.group.pk)
+        group.slug = 'new_slug'
+        group.save()
+        self.prerenderer.regenerate(['group-test_slug', 'group-new_slug'])
+        self.assertFalse(os.path.exists(
+            os.path.join(self.root, 'group', 'test_slug', 'index.html')
+        ))
+        self.assertIn(
+            'test_group', self.read('group', 'new_slug', 'index.html')
+        )
+
+    def test_rebuild_only_when_requested(self):
+        """Переполнение очереди в веб-процессе оставляет отметку, а
+        полную пересборку выполняет команда."""
+        with override_settings(PRERENDER_ROOT=self.root):
+            call_command('prerender', if_requested=True)
+            self.assertFalse(os.path.exists(
+                os.path.join(self.root, 'index.html')
+            ))
+            self.prerenderer.request_rebuild()
+            call_command('prerender', if_requested=True)
+        self.assertIn('Войти', self.read('page-2.html'))
+        self.assertFalse(self.prerenderer.rebuild_if_requested())
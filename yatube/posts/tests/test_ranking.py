@@ -0,0 +1,70 @@
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from posts.models import AuthorRank, Follow
+from posts.ranking import pagerank
+from scipy import sparse
+
+User = get_user_model()
+
+
+class PageRankTests(TestCase):
+    def test_matches_reference(self):
+        """Цикл из трёх вершин даёт равные оценки, сумма равна единице."""
+        follows = sparse.csr_matrix(
+            ([1.0, 1.0, 1.0], ([0, 1, 2], [1, 2, 0])), shape=(3, 3)
+        )
+        scores, _ = pagerank(follows)
+        self.assertAlmostEqual(scores.sum(), 1.0)
+        for score in scores:
+            self.assertAlmostEqual(score, 1 / 3)
+
+    def test_warm_start_converges_faster(self):
+        follows = sparse.random(200, 200, density=0.05, format='csr',
+                                random_state=1)
+        follows.data[:] = 1
+        scores, cold = pagerank(follows)
+        warm_scores, warm = pagerank(follows, initial=scores)
+        self.assertLess(warm, cold)
+        self.assertAlmostEqual(abs(warm_scores - scores).sum(), 0, places=6)
+
+
+class RankAuthorsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.star, cls.author, *cls.readers = (
+            User.objects.create_user(username=f'user_{number}')
+            for number in range(5)
+        )
+        for reader in cls.readers:
+            Follow.objects.create(user=reader, author=cls.star)
+        Follow.objects.create(user=cls.readers[0], author=cls.author)
+
+    def test_ranks(self):
+        call_command('rank_authors')
+        top = AuthorRank.objects.first()
+        self.assertEqual((top.author, top.rank), (self.star, 1))
+        self.assertGreater(
+            top.score, AuthorRank.objects.get(author=self.author).score
+        )
+
+    def test_incremental_rerun(self):
+        """Без изменений графа повторный запуск не переписывает строки,
+        авторы без подписчиков и читателей удаляются."""
+        call_command('rank_authors')
+        computed = AuthorRank.objects.get(author=self.star).computed
+        call_command('rank_authors')
+        self.assertEqual(
+            AuthorRank.objects.get(author=self.star).computed, computed
+        )
+        Follow.objects.filter(author=self.author).delete()
+        call_command('rank_authors')
+        self.assertFalse(
+            AuthorRank.objects.filter(author=self.author).exists()
+        )
+
+    def test_page(self):
+        call_command('rank_authors')
+        response = self.client.get(reverse('posts:popular_authors'))
+        self.assertEqual(response.context['page_obj'][0].author, self.star)
@@ -0,0 +1,122 @@
+import gzip
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from posts import sitemaps
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class SitemapTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        cls.posts = [
+            Post.objects.create(author=cls.author, group=cls.group, text='П')
+            for _ in range(3)
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.root = tempfile.mkdtemp()
+        overrides = override_settings(
+            SITEMAP_ROOT=self.root, SITEMAP_SHARD_SIZE=2
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+
+    def read(self, name):
+        with open(os.path.join(self.root, name)) as sitemap:
+            return sitemap.read()
+
+    def shard(self, section, pk):
+        return sitemaps.shard_name(section, sitemaps.shard_number(pk))
+
+    def test_full_build_writes_shards_and_index(self):
+        sitemaps.build()
+        index = self.read(sitemaps.INDEX_NAME)
+        locations = set()
+        for pk in (post.pk for post in self.posts):
+            name = self.shard(sitemaps.POSTS, pk)
+            self.assertIn(f'/{name}</loc>', index)
+            locations.add(name)
+            self.assertIn(
+                reverse('posts:post_detail', args=[pk]) + '</loc>',
+                self.read(name)
+            )
+        self.assertIn('/profile/author/</loc>', self.read(
+            self.shard(sitemaps.PROFILES, self.author.pk)
+        ))
+        self.assertIn('/group/group/</loc>', self.read(
+            self.shard(sitemaps.GROUPS, self.group.pk)
+        ))
+        name = self.shard(sitemaps.POSTS, self.posts[0].pk)
+        with gzip.open(os.path.join(self.root, name + '.gz'), 'rt') as data:
+            self.assertEqual(data.read(), self.read(name))
+
+    def test_only_dirty_shards_rewritten(self):
+        sitemaps.build()
+        self.assertEqual(sum(sitemaps.build().values()), 0)
+        post = Post.objects.create(author=self.author, text='Новый')
+        self.assertEqual(sitemaps.build(), {
+            sitemaps.POSTS: 1, sitemaps.PROFILES: 0, sitemaps.GROUPS: 0,
+        })
+        self.assertIn(
+            reverse('posts:post_detail', args=[post.pk]),
+            self.read(self.shard(sitemaps.POSTS, post.pk))
+        )
+
+    def test_marks_survive_without_cache(self):
+        """Команда в cron не видит кэш веб-процессов: отметки шардов
+        хранятся в базе."""
+        sitemaps.build()
+        post = Post.objects.create(author=self.author, text='Новый')
+        with override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'build_sitemaps',
+        }}):
+            self.assertEqual(sitemaps.build()[sitemaps.POSTS], 1)
+        self.assertIn(
+            reverse('posts:post_detail', args=[post.pk]),
+            self.read(self.shard(sitemaps.POSTS, post.pk))
+        )
+
+    def test_emptied_shard_removed_from_index(self):
+        sitemaps.build()
+        post = self.posts[-1]
+        name = self.shard(sitemaps.POSTS, post.pk)
+        Post.objects.filter(
+            pk__gte=sitemaps.shard_number(post.pk)
+            * settings.SITEMAP_SHARD_SIZE
+        ).delete()
+        sitemaps.build()
+        self.assertFalse(os.path.exists(os.path.join(self.root, name)))
+        self.assertNotIn(name, self.read(sitemaps.INDEX_NAME))
+
+    def test_serve_precompressed(self):
+        sitemaps.build()
+        url = reverse('posts:sitemap', kwargs={'name': sitemaps.INDEX_NAME})
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(
+            gzip.decompress(b''.join(response.streaming_content)).decode(),
+            self.read(sitemaps.INDEX_NAME)
+        )
+        response = self.client.get(url)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response['Content-Type'], sitemaps.CONTENT_TYPE)
+        missing = reverse(
+            'posts:sitemap', kwargs={'name': 'sitemap-posts-999.xml'}
+        )
+        self.assertEqual(self.client.get(missing).status_code, 404)
@@ -0,0 +1,67 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from posts import fragments
+from posts.models import Comment, Follow, FollowSuggestion, Post
+
+User = get_user_model()
+
+
+class FollowSuggestionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.reader, cls.friend, cls.author, cls.other = (
+            User.objects.create_user(username=name)
+            for name in ('reader', 'friend', 'author', 'other')
+        )
+        Follow.objects.create(user=cls.reader, author=cls.friend)
+        Follow.objects.create(user=cls.friend, author=cls.author)
+        post = Post.objects.create(author=cls.other, text='Пост')
+        Comment.objects.create(post=post, author=cls.reader, text='Текст')
+
+    def setUp(self):
+        cache.clear()
+
+    def suggested(self, user):
+        return list(
+            FollowSuggestion.objects.filter(user=user)
+            .order_by('-score').values_list('author__username', flat=True)
+        )
+
+    def test_build(self):
+        """Рекомендуются друзья друзей и авторы, которых комментировали,
+        но не текущие подписки и не сам пользователь."""
+        call_command('build_follow_suggestions', batch_size=2)
+        self.assertEqual(self.suggested(self.reader), ['other', 'author'])
+        self.assertNotIn('reader', self.suggested(self.friend))
+
+    def test_rebuild_replaces_old(self):
+        call_command('build_follow_suggestions')
+        Follow.objects.create(user=self.reader, author=self.author)
+        call_command('build_follow_suggestions', top=1)
+        self.assertEqual(self.suggested(self.reader), ['other'])
+
+    def test_fragment_skips_new_follows(self):
+        """Подписки после расчёта не показываются в рекомендациях."""
+        call_command('build_follow_suggestions')
+        Follow.objects.create(user=self.reader, author=self.author)
+        self.client.force_login(self.reader)
+        response = self.client.get(reverse('posts:follow_index'))
+        self.assertContains(
+            response, reverse('posts:profile', args=['other'])
+        )
+        self.assertNotContains(
+            response, reverse('posts:profile', args=['author'])
+        )
+
+    def test_fragment_limit_from_markup(self):
+        """Параметры фрагмента приходят строками из parse_qsl."""
+        call_command('build_follow_suggestions')
+        request = RequestFactory().get('/')
+        request.user = self.reader
+        for limit, expected in (('1', 1), ('0', 1), ('1000', 2)):
+            with self.subTest(limit=limit):
+                context = fragments.suggestions(request, limit=limit)
+                self.assertEqual(len(context['suggestions']), expected)
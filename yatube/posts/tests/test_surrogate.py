@@ -0,0 +1,98 @@
+from core import surrogate
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from posts.models import Comment, Group, Post
+
+User = get_user_model()
+
+
+@override_settings(
+    SURROGATE_PURGE_BACKENDS=['core.surrogate.LocalPurgeBackend'],
+    SURROGATE_PURGE_BATCH_SIZE=2,
+)
+class SurrogateKeysTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth_user')
+        cls.group = Group.objects.create(
+            title='test_group',
+            slug='test_slug',
+            description='test description'
+        )
+        cls.post = Post.objects.create(
+            author=cls.user,
+            text='Тестовый пост',
+            group=cls.group,
+        )
+
+    def setUp(self):
+        self.guest_client = Client()
+        cache.clear()
+        surrogate.flush()
+        self.backend = surrogate.get_backends()[0]
+        self.backend.batches.clear()
+
+    def purged(self):
+        surrogate.flush()
+        return {key for batch in self.backend.batches for key in batch}
+
+    def test_responses_carry_surrogate_keys(self):
+        """Ответы помечены ключами объектов, от которых зависят."""
+        pages = {
+            reverse('posts:index'): {'index', f'post-{self.post.pk}'},
+            reverse('posts:group_list', kwargs={'slug': 'test_slug'}):
+            {'group-test_slug', f'post-{self.post.pk}'},
+            reverse('posts:profile', kwargs={'username': 'auth_user'}):
+            {f'author-{self.user.pk}', f'post-{self.post.pk}'},
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk}):
+            {f'post-{self.post.pk}', f'author-{self.user.pk}',
+             'group-test_slug'},
+        }
+        for url, keys in pages.items():
+            with self.subTest(url=url):
+                for _ in range(2):
+                    response = self.guest_client.get(url)
+                    self.assertEqual(
+                        set(response['Surrogate-Key'].split()), keys
+                    )
+
+    def test_post_change_purges_old_and_new_group(self):
+        """Перенос поста очищает ленты обеих групп, автора и главную."""
+        new_group = Group.objects.create(
+            title='new_group',
+            slug='new_slug',
+            description='new description'
+        )
+        self.backend.batches.clear()
+        post = Post.objects.get(pk=self.post.pk)
+        post.group = new_group
+        post.save()
+        self.assertEqual(self.purged(), {
+            'index', f'post-{post.pk}', f'author-{self.user.pk}',
+            'group-test_slug', 'group-new_slug',
+        })
+        self.assertTrue(
+            all(len(batch) <= 2 for batch in self.backend.batches)
+        )
+
+    def test_group_rename_purges_old_slug_and_posts(self):
+        """Новый адрес группы очищает страницы со старым адресом."""
+        group = Group.objects.get(pk=self.group.pk)
+        group.slug = 'renamed'
+        group.save()
+        self.assertEqual(self.purged(), {
+            'index', 'group-test_slug', 'group-renamed',
+            f'post-{self.post.pk}', f'author-{self.user.pk}',
+        })
+
+    def test_comment_purges_post(self):
+        """Новый комментарий очищает страницу поста."""
+        Comment.objects.create(
+            post=self.post,
+            author=self.user,
+            text='Комментарий'
+        )
+        self.assertEqual(self.purged(), {f'post-{self.post.pk}'})
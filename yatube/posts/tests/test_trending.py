@@ -0,0 +1,84 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from posts import trending
+from posts.models import Comment, Post, PostTrend
+from posts.prerender import render_anonymous
+
+User = get_user_model()
+
+HOUR = 60 * 60
+
+
+@override_settings(TRENDING_HALF_LIFE=HOUR, TRENDING_EPOCH=24 * HOUR)
+class TrendingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='author')
+        cls.old, cls.new = (
+            Post.objects.create(author=cls.author, text=f'Пост {number}')
+            for number in range(2)
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_later_events_weigh_more(self):
+        """Событие часом позже весит вдвое больше."""
+        start = 100 * 24 * HOUR
+        trending.record(self.old.pk, 1, now=start)
+        trending.record(self.new.pk, 1, now=start + HOUR)
+        trending.record(self.new.pk, 1, now=start + HOUR)
+        old = PostTrend.objects.get(post=self.old)
+        new = PostTrend.objects.get(post=self.new)
+        self.assertAlmostEqual(new.score / old.score, 4)
+
+    def test_rebase(self):
+        """Оценки прошлой эпохи переводятся в текущую с затуханием,
+        а остывшие посты удаляются."""
+        epoch_start = 100 * 24 * HOUR
+        trending.record(self.old.pk, 1, now=epoch_start - HOUR)
+        trending.record(self.new.pk, 1000, now=epoch_start - HOUR)
+        trending.rebase(now=epoch_start + 3 * HOUR)
+        self.assertFalse(PostTrend.objects.filter(post=self.old).exists())
+        new = PostTrend.objects.get(post=self.new)
+        self.assertEqual(new.epoch, 100)
+        self.assertAlmostEqual(new.score, 1000 * 2 ** 23 / 2 ** 24)
+
+    def test_event_in_new_epoch_carries_score(self):
+        epoch_start = 100 * 24 * HOUR
+        trending.record(self.new.pk, 2, now=epoch_start - HOUR)
+        trending.record(self.new.pk, 1, now=epoch_start)
+        self.assertAlmostEqual(
+            PostTrend.objects.get(post=self.new).score, 2 * 2 ** -1 + 1
+        )
+
+    @override_settings(TRENDING_VIEW_FLUSH_INTERVAL=0)
+    def test_feed(self):
+        """Комментарии и просмотры поднимают пост в популярном."""
+        Comment.objects.create(post=self.old, author=self.author, text='!')
+        self.client.get(reverse('posts:post_detail', args=[self.new.pk]))
+        call_command('update_trending')
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('posts:trending'))
+        self.assertEqual(
+            list(response.context['page_obj']), [self.old, self.new]
+        )
+
+    @override_settings(TRENDING_VIEW_FLUSH_INTERVAL=0)
+    def test_prerender_is_not_a_view(self):
+        render_anonymous(reverse('posts:post_detail', args=[self.new.pk]))
+        self.assertFalse(PostTrend.objects.exists())
+        self.client.get(reverse('posts:post_detail', args=[self.new.pk]))
+        self.assertTrue(PostTrend.objects.filter(post=self.new).exists())
+
+    def test_cache_miss_does_not_rebase(self):
+        """Страница при пустом кэше читает сохранённые оценки и ничего
+        не пересчитывает."""
+        epoch = trending.current_epoch()
+        PostTrend.objects.create(post=self.old, epoch=epoch, score=2)
+        PostTrend.objects.create(post=self.new, epoch=epoch - 1, score=0)
+        self.assertEqual(trending.top_post_ids(), [self.old.pk])
+        self.assertTrue(PostTrend.objects.filter(post=self.new).exists())
@@ -0,0 +1,160 @@
+"""Популярные посты: оценки с экспоненциальным затуханием.
+
+Каждое событие (комментарий, просмотр) добавляет к оценке поста вес,
+умноженный на 2 ** ((t - начало эпохи) / TRENDING_HALF_LIFE). Поздние
+события весят больше ранних, и порядок постов совпадает с порядком по
+затухающей оценке, но старые оценки не нужно пересчитывать при каждом
+событии: инкремент — один UPDATE с F().
+
+Чтобы множитель не рос бесконечно, время разбито на эпохи длиной
+TRENDING_EPOCH. Строки прошлых эпох пересчитываются в текущую пакетно
+(команда update_trending), одним UPDATE на эпоху; там же удаляются
+остывшие посты. Та же команда кладёт в кэш список id популярного без
+срока жизни; страница только читает его и сама базу не пересчитывает.
+"""
+import functools
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from posts.models import Post, PostTrend
+
+COMMENT_WEIGHT = 5.0
+VIEW_WEIGHT = 0.2
+# Посты, чья текущая оценка ниже, удаляются при пакетном пересчёте.
+MIN_SCORE = 0.1
+TOP_KEY = 'trending:top'
+
+_views = Counter()
+_views_lock = threading.Lock()
+_views_flushed = time.monotonic()
+
+
+def current_epoch(now=None):
+    return int((time.time() if now is None else now)
+               // settings.TRENDING_EPOCH)
+
+
+def growth(now, epoch):
+    """Множитель события в момент now относительно начала эпохи."""
+    elapsed = now - epoch * settings.TRENDING_EPOCH
+    return 2 ** (elapsed / settings.TRENDING_HALF_LIFE)
+
+
+def carry(from_epoch, to_epoch):
+    """Множитель перевода оценки из одной эпохи в другую."""
+    elapsed = (to_epoch - from_epoch) * settings.TRENDING_EPOCH
+    return 2 ** (-elapsed / settings.TRENDING_HALF_LIFE)
+
+
+def record(post_id, weight, now=None):
+    now = time.time() if now is None else now
+    epoch = current_epoch(now)
+    increment = weight * growth(now, epoch)
+    if PostTrend.objects.filter(post_id=post_id, epoch=epoch).update(
+        score=F('score') + increment
+    ):
+        return
+    with transaction.atomic():
+        trend, created = PostTrend.objects.select_for_update().get_or_create(
+            post_id=post_id, defaults={'score': increment, 'epoch': epoch}
+        )
+        if created:
+            return
+        trend.score = trend.score * carry(trend.epoch, epoch) + increment
+        trend.epoch = epoch
+        trend.save(update_fields=['score', 'epoch'])
+
+
+def record_comment(post_id):
+    record(post_id, COMMENT_WEIGHT)
+
+
+def count_views(view):
+    """Учитывает просмотр поста после успешного ответа представления.
+
+    Просмотр считается в обёртке, а не в самом представлении: пререндер
+    вызывает представление через inspect.unwrap, и перерисовка страницы
+    не должна выглядеть как просмотр.
+    """
+    @functools.wraps(view)
+    def wrapper(request, post_id, *args, **kwargs):
+        response = view(request, post_id, *args, **kwargs)
+        if response.status_code == 200:
+            record_view(post_id)
+        return response
+    return wrapper
+
+
+def record_view(post_id):
+    """Копит просмотры в памяти процесса и сбрасывает их раз в
+    TRENDING_VIEW_FLUSH_INTERVAL секунд."""
+    global _views_flushed
+    with _views_lock:
+        _views[post_id] += 1
+        if (time.monotonic() - _views_flushed
+                < settings.TRENDING_VIEW_FLUSH_INTERVAL):
+            return
+        views = dict(_views)
+        _views.clear()
+        _views_flushed = time.monotonic()
+    flush_views(views)
+
+
+def flush_views(views=None):
+    if views is None:
+        with _views_lock:
+            views = dict(_views)
+            _views.clear()
+    existing = Post.objects.filter(pk__in=list(views)).values_list(
+        'pk', flat=True
+    )
+    now = time.time()
+    for post_id in existing:
+        record(post_id, VIEW_WEIGHT * views[post_id], now)
+
+
+def rebase(now=None):
+    """Переводит оценки прошлых эпох в текущую и удаляет остывшие."""
+    now = time.time() if now is None else now
+    epoch = current_epoch(now)
+    stale = PostTrend.objects.filter(epoch__lt=epoch)
+    for old_epoch in stale.values_list('epoch', flat=True).distinct():
+        PostTrend.objects.filter(epoch=old_epoch).update(
+            score=F('score') * carry(old_epoch, epoch), epoch=epoch
+        )
+    PostTrend.objects.filter(
+        score__lt=MIN_SCORE * growth(now, epoch)
+    ).delete()
+
+
+def stored_top():
+    return list(
+        PostTrend.objects.filter(epoch=current_epoch())
+        .order_by('-score')
+        .values_list('post_id', flat=True)[:settings.TRENDING_TOP_SIZE]
+    )
+
+
+def refresh_top():
+    """Пересчитывает оценки и сохраняет список популярного до следующего
+    запуска update_trending."""
+    rebase()
+    post_ids = stored_top()
+    cache.set(TOP_KEY, post_ids, None)
+    return post_ids
+
+
+def top_post_ids():
+    """Список id популярного. Если кэш его потерял, список читается из
+    базы без пересчёта и кладётся на TRENDING_TOP_TIMEOUT, пока
+    update_trending не сохранит новый."""
+    post_ids = cache.get(TOP_KEY)
+    if post_ids is None:
+        post_ids = stored_top()
+        cache.add(TOP_KEY, post_ids, settings.TRENDING_TOP_TIMEOUT)
+    return post_ids
@@ -1,13 +1,26 @@
-from django.urls import path
+from django.urls import path, re_path
 
-from . import views
+from . import feeds, sitemaps, views
 
 app_name = 'posts'
 
 urlpatterns = [
     path('', views.index, name='index'),
+    re_path(
+        r'^(?P<name>sitemap[-a-z0-9]*\.xml)$', sitemaps.serve, name='sitemap'
+    ),
+    path('feed/<str:fmt>/', feeds.latest, name='feed'),
+    path('group/<slug>/feed/<str:fmt>/', feeds.group, name='group_feed'),
+    path(
+        'profile/<str:username>/feed/<str:fmt>/',
+        feeds.author,
+        name='author_feed'
+    ),
+    path('group/', views.group_directory, name='group_directory'),
     path('group/<slug>/', views.group_posts, name='group_list'),
     path('profile/<str:username>/', views.profile, name='profile'),
+    path('trending/', views.trending_posts, name='trending'),
+    path('authors/popular/', views.popular_authors, name='popular_authors'),
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
     path('create/', views.post_create, name='post_create'),
     path('posts/<int:post_id>/edit/', views.post_edit, name='post_edit'),
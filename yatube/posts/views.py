@@ -1,16 +1,25 @@
+from core import surrogate
+from core.holes import cache_page_with_holes
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
-from django.views.decorators.cache import cache_page
+from posts import follow_graph, negative, trending
 from posts.forms import CommentForm, PostForm
-from posts.models import Follow, Group, Post, User
+from posts.models import AuthorRank, Follow, Group, Post, User
+from posts.surrogate_keys import (INDEX, author_key, group_key, page_keys,
+                                  post_key)
 from posts.utilites import paginators
 
+GROUPS_PER_PAGE = 50
+# Длиннее список id подписок передаётся в запрос через JOIN, а не IN.
+MAX_FOLLOWING_IN_LIST = 500
 
-@cache_page(20, key_prefix="index_page")
+
+@cache_page_with_holes(20, key_prefix="index_page")
 def index(request):
     post_list = Post.objects.all()
     page_obj = paginators(request, post_list)
+    surrogate.add_keys(request, INDEX, *page_keys(page_obj))
     context = {
         'page_obj': page_obj,
     }
@@ -18,9 +27,10 @@ def index(request):
 
 
 def group_posts(request, slug):
-    group = get_object_or_404(Group, slug=slug)
+    group = negative.get_object_or_404(negative.GROUP, Group.objects, slug)
     post_list = group.posts.all()
     page_obj = paginators(request, post_list)
+    surrogate.add_keys(request, group_key(group.slug), *page_keys(page_obj))
     context = {
         'group': group,
         'page_obj': page_obj,
@@ -28,29 +38,64 @@ def group_posts(request, slug):
     return render(request, 'posts/group_list.html', context)
 
 
+def group_directory(request):
+    """Каталог групп с постраничным переходом по slug (keyset), без
+    OFFSET и COUNT: страница — один запрос при любом числе групп."""
+    groups = Group.objects.select_related(
+        'latest_post__author'
+    ).order_by('slug')
+    after = request.GET.get('after')
+    if after:
+        groups = groups.filter(slug__gt=after)
+    groups = list(groups[:GROUPS_PER_PAGE + 1])
+    context = {
+        'groups': groups[:GROUPS_PER_PAGE],
+        'next_slug': (
+            groups[GROUPS_PER_PAGE - 1].slug
+            if len(groups) > GROUPS_PER_PAGE else None
+        ),
+    }
+    return render(request, 'posts/group_directory.html', context)
+
+
 def profile(request, username):
-    author = get_object_or_404(User, username=username)
-    post_list = author.posts.all()
-    following = (
-        request.user.is_authenticated
-        and Follow.objects.filter(
-            user=request.user,
-            author=author
-        ).exists()
+    author = negative.get_object_or_404(
+        negative.USER, User.objects, username
     )
+    post_list = author.posts.all()
     page_obj = paginators(request, post_list)
+    surrogate.add_keys(request, author_key(author.pk), *page_keys(page_obj))
     context = {
         'page_obj': page_obj,
         'author': author,
-        'following': following,
     }
     return render(request, 'posts/profile.html', context)
 
 
+def trending_posts(request):
+    post_ids = trending.top_post_ids()
+    posts = Post.objects.select_related('author', 'group').in_bulk(post_ids)
+    post_list = [posts[pk] for pk in post_ids if pk in posts]
+    page_obj = paginators(request, post_list)
+    return render(request, 'posts/trending.html', {'page_obj': page_obj})
+
+
+def popular_authors(request):
+    rank_list = AuthorRank.objects.select_related('author')
+    page_obj = paginators(request, rank_list)
+    return render(request, 'posts/popular_authors.html', {
+        'page_obj': page_obj,
+    })
+
+
+@trending.count_views
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
+    post = negative.get_object_or_404(negative.POST, Post.objects, post_id)
     comments = post.comments.all()
     form = CommentForm()
+    surrogate.add_keys(request, post_key(post.pk), author_key(post.author_id))
+    if post.group_id is not None:
+        surrogate.add_keys(request, group_key(post.group.slug))
     context = {
         'post': post,
         'requser': request.user,
@@ -110,7 +155,11 @@ def add_comment(request, post_id):
 
 @login_required
 def follow_index(request):
-    post_list = Post.objects.filter(author__following__user=request.user)
+    following = follow_graph.following(request.user.id)
+    if len(following) <= MAX_FOLLOWING_IN_LIST:
+        post_list = Post.objects.filter(author_id__in=list(following))
+    else:
+        post_list = Post.objects.filter(author__following__user=request.user)
     page_obj = paginators(request, post_list)
     context = {'page_obj': page_obj}
     return render(request, 'posts/follow.html', context)
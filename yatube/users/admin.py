@@ -0,0 +1,14 @@
+from core.admin import BackgroundDeleteMixin
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.contrib.auth.admin import UserAdmin
+
+User = get_user_model()
+
+
+class BackgroundDeleteUserAdmin(BackgroundDeleteMixin, UserAdmin):
+    pass
+
+
+admin.site.unregister(User)
+admin.site.register(User, BackgroundDeleteUserAdmin)
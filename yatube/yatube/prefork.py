@@ -0,0 +1,38 @@
+"""Подготовка процесса к pre-fork запуску.
+
+Мастер-процесс загружает настройки, приложения, URLconf и шаблоны один раз;
+воркеры получают их после fork через copy-on-write. ``gc.freeze()`` убирает
+загруженные объекты из обхода сборщика мусора, чтобы он не трогал их
+заголовки и не копировал общие страницы памяти в каждый воркер.
+
+Соединения с базой не открываются заранее: при CONN_MAX_AGE = 0 Django
+закрывает их в начале и в конце каждого запроса.
+"""
+import gc
+
+from core.template_loaders import warm_templates
+from django.db import connections
+from django.urls import get_resolver
+
+
+def warm():
+    """Заполняет кэши URL-резолвера и скомпилированных шаблонов."""
+    resolver = get_resolver()
+    # reverse_dict заполняется при первом обращении.
+    resolver.reverse_dict
+    for _, namespace_resolver in resolver.namespace_dict.values():
+        namespace_resolver.reverse_dict
+    warm_templates()
+
+
+def before_fork():
+    """Вызывается в мастере перед созданием воркеров.
+
+    gunicorn.conf.py отключает сборщик на время загрузки приложения;
+    после freeze он снова включается — и в мастере, и в воркерах,
+    которые наследуют это состояние.
+    """
+    connections.close_all()
+    gc.collect()
+    gc.freeze()
+    gc.enable()
@@ -0,0 +1,20 @@
+"""
+Settings are split by environment: base holds the common part, dev, prod
+and bench extend it. The environment is selected with DJANGO_ENV
+(dev by default).
+"""
+
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+ENVIRONMENT = os.environ.get('DJANGO_ENV', 'dev')
+
+if ENVIRONMENT == 'dev':
+    from .dev import *  # noqa: F401,F403
+elif ENVIRONMENT == 'prod':
+    from .prod import *  # noqa: F401,F403
+elif ENVIRONMENT == 'bench':
+    from .bench import *  # noqa: F401,F403
+else:
+    raise ImproperlyConfigured(f'Unknown DJANGO_ENV: {ENVIRONMENT}')
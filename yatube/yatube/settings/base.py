@@ -0,0 +1,264 @@
+"""
+Django settings for yatube project.
+
+Generated by 'django-admin startproject' using Django 2.2.19.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/2.2/topics/settings/
+
+For the full list of settings and their values, see
+https://docs.djangoproject.com/en/2.2/ref/settings/
+
+Common settings shared by the dev, prod and bench environments.
+"""
+
+import os
+
+# Build paths inside the project like this: os.path.join(BASE_DIR, ...)
+BASE_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+
+# Quick-start development settings - unsuitable for production
+# See https://docs.djangoproject.com/en/2.2/howto/deployment/checklist/
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = '6zzanfhk^wr%=s3u#fjp9zts=6e2lq-r0)iyh(h&i42yz@nqjb'
+
+# SECURITY WARNING: don't run with debug turned on in production!
+DEBUG = False
+
+ALLOWED_HOSTS = [
+    'localhost',
+    '127.0.0.1',
+    '[::1]',
+    'testserver',
+]
+
+
+# Application definition
+
+INSTALLED_APPS = [
+    'posts.apps.PostsConfig',
+    'users.apps.UsersConfig',
+    'core.apps.CoreConfig',
+    'about.apps.AboutConfig',
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'sorl.thumbnail',
+]
+
+MIDDLEWARE = [
+    'core.middleware.TemplateProfilerMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'core.middleware.CompressionMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.AdmissionControlMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.surrogate.SurrogateKeyMiddleware',
+]
+
+ROOT_URLCONF = 'yatube.urls'
+
+TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
+TEMPLATE_SOURCE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+STATICFILES_DIRS = (os.path.join(BASE_DIR, 'static'),)
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [TEMPLATES_DIR],
+        'OPTIONS': {
+            'loaders': [
+                ('core.template_loaders.Loader', TEMPLATE_SOURCE_LOADERS),
+            ],
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+                'core.context_processors.year.year',
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'yatube.wsgi.application'
+
+
+# Database
+# https://docs.djangoproject.com/en/2.2/ref/settings/#databases
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+    }
+}
+
+
+# Сессии, созданные до перехода на кэширующий бэкенд, хранят путь
+# ModelBackend и продолжают работать через него до выхода из системы.
+AUTHENTICATION_BACKENDS = [
+    'core.backends.CachedModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+AUTH_USER_CACHE_TIMEOUT = 5 * 60
+
+# Password validation
+# https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+
+# Internationalization
+# https://docs.djangoproject.com/en/2.2/topics/i18n/
+
+LANGUAGE_CODE = 'ru'
+
+TIME_ZONE = 'UTC'
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/2.2/howto/static-files/
+
+STATIC_URL = '/static/'
+STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
+
+LOGIN_URL = 'users:login'
+LOGIN_REDIRECT_URL = 'posts:index'
+# LOGOUT_REDIRECT_URL = 'posts:index'
+SITE_URL = 'http://127.0.0.1:8000'
+
+EMAIL_BACKEND = 'core.mail.OutboxEmailBackend'
+OUTBOX_EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+OUTBOX_MAX_ATTEMPTS = 8
+OUTBOX_RETRY_DELAY = 60
+OUTBOX_LEASE = 10 * 60
+EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
+CSRF_FAILURE_VIEW = 'core.views.csrf_failure'
+MEDIA_URL = '/media/'
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+DEFAULT_FILE_STORAGE = 'core.storage.ContentAddressedStorage'
+# sorl-thumbnail сохраняет миниатюры под своими именами и не читает
+# возвращённое storage имя, поэтому им нужно обычное хранилище.
+THUMBNAIL_STORAGE = 'django.core.files.storage.FileSystemStorage'
+MEDIA_BLOB_GRACE = 24 * 60 * 60
+# Задание удаления без признаков жизни дольше этого снова берётся в работу.
+DELETION_LEASE = 10 * 60
+# python, x-accel (nginx) or x-sendfile (Apache, lighttpd)
+MEDIA_SERVE_MODE = 'python'
+MEDIA_ACCEL_PREFIX = '/protected-media/'
+MEDIA_PERMISSION_CHECK = 'posts.media.can_access'
+TEMPLATE_PROFILING = False
+SURROGATE_KEY_HEADER = 'Surrogate-Key'
+SURROGATE_PURGE_BACKENDS = [
+    'core.surrogate.LocalPurgeBackend',
+    'posts.feeds.FeedPurgeBackend',
+]
+SURROGATE_PURGE_BATCH_SIZE = 100
+PRERENDER_ROOT = os.path.join(BASE_DIR, 'prerendered')
+PRERENDER_QUEUE_SIZE = 1000
+FOLLOW_GRAPH_TIMEOUT = 60 * 60
+FOLLOW_GRAPH_INVALIDATION = 10
+FEED_SIZE = 20
+FEED_CACHE_TIMEOUT = 24 * 60 * 60
+SITEMAP_ROOT = os.path.join(BASE_DIR, 'sitemaps')
+# Не больше 50 000 адресов на файл по протоколу sitemaps.org.
+SITEMAP_SHARD_SIZE = 50_000
+SESSION_ENGINE = 'core.sessions'
+SESSION_WRITE_BEHIND = False
+SESSION_WRITE_BEHIND_INTERVAL = 5
+SESSION_LOCAL_CACHE_TIMEOUT = 2
+SESSION_LOCAL_CACHE_SIZE = 10_000
+BLOOM_ROOT = os.path.join(BASE_DIR, 'bloom')
+BLOOM_ERROR_RATE = 0.01
+BLOOM_REFRESH_INTERVAL = 60
+BLOOM_KNOWN_TIMEOUT = 2 * 24 * 60 * 60
+NEGATIVE_CACHE_TIMEOUT = 30
+ADMISSION_CONTROL = False
+ADMISSION_RETRY_AFTER = 1
+# Заголовок с IP клиента от обратного прокси (ключ request.META) и адреса
+# прокси, которым он доверяется.
+ADMISSION_CLIENT_IP_HEADER = None
+ADMISSION_TRUSTED_PROXIES = ('127.0.0.1', '::1')
+# concurrency — запросов класса одновременно на воркер (делят его потоки;
+# в prod рассчитывается от GUNICORN_THREADS);
+# rate и burst — лимит клиента: burst запросов за burst / rate секунд.
+ADMISSION_CLASSES = {
+    'read': {'concurrency': 16, 'rate': 10, 'burst': 40},
+    'feed': {'concurrency': 4, 'rate': 2, 'burst': 10},
+    'write': {'concurrency': 2, 'rate': 0.5, 'burst': 5},
+}
+ADMISSION_ROUTES = {
+    'posts:index': 'feed',
+    'posts:follow_index': 'feed',
+    'posts:trending': 'feed',
+    'posts:group_list': 'feed',
+    'posts:profile': 'feed',
+    'posts:post_create': 'write',
+    'posts:post_edit': 'write',
+    'posts:add_comment': 'write',
+    'posts:profile_follow': 'write',
+    'posts:profile_unfollow': 'write',
+}
+TRENDING_HALF_LIFE = 6 * 60 * 60
+TRENDING_EPOCH = 24 * 60 * 60
+TRENDING_TOP_SIZE = 100
+TRENDING_TOP_TIMEOUT = 60
+TRENDING_VIEW_FLUSH_INTERVAL = 30
+COMPRESS_MIN_SIZE = 512
+COMPRESS_CONTENT_TYPES = (
+    'text/html',
+    'text/plain',
+    'text/css',
+    'text/xml',
+    'application/javascript',
+    'application/json',
+    'application/xml',
+    'application/rss+xml',
+    'application/atom+xml',
+    'image/svg+xml',
+)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Промахи posts.negative: отдельно, чтобы сканеры не вытесняли
+    # остальные записи.
+    'negative': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'negative',
+        'OPTIONS': {'MAX_ENTRIES': 100_000},
+    },
+}
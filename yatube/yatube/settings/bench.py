@@ -0,0 +1,11 @@
+"""Benchmarks: production behaviour without production secrets."""
+
+from .base import *  # noqa: F401,F403
+
+DEBUG = False
+
+ALLOWED_HOSTS = ['*']
+
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
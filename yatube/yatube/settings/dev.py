@@ -0,0 +1,27 @@
+"""Local development: debug mode and dev-only tools."""
+
+from importlib.util import find_spec
+
+from .base import *  # noqa: F401,F403
+from .base import (INSTALLED_APPS, MIDDLEWARE, TEMPLATE_SOURCE_LOADERS,
+                   TEMPLATES)
+
+DEBUG = True
+
+TEMPLATES[0]['OPTIONS']['loaders'] = [
+    ('core.template_loaders.Loader', TEMPLATE_SOURCE_LOADERS, True),
+]
+
+# Dev-only apps are enabled only when installed; find_spec does not
+# import the package itself.
+if find_spec('debug_toolbar') is not None:
+    INSTALLED_APPS = INSTALLED_APPS + ['debug_toolbar']
+    MIDDLEWARE = MIDDLEWARE + [
+        'debug_toolbar.middleware.DebugToolbarMiddleware',
+    ]
+    INTERNAL_IPS = [
+        '127.0.0.1',
+    ]
+    # Toolbar templates are found by the app_directories loader
+    # inside the cached loader, APP_DIRS is not needed.
+    SILENCED_SYSTEM_CHECKS = ['debug_toolbar.W006']
@@ -0,0 +1,68 @@
+"""Production: everything sensitive comes from the environment."""
+
+import os
+
+from .base import *  # noqa: F401,F403
+from .base import (ADMISSION_CLASSES, BLOOM_ROOT, CACHES, PRERENDER_ROOT,
+                   SITE_URL, SITEMAP_ROOT)
+
+DEBUG = False
+
+SECRET_KEY = os.environ['SECRET_KEY']
+
+ALLOWED_HOSTS = os.environ.get('ALLOWED_HOSTS', '').split()
+
+SITE_URL = os.environ.get('SITE_URL', SITE_URL)
+
+MEDIA_SERVE_MODE = os.environ.get('MEDIA_SERVE_MODE', 'x-accel')
+
+STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+
+# Кэш общий для всех процессов: через него воркеры узнают о сменах
+# пароля, новых постах, подписках и прочих изменениях, сделанных другими.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+        'LOCATION': os.environ.get('CACHE_LOCATION', '127.0.0.1:11211'),
+    },
+    'negative': CACHES['negative'],
+}
+
+ADMISSION_CONTROL = True
+# Ёмкость классов — доля потоков воркера gthread (см. gunicorn.conf.py):
+# при большем значении семафор никогда не откажет.
+GUNICORN_THREADS = int(os.environ.get('GUNICORN_THREADS', 8))
+ADMISSION_CLASSES = {
+    'read': {**ADMISSION_CLASSES['read'],
+             'concurrency': max(1, GUNICORN_THREADS * 3 // 4)},
+    'feed': {**ADMISSION_CLASSES['feed'],
+             'concurrency': max(1, GUNICORN_THREADS // 2)},
+    'write': {**ADMISSION_CLASSES['write'],
+              'concurrency': max(1, GUNICORN_THREADS // 4)},
+}
+# gunicorn слушает 127.0.0.1 за nginx: proxy_set_header X-Real-IP ...
+ADMISSION_CLIENT_IP_HEADER = os.environ.get(
+    'ADMISSION_CLIENT_IP_HEADER', 'HTTP_X_REAL_IP'
+)
+
+OUTBOX_EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+EMAIL_HOST = os.environ.get('EMAIL_HOST', 'localhost')
+EMAIL_PORT = int(os.environ.get('EMAIL_PORT', 25))
+EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', '')
+EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
+EMAIL_USE_TLS = os.environ.get('EMAIL_USE_TLS') == '1'
+
+SESSION_COOKIE_SECURE = True
+CSRF_COOKIE_SECURE = True
+
+SURROGATE_PURGE_BACKENDS = [
+    'posts.prerender.PrerenderPurgeBackend',
+    'posts.feeds.FeedPurgeBackend',
+]
+SURROGATE_PURGE_URL = os.environ.get('SURROGATE_PURGE_URL')
+if SURROGATE_PURGE_URL:
+    SURROGATE_PURGE_BACKENDS += ['core.surrogate.HTTPPurgeBackend']
+
+PRERENDER_ROOT = os.environ.get('PRERENDER_ROOT', PRERENDER_ROOT)
+SITEMAP_ROOT = os.environ.get('SITEMAP_ROOT', SITEMAP_ROOT)
+BLOOM_ROOT = os.environ.get('BLOOM_ROOT', BLOOM_ROOT)